@@ -0,0 +1,157 @@
+"""Shared helpers for the benchmark scripts."""
+
+import importlib
+import importlib.util
+import json
+import math
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+PACKAGE_NAME = "langgraph_launchpad"
+PACKAGE_DIR = Path(__file__).resolve().parent.parent / "src" / "langgraph-launchpad"
+
+
+def package_pythonpath() -> str:
+    """Return a directory to put on ``sys.path`` so the package is importable.
+
+    The source directory is named ``langgraph-launchpad``, which is not a valid
+    module name, so when the package is not installed a symlink with the
+    import name is created in a temporary directory. Returns an empty string
+    when the package is already importable.
+    """
+    if importlib.util.find_spec(PACKAGE_NAME) is not None:
+        return ""
+
+    link_root = Path(tempfile.gettempdir()) / "lgl-bench-path"
+    link_root.mkdir(exist_ok=True)
+    link = link_root / PACKAGE_NAME
+    if not link.exists():
+        link.symlink_to(PACKAGE_DIR, target_is_directory=True)
+    return str(link_root)
+
+
+def subprocess_env(**overrides: str) -> Dict[str, str]:
+    """Environment for child interpreters that need to import the package."""
+    env = dict(os.environ)
+    path = package_pythonpath()
+    if path:
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [path, env.get("PYTHONPATH", "")]))
+    env.update(overrides)
+    return env
+
+
+def load_package() -> Any:
+    """Import the application package, falling back to the source tree."""
+    path = package_pythonpath()
+    if path and path not in sys.path:
+        sys.path.insert(0, path)
+    return importlib.import_module(PACKAGE_NAME)
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Return the ``pct`` percentile (0-100) of ``values`` using linear interpolation."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return ordered[int(rank)]
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(values: Sequence[float]) -> Dict[str, float]:
+    """Summarize latency samples (seconds) as milliseconds."""
+    return {
+        "count": len(values),
+        "mean_ms": (sum(values) / len(values) * 1000.0) if values else 0.0,
+        "p50_ms": percentile(values, 50) * 1000.0,
+        "p95_ms": percentile(values, 95) * 1000.0,
+        "p99_ms": percentile(values, 99) * 1000.0,
+    }
+
+
+def human_bytes(value: float) -> str:
+    """Format a byte count with a binary unit suffix."""
+    for unit in ("B", "KiB", "MiB", "GiB", "TiB"):
+        if abs(value) < 1024.0 or unit == "TiB":
+            return f"{value:.1f} {unit}"
+        value /= 1024.0
+    return f"{value:.1f} TiB"
+
+
+def format_table(headers: Sequence[str], rows: Iterable[Sequence[Any]]) -> str:
+    """Render rows as a fixed-width text table."""
+    rendered = [[str(cell) for cell in row] for row in rows]
+    widths = [len(header) for header in headers]
+    for row in rendered:
+        for index, cell in enumerate(row):
+            widths[index] = max(widths[index], len(cell))
+
+    lines = [
+        "  ".join(header.ljust(widths[index]) for index, header in enumerate(headers)),
+        "  ".join("-" * width for width in widths),
+    ]
+    for row in rendered:
+        lines.append("  ".join(cell.rjust(widths[index]) for index, cell in enumerate(row)))
+    return "\n".join(lines)
+
+
+def write_json(path: Optional[str], payload: Dict[str, Any]) -> None:
+    """Write benchmark results as JSON when an output path is given."""
+    if not path:
+        return
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2, default=str)
+
+
+def linear_fit(xs: List[float], ys: List[float]) -> Dict[str, float]:
+    """Least-squares fit of ``y = intercept + slope * x``."""
+    if len(xs) < 2:
+        return {"intercept": ys[0] if ys else 0.0, "slope": 0.0}
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if var_x == 0:
+        return {"intercept": mean_y, "slope": 0.0}
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+    return {"intercept": mean_y - slope * mean_x, "slope": slope}
+
+
+def add_blocking_argument(parser: Any) -> None:
+    """Add ``--fail-on-blocking MS`` to a benchmark that runs the app in-process."""
+    parser.add_argument(
+        "--fail-on-blocking",
+        type=float,
+        metavar="MS",
+        help="Run with the blocking call detector at this threshold and exit 1 if it fires",
+    )
+
+
+def enable_blocking_detector(threshold_ms: Optional[float]) -> None:
+    """Turn the detector on for the app created next (call before ``load_package``)."""
+    if threshold_ms:
+        os.environ["BLOCKING_DETECTOR_ENABLED"] = "true"
+        os.environ["BLOCKING_THRESHOLD_MS"] = str(threshold_ms)
+
+
+def check_blocking(threshold_ms: Optional[float]) -> None:
+    """Print event loop stalls caught during the run and exit 1 if there were any."""
+    if not threshold_ms:
+        return
+    from langgraph_launchpad.utils.metrics import metrics
+
+    stalls = metrics.snapshot()["counters"].get("event_loop_blocked_total", [])
+    if not stalls:
+        print(f"\nNo event loop stalls over {threshold_ms:g} ms")
+        return
+    print(f"\nEvent loop stalls over {threshold_ms:g} ms:")
+    print(format_table(
+        ["route", "stalls"],
+        [[series["labels"]["route"], int(series["value"])] for series in stalls],
+    ))
+    sys.exit(1)
@@ -0,0 +1,112 @@
+"""Bulk thread create/delete throughput.
+
+Creates and deletes ``--count`` threads (10k by default) through the API,
+once with the per-thread endpoints and once with ``POST /threads/bulk`` and
+``DELETE /threads/bulk`` in batches of ``--batch-size``, and reports threads
+per second for each. Requests go through the ASGI app in-process (FastAPI's
+``TestClient``), so HTTP framing is included but network latency is not.
+
+With ``--fail-on-blocking MS`` the app runs with the blocking call detector
+and the script exits 1 if any callback held the event loop longer than that.
+
+Usage:
+    python benchmarks/bench_bulk_threads.py --count 10000 --batch-size 1000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from _common import add_blocking_argument, check_blocking, enable_blocking_detector, format_table, load_package, write_json
+
+
+def timed(label: str, count: int, func) -> Dict[str, Any]:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label}: {count} threads in {elapsed:.2f} s")
+    return {"operation": label, "threads": count, "seconds": elapsed, "threads_per_s": count / elapsed}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--single-count", type=int, default=2000,
+                        help="Threads for the per-thread baseline (it is much slower)")
+    parser.add_argument("--output", help="Write raw results as JSON to this path")
+    add_blocking_argument(parser)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="lgl-bulk-bench-")
+    os.environ["DATABASE_TYPE"] = "sqlite"
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["LOG_LEVEL"] = "WARNING"
+    os.environ["BULK_MAX_ITEMS"] = str(max(args.batch_size, 1))
+    enable_blocking_detector(args.fail_on_blocking)
+    load_package()
+
+    from fastapi.testclient import TestClient
+    from langgraph_launchpad.main import create_app
+
+    results: List[Dict[str, Any]] = []
+    with TestClient(create_app()) as client:
+        single_ids: List[int] = []
+
+        def create_single() -> None:
+            for index in range(args.single_count):
+                response = client.post("/api/v1/threads", json={"user_id": f"user-{index % 100}"})
+                response.raise_for_status()
+                single_ids.append(response.json()["thread_id"])
+
+        def delete_single() -> None:
+            for thread_id in single_ids:
+                client.delete(f"/api/v1/threads/{thread_id}").raise_for_status()
+
+        bulk_ids: List[int] = []
+
+        def create_bulk() -> None:
+            for start in range(0, args.count, args.batch_size):
+                batch = [
+                    {"user_id": f"user-{index % 100}"}
+                    for index in range(start, min(start + args.batch_size, args.count))
+                ]
+                response = client.post("/api/v1/threads/bulk", json={"threads": batch})
+                response.raise_for_status()
+                bulk_ids.extend(item["thread_id"] for item in response.json()["results"])
+
+        def delete_bulk() -> None:
+            for start in range(0, len(bulk_ids), args.batch_size):
+                batch = bulk_ids[start:start + args.batch_size]
+                response = client.request("DELETE", "/api/v1/threads/bulk", json={"thread_ids": batch})
+                response.raise_for_status()
+                assert response.json()["deleted"] == len(batch)
+
+        results.append(timed("create (single)", args.single_count, create_single))
+        results.append(timed("delete (single)", args.single_count, delete_single))
+        results.append(timed("create (bulk)", args.count, create_bulk))
+        results.append(timed("delete (bulk)", args.count, delete_bulk))
+
+    single = {result["operation"].split()[0]: result["threads_per_s"] for result in results[:2]}
+    print()
+    print(format_table(
+        ["operation", "threads", "seconds", "threads/s", "vs single"],
+        [
+            [
+                result["operation"],
+                f"{result['threads']:,}",
+                f"{result['seconds']:.2f}",
+                f"{result['threads_per_s']:,.0f}",
+                f"{result['threads_per_s'] / single[result['operation'].split()[0]]:.1f}x",
+            ]
+            for result in results
+        ],
+    ))
+    write_json(args.output, {"config": vars(args), "results": results})
+    check_blocking(args.fail_on_blocking)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""Latest-checkpoint load time with and without the thread state cache.
+
+Builds threads of increasing length through the application graph, then
+times ``get_tuple`` for each thread's latest checkpoint three ways: straight
+from the backing saver, from the cache with verification against storage
+(the default, safe with several workers), and from the cache without it.
+This is the load every chat turn does before running the nodes.
+
+Usage:
+    python benchmarks/bench_checkpoint_cache.py --turns 5,25,100 --repeat 200
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from _common import format_table, human_bytes, load_package, summarize, write_json
+
+
+def build_thread(graph: Any, thread_id: str, turns: int) -> None:
+    from langchain_core.messages import HumanMessage
+
+    for turn in range(turns):
+        question = f"Turn {turn}: " + "please summarise the discussion so far. " * 8
+        graph.invoke(
+            {
+                "messages": [HumanMessage(content=question, name="user")],
+                "user_question": question,
+                "reasoning": turn % 3 == 0,
+                "current_step": "start",
+                "metadata": {},
+            },
+            config={"configurable": {"thread_id": thread_id}},
+        )
+
+
+def time_loads(load, repeat: int) -> List[float]:
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--turns", default="5,25,100", help="Chat turns per thread")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--output", help="Write raw results as JSON to this path")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="lgl-cache-bench-")
+    os.environ["DATABASE_TYPE"] = "sqlite"
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["LOG_LEVEL"] = "WARNING"
+    os.environ["CHECKPOINT_CACHE_ENABLED"] = "true"
+    load_package()
+
+    from langgraph_launchpad.core.checkpoint import create_checkpointer
+    from langgraph_launchpad.graph.builder import create_graph
+
+    saver = create_checkpointer()
+    graph = create_graph(saver)
+
+    results: List[Dict[str, Any]] = []
+    try:
+        for turns in (int(value) for value in args.turns.split(",")):
+            config = {"configurable": {"thread_id": f"thread-{turns}"}}
+            build_thread(graph, config["configurable"]["thread_id"], turns)
+            saver.get_tuple(config)
+            cached_bytes = saver.cache.bytes
+
+            modes = {
+                "storage": lambda: saver.inner.get_tuple(config),
+                "cache (verified)": lambda: saver.get_tuple(config),
+            }
+            for mode, load in modes.items():
+                saver.verify = True
+                results.append({"turns": turns, "mode": mode, **summarize(time_loads(load, args.repeat))})
+            saver.verify = False
+            results.append({
+                "turns": turns,
+                "mode": "cache (unverified)",
+                **summarize(time_loads(lambda: saver.get_tuple(config), args.repeat)),
+            })
+            saver.verify = True
+            results[-1]["cache_bytes"] = cached_bytes
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    baseline = {result["turns"]: result["mean_ms"] for result in results if result["mode"] == "storage"}
+    print(format_table(
+        ["turns", "mode", "mean ms", "p50 ms", "p99 ms", "speedup", "cache size"],
+        [
+            [
+                result["turns"],
+                result["mode"],
+                f"{result['mean_ms']:.3f}",
+                f"{result['p50_ms']:.3f}",
+                f"{result['p99_ms']:.3f}",
+                f"{baseline[result['turns']] / result['mean_ms']:.1f}x" if result["mean_ms"] else "-",
+                human_bytes(result["cache_bytes"]) if "cache_bytes" in result else "",
+            ]
+            for result in results
+        ],
+    ))
+    write_json(args.output, {"config": vars(args), "results": results})
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""Per-user queue wait under load, first-come-first-served vs. the fair scheduler.
+
+One heavy user submits ``--heavy`` runs at once while ``--light-users``
+users submit ``--light`` runs each, all competing for ``--slots`` run
+slots. Runs are simulated with ``--run-ms`` of sleep, so the numbers show
+only queueing. With a single FIFO queue the light users wait behind the
+heavy user's whole backlog; with the fair scheduler their runs interleave
+and they wait roughly one run per queued request of their own. The
+weighted mode gives the first light user weight 4.
+
+Usage:
+    python benchmarks/bench_fair_scheduler.py --slots 4 --heavy 200 --light-users 4 --light 10
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List
+
+from _common import format_table, load_package, summarize, write_json
+
+
+async def simulate(scheduler: Any, args: argparse.Namespace, shared: bool) -> Dict[str, List[float]]:
+    waits: Dict[str, List[float]] = {}
+
+    async def run(user_id: str) -> None:
+        start = time.perf_counter()
+        # Queuing every run as one user reduces the scheduler to a plain FIFO
+        async with scheduler.slot("everyone" if shared else user_id):
+            waits.setdefault(user_id, []).append(time.perf_counter() - start)
+            await asyncio.sleep(args.run_ms / 1000.0)
+
+    jobs = [run("heavy") for _ in range(args.heavy)]
+    for light in range(args.light_users):
+        jobs.extend(run(f"light-{light}") for _ in range(args.light))
+    await asyncio.gather(*jobs)
+    return waits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--slots", type=int, default=4, help="Runs executing at once")
+    parser.add_argument("--heavy", type=int, default=200, help="Runs submitted by the heavy user")
+    parser.add_argument("--light-users", type=int, default=4)
+    parser.add_argument("--light", type=int, default=10, help="Runs submitted by each light user")
+    parser.add_argument("--run-ms", type=float, default=10.0, help="Simulated run duration")
+    parser.add_argument("--output", help="Write raw results as JSON to this path")
+    args = parser.parse_args()
+
+    load_package()
+    from langgraph_launchpad.core.scheduler import FairScheduler
+
+    queued = args.heavy + args.light * args.light_users
+    modes = {
+        "fifo": FairScheduler(args.slots, args.slots, queued, 0),
+        "fair": FairScheduler(args.slots, args.slots, queued, 0),
+        "fair (light-0 weight 4)": FairScheduler(args.slots, args.slots, queued, 0, weights={"light-0": 4.0}),
+    }
+
+    results: List[Dict[str, Any]] = []
+    for mode, scheduler in modes.items():
+        waits = asyncio.run(simulate(scheduler, args, shared=mode == "fifo"))
+        light = [wait for user, values in waits.items() if user.startswith("light") for wait in values]
+        results.append({"mode": mode, "user": "heavy", **summarize(waits["heavy"])})
+        results.append({"mode": mode, "user": "light (all)", **summarize(light)})
+        results.append({"mode": mode, "user": "light-0", **summarize(waits["light-0"])})
+
+    print(format_table(
+        ["mode", "user", "runs", "mean wait ms", "p50 ms", "p95 ms", "p99 ms"],
+        [
+            [
+                result["mode"],
+                result["user"],
+                result["count"],
+                f"{result['mean_ms']:.1f}",
+                f"{result['p50_ms']:.1f}",
+                f"{result['p95_ms']:.1f}",
+                f"{result['p99_ms']:.1f}",
+            ]
+            for result in results
+        ],
+    ))
+    write_json(args.output, {"config": vars(args), "results": results})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Import-time and startup profile.
+
+Imports the application modules in fresh interpreters with ``-X importtime``
+and reports the slowest imports, then measures ``create_app()`` and the
+optional prewarm step in-process. It also checks that importing the package
+has no side effects: no engine, checkpointer or compiled graph may exist and
+no database file may be created until the application asks for them.
+
+Usage:
+    python benchmarks/bench_import_time.py --runs 5 --top 15
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from _common import format_table, load_package, write_json
+
+BENCH_DIR = Path(__file__).resolve().parent
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+MODULES = (
+    "langgraph_launchpad.core.database",
+    "langgraph_launchpad.core.checkpoint",
+    "langgraph_launchpad.graph.builder",
+    "langgraph_launchpad.main",
+)
+
+SIDE_EFFECT_CHECK = """
+import os, sys
+sys.path.insert(0, {bench_dir!r})
+from _common import load_package
+load_package()
+import langgraph_launchpad.main
+from langgraph_launchpad.core.checkpoint import get_checkpointer
+from langgraph_launchpad.core.database import get_engine
+from langgraph_launchpad.graph.registry import get_registry
+problems = []
+for name, cached in (("engine", get_engine), ("checkpointer", get_checkpointer), ("graph registry", get_registry)):
+    if cached.cache_info().currsize:
+        problems.append(name + " created at import time")
+if "langchain_openai" in sys.modules:
+    problems.append("langchain_openai imported eagerly")
+if os.listdir("."):
+    problems.append("files created at import time: " + ", ".join(os.listdir(".")))
+print("\\n".join(problems))
+"""
+
+
+def import_profile(module: str, env: Dict[str, str], cwd: str) -> Tuple[float, List[Tuple[str, int, int]]]:
+    """Import ``module`` in a fresh interpreter and parse ``-X importtime``."""
+    code = (
+        f"import sys; sys.path.insert(0, {str(BENCH_DIR)!r}); "
+        f"from _common import load_package; load_package(); import {module}"
+    )
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        env=env,
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall = time.perf_counter() - start
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            entries.append((match.group(4), int(match.group(1)), int(match.group(2))))
+    return wall, entries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per module")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list")
+    parser.add_argument("--output", help="Write raw results as JSON to this path")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="lgl-import-bench-")
+    env = dict(os.environ)
+    env["DATABASE_TYPE"] = "sqlite"
+    env["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    env.setdefault("OPENAI_API_KEY", "")
+
+    rows = []
+    results: Dict[str, Dict[str, float]] = {}
+    slowest: Dict[str, Tuple[int, int]] = {}
+    for module in MODULES:
+        walls = []
+        for _ in range(args.runs):
+            wall, entries = import_profile(module, env, workdir)
+            walls.append(wall)
+            for name, self_us, cumulative_us in entries:
+                previous = slowest.get(name, (0, 0))
+                slowest[name] = (max(previous[0], self_us), max(previous[1], cumulative_us))
+        results[module] = {"median_s": statistics.median(walls), "min_s": min(walls)}
+        rows.append([module, f"{results[module]['median_s'] * 1000:.0f}", f"{results[module]['min_s'] * 1000:.0f}"])
+
+    print(format_table(["module", "median ms", "min ms"], rows))
+    print()
+    print(f"Slowest imports (cumulative, worst of {args.runs} runs)")
+    ranked = sorted(slowest.items(), key=lambda item: item[1][1], reverse=True)[: args.top]
+    print(format_table(
+        ["module", "self ms", "cumulative ms"],
+        [[name, f"{self_us / 1000:.1f}", f"{cumulative_us / 1000:.1f}"] for name, (self_us, cumulative_us) in ranked],
+    ))
+
+    check_dir = tempfile.mkdtemp(prefix="lgl-import-check-")
+    check = subprocess.run(
+        [sys.executable, "-c", SIDE_EFFECT_CHECK.format(bench_dir=str(BENCH_DIR))],
+        env={**env, "DATABASE_URL": "sqlite:///./bench.db"},
+        cwd=check_dir,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    problems = [line for line in check.stdout.splitlines() if line.strip()]
+    print()
+    print("Import side effects: " + ("none" if not problems else "; ".join(problems)))
+
+    os.environ.update({key: env[key] for key in ("DATABASE_TYPE", "DATABASE_URL", "OPENAI_API_KEY")})
+    load_package()
+    from langgraph_launchpad.main import create_app, prewarm
+
+    start = time.perf_counter()
+    create_app()
+    create_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    prewarm()
+    prewarm_ms = (time.perf_counter() - start) * 1000
+    print(f"create_app(): {create_ms:.1f} ms, prewarm(): {prewarm_ms:.1f} ms")
+
+    write_json(args.output, {
+        "imports": results,
+        "slowest": {name: {"self_us": s, "cumulative_us": c} for name, (s, c) in ranked},
+        "side_effects": problems,
+        "create_app_ms": create_ms,
+        "prewarm_ms": prewarm_ms,
+    })
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Model call latency with retries and hedging against a simulated slow tail.
+
+Calls the simulated model through ``ResilientModelCaller`` from
+``--concurrency`` threads. ``--slow-ratio`` of calls take ``--slow-factor``
+times ``--latency-ms`` and ``--error-ratio`` fail with a retryable error,
+which is the shape of a provider whose p99 is dominated by stragglers.
+Each mode reports latency percentiles, failed calls, and the extra load
+it costs (attempts per call, including losing hedges).
+
+Usage:
+    python benchmarks/bench_llm_hedging.py --calls 2000 --latency-ms 20 --slow-ratio 0.03
+"""
+
+import argparse
+import itertools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from _common import format_table, load_package, summarize, write_json
+
+
+def run_mode(caller: Any, model: Any, calls: int, concurrency: int) -> Dict[str, Any]:
+    attempts = itertools.count()
+    inner = model.call("ok")
+
+    def counted(timeout, cancelled):
+        next(attempts)
+        return inner(timeout, cancelled)
+
+    def one(_: int) -> float:
+        start = time.perf_counter()
+        try:
+            caller.call(counted, stage="bench")
+        except Exception:
+            return -1.0
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        durations = list(pool.map(one, range(calls)))
+    ok = [duration for duration in durations if duration >= 0]
+    return {
+        **summarize(ok),
+        "failed": len(durations) - len(ok),
+        "attempts_per_call": next(attempts) / calls,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Typical simulated call latency")
+    parser.add_argument("--slow-ratio", type=float, default=0.03, help="Fraction of straggling calls")
+    parser.add_argument("--slow-factor", type=float, default=10.0, help="How much slower stragglers are")
+    parser.add_argument("--error-ratio", type=float, default=0.01, help="Fraction of calls failing retryably")
+    parser.add_argument("--output", help="Write raw results as JSON to this path")
+    args = parser.parse_args()
+
+    os.environ["LOG_LEVEL"] = "WARNING"
+    load_package()
+    from langgraph_launchpad.graph.llm import ResilientModelCaller, SimulatedChatModel
+
+    modes = {
+        "plain": {},
+        "retries": {"max_attempts": 3, "backoff_seconds": 0.01},
+        "retries + hedge p95": {"max_attempts": 3, "backoff_seconds": 0.01, "hedge_percentile": 95},
+        "retries + hedge p90": {"max_attempts": 3, "backoff_seconds": 0.01, "hedge_percentile": 90},
+    }
+
+    results: List[Dict[str, Any]] = []
+    for mode, options in modes.items():
+        model = SimulatedChatModel(
+            latency_seconds=args.latency_ms / 1000,
+            slow_ratio=args.slow_ratio,
+            slow_factor=args.slow_factor,
+            error_ratio=args.error_ratio,
+            seed=7,
+        )
+        caller = ResilientModelCaller(max_workers=4 * args.concurrency, **options)
+        results.append({"mode": mode, **run_mode(caller, model, args.calls, args.concurrency)})
+
+    print(format_table(
+        ["mode", "ok", "failed", "mean ms", "p50 ms", "p95 ms", "p99 ms", "attempts/call"],
+        [
+            [
+                result["mode"],
+                result["count"],
+                result["failed"],
+                f"{result['mean_ms']:.1f}",
+                f"{result['p50_ms']:.1f}",
+                f"{result['p95_ms']:.1f}",
+                f"{result['p99_ms']:.1f}",
+                f"{result['attempts_per_call']:.3f}",
+            ]
+            for result in results
+        ],
+    ))
+    write_json(args.output, {"config": vars(args), "results": results})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Memory retained per chat turn, per-route peak allocation and graph state size.
+
+Runs the app in-process (FastAPI's ``TestClient``) with memory profiling on
+(offline echo replies, SQLite). After a warm-up round it takes a tracemalloc
+snapshot through ``POST /admin/memory/snapshot``, drives ``--turns`` chat
+turns over ``--threads`` threads, and diffs through ``GET /admin/memory/diff``.
+It reports traced and RSS growth per turn, the sampled peak allocation per
+route, the largest growth sites and the graph state size per thread.
+
+With ``--max-growth-per-turn BYTES`` the script exits 1 when traced memory
+grows by more than that per turn, so leaks fail the run. With
+``--fail-on-blocking MS`` the app also runs with the blocking call detector
+and the script exits 1 if any callback held the event loop longer than that.
+
+Usage:
+    python benchmarks/bench_memory_profile.py --threads 50 --turns 500
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+from typing import Any, Dict
+
+from _common import (
+    add_blocking_argument,
+    check_blocking,
+    enable_blocking_detector,
+    format_table,
+    human_bytes,
+    load_package,
+    write_json,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--threads", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=500, help="Chat turns measured after the warm-up")
+    parser.add_argument("--message-bytes", type=int, default=400)
+    parser.add_argument("--top", type=int, default=10, help="Growth sites to list")
+    parser.add_argument("--max-growth-per-turn", type=float, metavar="BYTES",
+                        help="Exit 1 if traced memory grows more than this per turn")
+    parser.add_argument("--output", help="Write raw results as JSON to this path")
+    add_blocking_argument(parser)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="lgl-memory-bench-")
+    os.environ["DATABASE_TYPE"] = "sqlite"
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["LOG_LEVEL"] = "WARNING"
+    os.environ["OPENAI_API_KEY"] = ""
+    os.environ["OFFLINE_RESPONSE_LATENCY_MS"] = "0"
+    os.environ["MEMORY_PROFILING_ENABLED"] = "true"
+    os.environ["MEMORY_SAMPLE_RATE"] = "1"
+    os.environ["MEMORY_TOP_ALLOCATIONS"] = str(args.top)
+    enable_blocking_detector(args.fail_on_blocking)
+    load_package()
+
+    from fastapi.testclient import TestClient
+    from langgraph_launchpad.main import create_app
+
+    message = ("tell me more about my order " * (args.message_bytes // 28 + 1))[:args.message_bytes]
+    results: Dict[str, Any] = {}
+    try:
+        with TestClient(create_app()) as client:
+            thread_ids = [
+                client.post("/api/v1/threads", json={"user_id": f"user-{i % 10}"}).json()["thread_id"]
+                for i in range(args.threads)
+            ]
+
+            def chat(turns: int) -> None:
+                for turn in range(turns):
+                    thread_id = thread_ids[turn % len(thread_ids)]
+                    response = client.post(f"/api/v1/threads/{thread_id}/chat", json={"message": message})
+                    response.raise_for_status()
+
+            # Warm caches, pools and lazily compiled graphs before the baseline
+            chat(len(thread_ids))
+            client.post("/api/v1/admin/memory/snapshot").raise_for_status()
+            chat(args.turns)
+            diff = client.get("/api/v1/admin/memory/diff").json()
+            stats = client.get("/api/v1/admin/memory").json()
+            thread_memory = client.get("/api/v1/admin/memory/threads", params={"limit": 5}).json()
+            baseline_rss = client.post("/api/v1/admin/memory/snapshot").json()["rss_bytes"]
+
+        results = {
+            "traced_growth_bytes": diff["traced_bytes_diff"],
+            "traced_growth_per_turn": diff["traced_bytes_diff"] / args.turns,
+            "rss_bytes": baseline_rss,
+            "top_growth": diff["top"],
+            "route_peak_bytes": stats["route_peak_bytes"],
+            "threads": thread_memory,
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(
+        f"Traced growth over {args.turns} turns: {human_bytes(results['traced_growth_bytes'])} "
+        f"({human_bytes(results['traced_growth_per_turn'])} per turn), RSS {human_bytes(results['rss_bytes'])}\n"
+    )
+    print(format_table(
+        ["route", "sampled", "mean peak", "p99 peak"],
+        [
+            [route, int(summary["count"]), human_bytes(summary["mean"]), human_bytes(summary["p99"])]
+            for route, summary in sorted(results["route_peak_bytes"].items())
+        ],
+    ))
+    print()
+    print(format_table(
+        ["growth", "allocations", "site"],
+        [
+            [human_bytes(stat["bytes_diff"]), f"{stat['count_diff']:+d}", stat["location"]]
+            for stat in results["top_growth"]
+        ],
+    ))
+    threads = results["threads"]
+    print(
+        f"\nGraph state: {threads['thread_count']} cached threads, {human_bytes(threads['total_bytes'])} total, "
+        f"largest {human_bytes(threads['threads'][0]['approximate_bytes']) if threads['threads'] else '-'}"
+    )
+    write_json(args.output, {"config": vars(args), **results})
+
+    leaked = args.max_growth_per_turn is not None and results["traced_growth_per_turn"] > args.max_growth_per_turn
+    if leaked:
+        print(f"\nTraced memory grew more than {human_bytes(args.max_growth_per_turn)} per turn")
+    check_blocking(args.fail_on_blocking)
+    if leaked:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
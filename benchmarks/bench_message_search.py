@@ -0,0 +1,143 @@
+"""Phrase search over conversations: full-text index vs. loading every thread.
+
+Creates ``--threads`` threads with ``--turns`` chat turns each through the
+application graph (offline echo replies, SQLite), backfills the search
+index and reports its throughput. Then it times ``search_messages`` for
+a handful of phrases against the previous approach of loading each
+thread's messages with ``get_thread_messages`` and scanning them.
+
+Usage:
+    python benchmarks/bench_message_search.py --threads 2000 --turns 3
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from _common import format_table, load_package, summarize, write_json
+
+WORDS = (
+    "invoice refund shipping widget account password login billing order delivery "
+    "discount coupon warranty return exchange subscription upgrade cancel support"
+).split()
+
+
+def question(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(12))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--threads", type=int, default=2000)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=20, help="Timed searches per phrase")
+    parser.add_argument("--output", help="Write raw results as JSON to this path")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="lgl-search-bench-")
+    os.environ["DATABASE_TYPE"] = "sqlite"
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["LOG_LEVEL"] = "WARNING"
+    os.environ["OPENAI_API_KEY"] = ""
+    os.environ["SEARCH_INDEX_ENABLED"] = "false"
+    load_package()
+
+    from langchain_core.messages import HumanMessage
+    from langgraph_launchpad.config.settings import get_settings
+    from langgraph_launchpad.core.database import create_tables, get_engine, get_read_session_factory
+    from langgraph_launchpad.core.models import Thread
+    from langgraph_launchpad.core.search import backfill_search_index, search_messages, setup_search_index
+    from langgraph_launchpad.graph.builder import get_graph, get_thread_messages
+
+    rng = random.Random(7)
+    results: Dict[str, Any] = {}
+    try:
+        create_tables()
+        setup_search_index()
+        with get_engine().begin() as conn:
+            conn.execute(Thread.__table__.insert(), [{"user_id": f"user-{i % 50}"} for i in range(args.threads)])
+
+        graph = get_graph()
+        for thread_id in range(1, args.threads + 1):
+            for _ in range(args.turns):
+                text = question(rng)
+                graph.invoke(
+                    {
+                        "messages": [HumanMessage(content=text, name="user")],
+                        "user_question": text,
+                        "reasoning": False,
+                        "current_step": "start",
+                        "metadata": {},
+                    },
+                    config={"configurable": {"thread_id": str(thread_id)}},
+                )
+
+        get_settings().search_index_enabled = True
+        start = time.perf_counter()
+        indexed = {"threads": 0, "messages": 0}
+        after = 0
+        while after is not None:
+            batch = backfill_search_index(limit=500, after=after)
+            indexed["threads"] += batch["threads"]
+            indexed["messages"] += batch["messages"]
+            after = batch["next_after"]
+        backfill_seconds = time.perf_counter() - start
+        results["backfill"] = {**indexed, "seconds": backfill_seconds}
+
+        phrases = [f"{rng.choice(WORDS)} {rng.choice(WORDS)}" for _ in range(5)]
+        rows: List[Dict[str, Any]] = []
+        with get_read_session_factory()() as db:
+            for phrase in phrases:
+                durations = []
+                for _ in range(args.repeat):
+                    begin = time.perf_counter()
+                    page = search_messages(db, phrase, limit=20)
+                    durations.append(time.perf_counter() - begin)
+                rows.append({"method": "index", "phrase": phrase, "hits": len(page["results"]), **summarize(durations)})
+
+            phrase = phrases[0]
+            begin = time.perf_counter()
+            matches = sum(
+                1
+                for thread_id in range(1, args.threads + 1)
+                for message in get_thread_messages(thread_id)
+                if phrase in message.content
+            )
+            rows.append({
+                "method": "scan threads",
+                "phrase": phrase,
+                "hits": matches,
+                **summarize([time.perf_counter() - begin]),
+            })
+        results["searches"] = rows
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    backfill = results["backfill"]
+    print(
+        f"Backfilled {backfill['messages']} messages from {backfill['threads']} threads in "
+        f"{backfill['seconds']:.2f}s ({backfill['messages'] / backfill['seconds']:.0f} messages/s)\n"
+    )
+    print(format_table(
+        ["method", "phrase", "hits", "mean ms", "p50 ms", "p99 ms"],
+        [
+            [
+                row["method"],
+                row["phrase"],
+                row["hits"],
+                f"{row['mean_ms']:.2f}",
+                f"{row['p50_ms']:.2f}",
+                f"{row['p99_ms']:.2f}",
+            ]
+            for row in results["searches"]
+        ],
+    ))
+    write_json(args.output, {"config": vars(args), **results})
+
+
+if __name__ == "__main__":
+    main()
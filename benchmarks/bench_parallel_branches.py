@@ -0,0 +1,107 @@
+"""Chat turn latency with reasoning run sequentially vs. in parallel.
+
+Runs ``--turns`` graph invocations with ``reasoning=True`` against the
+application graph, where the answer and reasoning branches fan out from
+``START`` and join in ``merge_branches``, and against the same nodes chained
+one after the other (the previous topology). Model calls are simulated with
+``OFFLINE_RESPONSE_LATENCY_MS`` so the numbers isolate graph scheduling;
+with equal branch latency the parallel graph should take about half as long.
+Checkpoints go to an in-memory saver.
+
+Usage:
+    python benchmarks/bench_parallel_branches.py --latency-ms 200 --turns 20
+"""
+
+import argparse
+import os
+import time
+from typing import Any, Dict, List
+
+from _common import format_table, load_package, summarize, write_json
+
+
+def sequential_graph(saver: Any) -> Any:
+    from langgraph.graph import END, START, StateGraph
+    from langgraph_launchpad.graph.nodes.example_agent import example_agent, merge_branches, reasoning_agent
+    from langgraph_launchpad.graph.state import GraphState
+
+    builder = StateGraph(GraphState)
+    builder.add_node("example_agent", example_agent)
+    builder.add_node("reasoning_agent", reasoning_agent)
+    builder.add_node("merge_branches", merge_branches)
+    builder.add_edge(START, "example_agent")
+    builder.add_edge("example_agent", "reasoning_agent")
+    builder.add_edge("reasoning_agent", "merge_branches")
+    builder.add_edge("merge_branches", END)
+    return builder.compile(checkpointer=saver)
+
+
+def run_turns(graph: Any, label: str, turns: int, reasoning: bool) -> List[float]:
+    from langchain_core.messages import HumanMessage
+
+    durations = []
+    for turn in range(turns):
+        question = f"Question {turn} for {label}"
+        start = time.perf_counter()
+        result = graph.invoke(
+            {
+                "messages": [HumanMessage(content=question, name="user")],
+                "user_question": question,
+                "reasoning": reasoning,
+                "current_step": "start",
+                "metadata": {},
+            },
+            config={"configurable": {"thread_id": f"{label}-{reasoning}"}},
+        )
+        durations.append(time.perf_counter() - start)
+        expected = "reasoning_completed" if reasoning else "example_agent_completed"
+        assert result["current_step"] == expected, result["current_step"]
+    return durations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--latency-ms", type=int, default=200, help="Simulated latency per model call")
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--output", help="Write raw results as JSON to this path")
+    args = parser.parse_args()
+
+    os.environ["OPENAI_API_KEY"] = ""
+    os.environ["OFFLINE_RESPONSE_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["LOG_LEVEL"] = "WARNING"
+    load_package()
+
+    from langgraph.checkpoint.memory import MemorySaver
+    from langgraph_launchpad.config.settings import get_settings
+    from langgraph_launchpad.graph.builder import create_graph
+
+    get_settings.cache_clear()
+    saver = MemorySaver()
+    graphs = {"parallel": create_graph(saver), "sequential": sequential_graph(saver)}
+
+    results: List[Dict[str, Any]] = []
+    for reasoning in (False, True):
+        for label, graph in graphs.items():
+            stats = summarize(run_turns(graph, label, args.turns, reasoning))
+            results.append({"topology": label, "reasoning": reasoning, **stats})
+
+    print(format_table(
+        ["topology", "reasoning", "turns", "mean ms", "p50 ms", "p95 ms", "vs model call"],
+        [
+            [
+                result["topology"],
+                result["reasoning"],
+                result["count"],
+                f"{result['mean_ms']:.1f}",
+                f"{result['p50_ms']:.1f}",
+                f"{result['p95_ms']:.1f}",
+                f"{result['mean_ms'] / args.latency_ms:.2f}x" if args.latency_ms else "-",
+            ]
+            for result in results
+        ],
+    ))
+    write_json(args.output, {"config": vars(args), "results": results})
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
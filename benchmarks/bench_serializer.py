@@ -0,0 +1,141 @@
+"""Checkpoint serializer compression and throughput.
+
+Builds checkpoints holding realistic ``GraphState`` values (alternating user
+and assistant messages of varying length) for several thread lengths and
+compares LangGraph's default ``JsonPlusSerializer`` with the compact
+serializer at different zstd levels. Reports stored size, compression ratio
+against the default encoding, and encode/decode throughput in MiB/s of the
+default encoding's size, so rows are comparable.
+
+Usage:
+    python benchmarks/bench_serializer.py --messages 10,50,200 --repeat 50
+"""
+
+import argparse
+import random
+import time
+from typing import Any, Dict, List, Tuple
+
+from _common import format_table, human_bytes, load_package, write_json
+
+SENTENCES = [
+    "Sure, here is a summary of the main points we discussed so far.",
+    "Could you explain how the retry policy interacts with the deadline?",
+    "The checkpoint stores the full conversation state after every step.",
+    "I would recommend batching the writes to keep the lock short.",
+    "Here is an example configuration that should work for your setup.",
+    "What happens when the upstream model times out halfway through a stream?",
+    "Let me walk through the trade-offs between latency and durability.",
+]
+
+
+def build_state(rng: random.Random, messages: int) -> Dict[str, Any]:
+    from langchain_core.messages import AIMessage, HumanMessage
+
+    history = []
+    for index in range(messages):
+        text = " ".join(rng.choice(SENTENCES) for _ in range(rng.randint(1, 8)))
+        if index % 2 == 0:
+            history.append(HumanMessage(content=text, name="user"))
+        else:
+            history.append(AIMessage(content=text, id=f"run-{index}"))
+    return {
+        "messages": history,
+        "user_question": history[-2].content if messages > 1 else "",
+        "reasoning": False,
+        "current_step": "example_agent_completed",
+        "metadata": {"turn": messages // 2, "source": "benchmark"},
+    }
+
+
+def build_checkpoint(state: Dict[str, Any]) -> Dict[str, Any]:
+    from langgraph.checkpoint.base import empty_checkpoint
+
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = state
+    checkpoint["channel_versions"] = {key: 1 for key in state}
+    return checkpoint
+
+
+def measure(serializer: Any, obj: Any, repeat: int) -> Tuple[int, float, float]:
+    """Return (stored bytes, seconds per encode, seconds per decode)."""
+    typed = serializer.dumps_typed(obj)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        typed = serializer.dumps_typed(obj)
+    encode = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        serializer.loads_typed(typed)
+    decode = (time.perf_counter() - start) / repeat
+    return len(typed[1]), encode, decode
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--messages", default="10,50,200,1000", help="Messages per thread")
+    parser.add_argument("--levels", default="1,3,9", help="zstd levels to compare")
+    parser.add_argument("--threshold", type=int, default=1024)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--output", help="Write raw results as JSON to this path")
+    args = parser.parse_args()
+
+    load_package()
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+    from langgraph_launchpad.core.serializer import CompactSerializer, zstandard
+
+    serializers: List[Tuple[str, Any]] = [
+        ("default", JsonPlusSerializer()),
+        ("compact/none", CompactSerializer(compression="none")),
+    ]
+    if zstandard is None:
+        print("zstandard is not installed; only uncompressed serializers are measured")
+    else:
+        for level in (int(value) for value in args.levels.split(",")):
+            serializers.append(
+                (f"compact/zstd-{level}", CompactSerializer(threshold=args.threshold, level=level))
+            )
+
+    rng = random.Random(args.seed)
+    rows = []
+    results: List[Dict[str, Any]] = []
+    for count in (int(value) for value in args.messages.split(",")):
+        checkpoint = build_checkpoint(build_state(rng, count))
+        baseline_size = None
+        for name, serializer in serializers:
+            size, encode, decode = measure(serializer, checkpoint, args.repeat)
+            baseline_size = baseline_size or size
+            mib = baseline_size / 2**20
+            result = {
+                "messages": count,
+                "serializer": name,
+                "bytes": size,
+                "ratio": baseline_size / size if size else 0.0,
+                "encode_mib_s": mib / encode if encode else 0.0,
+                "decode_mib_s": mib / decode if decode else 0.0,
+                "encode_us": encode * 1e6,
+                "decode_us": decode * 1e6,
+            }
+            results.append(result)
+            rows.append([
+                count,
+                name,
+                human_bytes(size),
+                f"{result['ratio']:.2f}x",
+                f"{result['encode_mib_s']:.1f}",
+                f"{result['decode_mib_s']:.1f}",
+                f"{result['encode_us']:.0f}",
+                f"{result['decode_us']:.0f}",
+            ])
+
+    print(format_table(
+        ["messages", "serializer", "stored", "ratio", "enc MiB/s", "dec MiB/s", "enc us", "dec us"],
+        rows,
+    ))
+    write_json(args.output, {"config": vars(args), "results": results})
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,207 @@
+"""Concurrent checkpoint write throughput with SQLite split into hash shards.
+
+Each shard count runs in a fresh interpreter with ``SQLITE_SHARDS`` set
+and the checkpointer from ``core.checkpoint.create_checkpointer``. Writer
+threads each own a set of conversation threads and write one turn at a
+time for ``--duration`` seconds, making the same storage calls as a chat
+turn after the model replies: ``ensure_thread_hot``, ``put`` of a
+checkpoint holding the messages so far and ``put_writes``, then
+``index_thread_messages`` and ``record_message_counts``.
+
+With one file every commit takes the same connection lock and database
+write lock; with shards, checkpoints and message counts on threads in
+different shards commit in parallel. The search index stays in the main
+file, so with it enabled every turn still commits there once and the
+speedup is bounded by that; ``--no-search-index`` shows the checkpoint
+writes alone.
+
+``--synchronous`` sets ``SQLITE_SYNCHRONOUS``: under ``FULL`` each commit
+waits for an fsync, which is where separate files help most.
+
+Usage:
+    python benchmarks/bench_sharded_writes.py --shards 1,2,4,8 --writers 8
+    python benchmarks/bench_sharded_writes.py --synchronous FULL --duration 20
+    python benchmarks/bench_sharded_writes.py --no-search-index
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from typing import Any, Dict, List
+
+from _common import format_table, load_package, subprocess_env, summarize, write_json
+
+
+def run_writers(args: argparse.Namespace) -> Dict[str, Any]:
+    """Child mode: write turns from ``--writers`` threads and report the results."""
+    load_package()
+    from langchain_core.messages import AIMessage, HumanMessage
+    from langgraph.checkpoint.base import empty_checkpoint
+
+    from langgraph_launchpad.core.archive import ensure_thread_hot
+    from langgraph_launchpad.core.checkpoint import create_checkpointer
+    from langgraph_launchpad.core.database import create_tables, get_engine
+    from langgraph_launchpad.core.listing import record_message_counts
+    from langgraph_launchpad.core.models import Thread
+    from langgraph_launchpad.core.search import index_thread_messages, setup_search_index
+    from langgraph_launchpad.core.sharding import create_shard_tables
+
+    create_tables()
+    create_shard_tables()
+    setup_search_index()
+    with get_engine().begin() as conn:
+        conn.execute(Thread.__table__.insert(), [
+            {"thread_id": thread_id, "user_id": f"user-{thread_id % 10}"}
+            for thread_id in range(1, args.writers * args.threads_per_writer + 1)
+        ])
+
+    saver = create_checkpointer()
+    text = "x" * args.message_bytes
+    deadline = time.perf_counter() + args.warmup + args.duration
+    measure_from = time.perf_counter() + args.warmup
+    latencies: List[List[float]] = [[] for _ in range(args.writers)]
+    errors = [0] * args.writers
+
+    def writer(index: int) -> None:
+        thread_ids = [str(index * args.threads_per_writer + offset + 1) for offset in range(args.threads_per_writer)]
+        configs = {
+            thread_id: {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}} for thread_id in thread_ids
+        }
+        messages: Dict[str, List[Any]] = {thread_id: [] for thread_id in thread_ids}
+        # Every message of each conversation, as the graph state would hold it
+        transcripts: Dict[str, List[Any]] = {thread_id: [] for thread_id in thread_ids}
+        versions: Dict[str, Any] = {thread_id: None for thread_id in thread_ids}
+        turn = 0
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                return
+            thread_id = thread_ids[turn % len(thread_ids)]
+            history = messages[thread_id]
+            history[:] = history[-args.history:] + [HumanMessage(text), AIMessage(text)]
+            version = saver.get_next_version(versions[thread_id], None)
+            checkpoint = empty_checkpoint()
+            checkpoint["channel_values"] = {"messages": list(history)}
+            checkpoint["channel_versions"] = {"messages": version}
+            try:
+                ensure_thread_hot(int(thread_id))
+                config = saver.put(
+                    configs[thread_id], checkpoint, {"source": "loop", "step": turn}, {"messages": version}
+                )
+                saver.put_writes(config, [("messages", history[-1])], uuid.uuid4().hex)
+                transcript = transcripts[thread_id] + history[-2:]
+                index_thread_messages(int(thread_id), transcript)
+                record_message_counts({int(thread_id): len(transcript)})
+            except Exception:
+                errors[index] += 1
+                continue
+            configs[thread_id], versions[thread_id] = config, version
+            transcripts[thread_id] = transcript
+            if now >= measure_from:
+                latencies[index].append(time.perf_counter() - now)
+            turn += 1
+
+    threads = [threading.Thread(target=writer, args=(index,)) for index in range(args.writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    merged = [value for values in latencies for value in values]
+    return {
+        "turns": len(merged),
+        "errors": sum(errors),
+        "turns_per_second": len(merged) / args.duration,
+        "latency": summarize(merged),
+    }
+
+
+def run_for_shards(shards: int, args: argparse.Namespace, workdir: str) -> Dict[str, Any]:
+    path = os.path.join(workdir, f"shards-{shards}", "bench.db")
+    os.makedirs(os.path.dirname(path))
+    env = subprocess_env(
+        DATABASE_TYPE="sqlite",
+        DATABASE_URL=f"sqlite:///{path}",
+        SQLITE_SHARDS=str(shards),
+        SQLITE_SYNCHRONOUS=args.synchronous,
+        SEARCH_INDEX_ENABLED=str(args.search_index).lower(),
+        LOG_LEVEL="WARNING",
+        OPENAI_API_KEY="",
+    )
+    command = [
+        sys.executable, __file__, "--child",
+        "--writers", str(args.writers),
+        "--threads-per-writer", str(args.threads_per_writer),
+        "--history", str(args.history),
+        "--message-bytes", str(args.message_bytes),
+        "--duration", str(args.duration),
+        "--warmup", str(args.warmup),
+    ]
+    completed = subprocess.run(command, env=env, capture_output=True, text=True, check=True)
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    files = [name for name in os.listdir(os.path.dirname(path)) if name.endswith(".db")]
+    return {"shards": shards, "files": len(files), **result}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--shards", default="1,2,4,8", help="Comma separated shard counts (1 = a single file)")
+    parser.add_argument("--writers", type=int, default=8, help="Concurrent writer threads")
+    parser.add_argument("--threads-per-writer", type=int, default=4, help="Conversation threads per writer")
+    parser.add_argument("--history", type=int, default=20, help="Messages kept in each checkpoint")
+    parser.add_argument("--message-bytes", type=int, default=200, help="Size of each message's content")
+    parser.add_argument("--synchronous", default="NORMAL", choices=["OFF", "NORMAL", "FULL", "EXTRA"])
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per shard count")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds per shard count")
+    parser.add_argument(
+        "--no-search-index", dest="search_index", action="store_false",
+        help="Disable the search index, leaving no per-turn write on the main file",
+    )
+    parser.add_argument("--output", help="Write raw results as JSON to this path")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_writers(args)))
+        return
+
+    workdir = tempfile.mkdtemp(prefix="lgl-shard-bench-")
+    results: List[Dict[str, Any]] = []
+    try:
+        for shards in (int(value) for value in args.shards.split(",")):
+            print(f"Running {args.writers} writers against {shards} shard(s)...", flush=True)
+            results.append(run_for_shards(shards, args, workdir))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    baseline = results[0]["turns_per_second"] or 1.0
+    print()
+    print(format_table(
+        ["shards", "files", "turns/s", "speedup", "p50 ms", "p95 ms", "p99 ms", "errors"],
+        [
+            [
+                result["shards"],
+                result["files"],
+                f"{result['turns_per_second']:,.0f}",
+                f"{result['turns_per_second'] / baseline:.2f}x",
+                f"{result['latency']['p50_ms']:.2f}",
+                f"{result['latency']['p95_ms']:.2f}",
+                f"{result['latency']['p99_ms']:.2f}",
+                result["errors"],
+            ]
+            for result in results
+        ],
+    ))
+
+    write_json(args.output, {"config": vars(args), "results": results})
+
+
+if __name__ == "__main__":
+    main()
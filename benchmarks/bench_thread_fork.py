@@ -0,0 +1,130 @@
+"""Thread fork latency vs. replaying the conversation into a new thread.
+
+Runs the app in-process (FastAPI's ``TestClient``, offline echo replies,
+SQLite) and grows one parent thread to each of ``--turns`` chat turns.
+At each length it times ``POST /threads/{id}/fork`` against the old way
+of branching: creating a thread and posting every question of the parent
+again. Forking copies one checkpoint row, so its latency should stay flat
+while the replay grows with the parent (and would cost a model call per
+turn with a real model).
+
+With ``--fail-on-blocking MS`` the app runs with the blocking call detector
+and the script exits 1 if any callback held the event loop longer than that.
+
+Usage:
+    python benchmarks/bench_thread_fork.py --turns 10,50,200
+"""
+
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from _common import (
+    add_blocking_argument,
+    check_blocking,
+    enable_blocking_detector,
+    format_table,
+    human_bytes,
+    load_package,
+    summarize,
+    write_json,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--turns", default="10,50,200", help="Parent lengths in chat turns")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed forks per length")
+    parser.add_argument("--replays", type=int, default=1, help="Timed replays per length")
+    parser.add_argument("--output", help="Write raw results as JSON to this path")
+    add_blocking_argument(parser)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="lgl-fork-bench-")
+    path = os.path.join(workdir, "bench.db")
+    os.environ["DATABASE_TYPE"] = "sqlite"
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ["LOG_LEVEL"] = "WARNING"
+    os.environ["OPENAI_API_KEY"] = ""
+    os.environ["OFFLINE_RESPONSE_LATENCY_MS"] = "0"
+    enable_blocking_detector(args.fail_on_blocking)
+    load_package()
+
+    from fastapi.testclient import TestClient
+    from langgraph_launchpad.main import create_app
+
+    results: List[Dict[str, Any]] = []
+    try:
+        with TestClient(create_app()) as client:
+            def chat(thread_id: int, message: str) -> None:
+                client.post(f"/api/v1/threads/{thread_id}/chat", json={"message": message}).raise_for_status()
+
+            parent = client.post("/api/v1/threads", json={"user_id": "bench"}).json()["thread_id"]
+            turns = 0
+            for target in (int(value) for value in args.turns.split(",")):
+                while turns < target:
+                    chat(parent, f"question {turns}")
+                    turns += 1
+
+                fork_durations = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    client.post(f"/api/v1/threads/{parent}/fork").raise_for_status()
+                    fork_durations.append(time.perf_counter() - start)
+
+                replay_durations = []
+                for _ in range(args.replays):
+                    start = time.perf_counter()
+                    replay = client.post("/api/v1/threads", json={"user_id": "bench"}).json()["thread_id"]
+                    for turn in range(turns):
+                        chat(replay, f"question {turn}")
+                    replay_durations.append(time.perf_counter() - start)
+
+                with sqlite3.connect(path) as conn:
+                    parent_rows, parent_bytes = conn.execute(
+                        "SELECT COUNT(*), SUM(LENGTH(checkpoint) + LENGTH(metadata)) FROM checkpoints "
+                        "WHERE thread_id = ?",
+                        (str(parent),),
+                    ).fetchone()
+                    copied_bytes = conn.execute(
+                        "SELECT LENGTH(checkpoint) + LENGTH(metadata) FROM checkpoints "
+                        "WHERE thread_id = ? ORDER BY checkpoint_id DESC LIMIT 1",
+                        (str(parent),),
+                    ).fetchone()[0]
+
+                results.append({
+                    "turns": turns,
+                    "parent_checkpoints": parent_rows,
+                    "parent_bytes": parent_bytes,
+                    "fork_copied_bytes": copied_bytes,
+                    "fork": summarize(fork_durations),
+                    "replay": summarize(replay_durations),
+                })
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(format_table(
+        ["turns", "parent checkpoints", "parent size", "fork copies", "fork p50 ms", "fork p99 ms", "replay ms"],
+        [
+            [
+                result["turns"],
+                result["parent_checkpoints"],
+                human_bytes(result["parent_bytes"]),
+                human_bytes(result["fork_copied_bytes"]),
+                f"{result['fork']['p50_ms']:.2f}",
+                f"{result['fork']['p99_ms']:.2f}",
+                f"{result['replay']['mean_ms']:.0f}",
+            ]
+            for result in results
+        ],
+    ))
+    write_json(args.output, {"config": vars(args), "results": results})
+    check_blocking(args.fail_on_blocking)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Thread listing throughput: column-projected rows vs. ORM objects and Pydantic models.
+
+Fills a SQLite database with ``--threads`` threads (with stored message
+counts) and times building the response body of one ``--page-size`` page
+of ``GET /threads`` three ways:
+
+* ``projected``: what the route does, selecting the response columns as
+  rows and encoding them straight to JSON bytes (``core.listing``)
+* ``orm+pydantic``: loading ``Thread`` objects, building ``ThreadInfo``
+  models and validating and serializing the response like FastAPI does
+  for a ``response_model``, with the same stored message counts
+* ``orm+state``: the previous route, which also loaded each thread's graph
+  state for its message count (threads here have no checkpoints, so this
+  is a lower bound)
+
+Usage:
+    python benchmarks/bench_thread_listing.py --threads 50000 --page-size 1000
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from _common import format_table, load_package, summarize, write_json
+
+
+def timed(run: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        durations.append(time.perf_counter() - start)
+    return summarize(durations)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--threads", type=int, default=50000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20, help="Timed pages per method")
+    parser.add_argument("--state-repeat", type=int, default=2, help="Timed pages for orm+state")
+    parser.add_argument("--output", help="Write raw results as JSON to this path")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="lgl-listing-bench-")
+    os.environ["DATABASE_TYPE"] = "sqlite"
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["LOG_LEVEL"] = "WARNING"
+    load_package()
+
+    from sqlalchemy import select
+    from langgraph_launchpad.api.models.responses import AllThreadsResponse, ThreadInfo
+    from langgraph_launchpad.core.database import create_tables, get_engine, get_read_session_factory
+    from langgraph_launchpad.core.listing import encode_json, thread_page
+    from langgraph_launchpad.core.models import Thread, ThreadStats
+    from langgraph_launchpad.graph.builder import get_thread_messages
+
+    skip = max(args.threads // 2 - args.page_size, 0)
+
+    def projected(db: Any) -> bytes:
+        threads, total = thread_page(db, skip=skip, limit=args.page_size)
+        return encode_json({"threads": threads, "total": total})
+
+    def orm_pydantic(db: Any, message_count: Callable[[Any], int]) -> bytes:
+        threads = db.query(Thread).order_by(Thread.thread_id).offset(skip).limit(args.page_size).all()
+        total = db.query(Thread).count()
+        response = AllThreadsResponse(
+            threads=[
+                ThreadInfo(
+                    thread_id=thread.thread_id,
+                    user_id=thread.user_id,
+                    created_at=thread.created_at,
+                    updated_at=thread.updated_at,
+                    message_count=message_count(thread),
+                )
+                for thread in threads
+            ],
+            total=total,
+        )
+        # What FastAPI does with a returned model and a response_model
+        content = AllThreadsResponse.model_validate(response.model_dump()).model_dump(mode="json")
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    results: List[Dict[str, Any]] = []
+    try:
+        create_tables()
+        with get_engine().begin() as conn:
+            conn.execute(Thread.__table__.insert(), [{"user_id": f"user-{i % 100}"} for i in range(args.threads)])
+            conn.execute(
+                ThreadStats.__table__.insert(),
+                [{"thread_id": thread_id, "message_count": 6} for thread_id in range(1, args.threads + 1)],
+            )
+
+        with get_read_session_factory()() as db:
+            counts = dict(db.execute(select(ThreadStats.thread_id, ThreadStats.message_count)).all())
+            methods = [
+                ("projected", lambda: projected(db), args.repeat),
+                ("orm+pydantic", lambda: orm_pydantic(db, lambda thread: counts[thread.thread_id]), args.repeat),
+                (
+                    "orm+state",
+                    lambda: orm_pydantic(db, lambda thread: len(get_thread_messages(thread.thread_id))),
+                    args.state_repeat,
+                ),
+            ]
+            for method, run, repeat in methods:
+                run()
+                db.expunge_all()
+                summary = timed(lambda: (run(), db.expunge_all()), repeat)
+                results.append({
+                    "method": method,
+                    "rows_per_second": args.page_size / (summary["mean_ms"] / 1000),
+                    "bytes": len(run()),
+                    **summary,
+                })
+                db.expunge_all()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(format_table(
+        ["method", "page ms (p50)", "p99 ms", "rows/s", "body bytes"],
+        [
+            [
+                result["method"],
+                f"{result['p50_ms']:.2f}",
+                f"{result['p99_ms']:.2f}",
+                f"{result['rows_per_second']:,.0f}",
+                result["bytes"],
+            ]
+            for result in results
+        ],
+    ))
+    write_json(args.output, {"config": vars(args), "results": results})
+
+
+if __name__ == "__main__":
+    main()
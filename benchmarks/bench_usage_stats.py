@@ -0,0 +1,125 @@
+"""Usage statistics latency: rollup lookup vs. aggregating the raw tables.
+
+Fills a SQLite database with ``--threads`` threads spread over ``--users``
+users and ``--turns`` indexed turns per thread, records the same activity
+through the usage buffer and flushes it once. Then it times
+``get_usage`` for one user and for everyone against the ad hoc queries the
+numbers would otherwise need (counting the user's threads and their
+indexed questions). The rollup lookup should stay flat as the data grows.
+
+Usage:
+    python benchmarks/bench_usage_stats.py --threads 20000,100000 --turns 3
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from _common import format_table, load_package, summarize, write_json
+
+
+def timed(run: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        durations.append(time.perf_counter() - start)
+    return summarize(durations)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--threads", default="20000,100000", help="Thread counts to measure")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=50, help="Timed queries per method")
+    parser.add_argument("--output", help="Write raw results as JSON to this path")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="lgl-usage-bench-")
+    os.environ["DATABASE_TYPE"] = "sqlite"
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["LOG_LEVEL"] = "WARNING"
+    os.environ["SEARCH_INDEX_ENABLED"] = "false"
+    load_package()
+
+    from sqlalchemy import func, select
+    from langgraph_launchpad.core.database import create_tables, get_engine, get_read_session_factory
+    from langgraph_launchpad.core.models import Thread, ThreadMessage
+    from langgraph_launchpad.core.usage import flush_usage, get_usage, get_usage_buffer
+
+    def aggregate(db: Any, user_id: Any) -> Dict[str, int]:
+        threads = select(func.count()).select_from(Thread)
+        turns = select(func.count()).select_from(ThreadMessage).where(ThreadMessage.role == "human")
+        if user_id is not None:
+            threads = threads.where(Thread.user_id == user_id)
+            turns = turns.where(ThreadMessage.user_id == user_id)
+        return {"threads": db.execute(threads).scalar(), "turns": db.execute(turns).scalar()}
+
+    results: List[Dict[str, Any]] = []
+    try:
+        create_tables()
+        buffer = get_usage_buffer()
+        created = 0
+        for count in (int(value) for value in args.threads.split(",")):
+            threads = [{"user_id": f"user-{i % args.users}"} for i in range(count - created)]
+            with get_engine().begin() as conn:
+                conn.execute(Thread.__table__.insert(), threads)
+                conn.execute(
+                    ThreadMessage.__table__.insert(),
+                    [
+                        {
+                            "thread_id": thread_id,
+                            "user_id": thread["user_id"],
+                            "position": position,
+                            "role": "human" if position % 2 == 0 else "ai",
+                            "content": f"message {position} of thread {thread_id}",
+                        }
+                        for thread_id, thread in enumerate(threads, start=created + 1)
+                        for position in range(args.turns * 2)
+                    ],
+                )
+            for thread in threads:
+                buffer.add(thread["user_id"], threads_created=1)
+                for _ in range(args.turns):
+                    buffer.add(thread["user_id"], turns=1, latency_ms_total=100.0, latency_ms_max=100.0)
+            flush_usage()
+            created = count
+
+            with get_read_session_factory()() as db:
+                for scope, user_id in (("user", "user-0"), ("all users", None)):
+                    for method, run in (
+                        ("rollup", lambda: get_usage(db, user_id=user_id)),
+                        ("aggregate", lambda: aggregate(db, user_id)),
+                    ):
+                        results.append({
+                            "threads": count,
+                            "scope": scope,
+                            "method": method,
+                            **timed(run, args.repeat),
+                        })
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(format_table(
+        ["threads", "scope", "method", "mean ms", "p50 ms", "p99 ms"],
+        [
+            [
+                result["threads"],
+                result["scope"],
+                result["method"],
+                f"{result['mean_ms']:.3f}",
+                f"{result['p50_ms']:.3f}",
+                f"{result['p99_ms']:.3f}",
+            ]
+            for result in results
+        ],
+    ))
+    write_json(args.output, {"config": vars(args), "results": results})
+
+
+if __name__ == "__main__":
+    main()
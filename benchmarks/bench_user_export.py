@@ -0,0 +1,122 @@
+"""Peak memory and throughput of a user export as the user's history grows.
+
+Creates threads for one user through the application graph (offline echo
+replies, SQLite), then exports them two ways: the streaming
+``export_user_threads`` NDJSON pipeline, and the previous approach of
+listing the threads and loading every history into one response. Peak
+Python memory is measured with ``tracemalloc``; the streaming export
+should stay flat while the materialized one grows with the history.
+
+Usage:
+    python benchmarks/bench_user_export.py --threads 250,1000,4000 --turns 2
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from _common import format_table, human_bytes, load_package, write_json
+
+
+def measure(run: Callable[[], int]) -> Dict[str, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = run()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": elapsed, "peak_bytes": peak, "output_bytes": size}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--threads", default="250,1000,4000", help="Thread counts to export")
+    parser.add_argument("--turns", type=int, default=2)
+    parser.add_argument("--output", help="Write raw results as JSON to this path")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="lgl-export-bench-")
+    os.environ["DATABASE_TYPE"] = "sqlite"
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["LOG_LEVEL"] = "WARNING"
+    os.environ["OPENAI_API_KEY"] = ""
+    os.environ["SEARCH_INDEX_ENABLED"] = "false"
+    load_package()
+
+    from langchain_core.messages import HumanMessage
+    from langgraph_launchpad.core.database import create_tables, get_engine
+    from langgraph_launchpad.core.export import buffered, export_user_threads, ndjson_lines
+    from langgraph_launchpad.core.models import Thread
+    from langgraph_launchpad.graph.builder import get_graph, get_thread_messages
+
+    def materialized(user_id: str) -> int:
+        with get_engine().connect() as conn:
+            threads = conn.execute(Thread.__table__.select().where(Thread.user_id == user_id)).all()
+        export = [
+            {
+                "thread_id": thread.thread_id,
+                "messages": [
+                    {"role": message.type, "content": message.content}
+                    for message in get_thread_messages(thread.thread_id)
+                ],
+            }
+            for thread in threads
+        ]
+        return len(json.dumps(export))
+
+    def streamed(user_id: str) -> int:
+        return sum(len(chunk) for chunk in buffered(ndjson_lines(export_user_threads(user_id))))
+
+    results: List[Dict[str, Any]] = []
+    try:
+        create_tables()
+        graph = get_graph()
+        created = 0
+        for count in (int(value) for value in args.threads.split(",")):
+            user_id = f"user-{count}"
+            with get_engine().begin() as conn:
+                conn.execute(Thread.__table__.insert(), [{"user_id": user_id} for _ in range(count)])
+            for thread_id in range(created + 1, created + count + 1):
+                for turn in range(args.turns):
+                    text = f"Turn {turn} of thread {thread_id}: " + "tell me about my order. " * 10
+                    graph.invoke(
+                        {
+                            "messages": [HumanMessage(content=text, name="user")],
+                            "user_question": text,
+                            "reasoning": False,
+                            "current_step": "start",
+                            "metadata": {},
+                        },
+                        config={"configurable": {"thread_id": str(thread_id)}},
+                    )
+            created += count
+
+            for method, run in (("materialized", materialized), ("streamed", streamed)):
+                results.append({"threads": count, "method": method, **measure(lambda: run(user_id))})
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(format_table(
+        ["threads", "method", "seconds", "threads/s", "peak memory", "output"],
+        [
+            [
+                result["threads"],
+                result["method"],
+                f"{result['seconds']:.2f}",
+                f"{result['threads'] / result['seconds']:.0f}",
+                human_bytes(result["peak_bytes"]),
+                human_bytes(result["output_bytes"]),
+            ]
+            for result in results
+        ],
+    ))
+    write_json(args.output, {"config": vars(args), "results": results})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Throughput scaling with the number of production workers.
+
+Starts the API in production serve mode (``SERVE_MODE=production``) once per
+worker count, creates a pool of threads, then drives chat turns against it
+from concurrent keep-alive clients for a fixed duration. Chat turns run the
+real graph with the echo fallback, so the workload is CPU bound and scales
+with processes rather than with the event loop.
+
+Usage:
+    python benchmarks/bench_workers.py --workers 1,2,4 --concurrency 32 --duration 15
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from _common import format_table, subprocess_env, summarize, write_json
+
+SERVER_CODE = "from langgraph_launchpad.main import main; main()"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def request(conn: http.client.HTTPConnection, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Any:
+    payload = json.dumps(body) if body is not None else None
+    headers = {"Content-Type": "application/json"} if payload else {}
+    conn.request(method, path, body=payload, headers=headers)
+    response = conn.getresponse()
+    data = response.read()
+    if response.status >= 400:
+        raise RuntimeError(f"{method} {path} -> {response.status}: {data[:200]!r}")
+    return json.loads(data) if data else None
+
+
+def wait_until_healthy(port: int, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("server exited during startup")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            request(conn, "GET", "/health")
+            conn.close()
+            return
+        except (OSError, RuntimeError):
+            time.sleep(0.2)
+    raise RuntimeError("server did not become healthy")
+
+
+def drive_load(port: int, thread_ids: List[int], concurrency: int, duration: float) -> Dict[str, Any]:
+    """Send chat turns from ``concurrency`` clients for ``duration`` seconds."""
+    latencies: List[List[float]] = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+    stop_at = time.monotonic() + duration
+
+    def client(index: int) -> None:
+        rng = random.Random(index)
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        while time.monotonic() < stop_at:
+            thread_id = rng.choice(thread_ids)
+            start = time.perf_counter()
+            try:
+                request(conn, "POST", f"/api/v1/threads/{thread_id}/chat", {"message": "How does this scale?"})
+                latencies[index].append(time.perf_counter() - start)
+            except (OSError, RuntimeError, http.client.HTTPException):
+                errors[index] += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        conn.close()
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=client, args=(index,)) for index in range(concurrency)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    merged = [value for values in latencies for value in values]
+    return {
+        "requests": len(merged),
+        "errors": sum(errors),
+        "throughput_rps": len(merged) / elapsed,
+        "latency": summarize(merged),
+    }
+
+
+def run_for_workers(workers: int, args: argparse.Namespace, workdir: str) -> Dict[str, Any]:
+    port = free_port()
+    env = subprocess_env(
+        SERVE_MODE="production",
+        WORKERS=str(workers),
+        HOST="127.0.0.1",
+        PORT=str(port),
+        DATABASE_TYPE="sqlite",
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, f'workers-{workers}.db')}",
+        OPENAI_API_KEY="",
+        LOG_LEVEL="WARNING",
+        PREWARM="true",
+    )
+    process = subprocess.Popen(
+        [sys.executable, "-c", SERVER_CODE],
+        env=env,
+        cwd=workdir,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_healthy(port, process)
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        thread_ids = [
+            request(conn, "POST", "/api/v1/threads", {"user_id": f"bench-{index % 10}"})["thread_id"]
+            for index in range(args.threads)
+        ]
+        conn.close()
+        drive_load(port, thread_ids, args.concurrency, args.warmup)
+        return drive_load(port, thread_ids, args.concurrency, args.duration)
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--workers", default="1,2,4", help="Comma separated worker counts")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent clients")
+    parser.add_argument("--threads", type=int, default=200, help="Threads to spread chat turns over")
+    parser.add_argument("--duration", type=float, default=15.0, help="Measured seconds per run")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Unmeasured seconds per run")
+    parser.add_argument("--output", help="Write raw results as JSON to this path")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="lgl-workers-bench-")
+    results: Dict[int, Dict[str, Any]] = {}
+    for workers in (int(value) for value in args.workers.split(",")):
+        print(f"Running with {workers} worker(s)...")
+        results[workers] = run_for_workers(workers, args, workdir)
+
+    baseline = results[min(results)]["throughput_rps"] or 1.0
+    print()
+    print(format_table(
+        ["workers", "req/s", "speedup", "p50 ms", "p99 ms", "errors"],
+        [
+            [
+                workers,
+                f"{result['throughput_rps']:.1f}",
+                f"{result['throughput_rps'] / baseline:.2f}x",
+                f"{result['latency']['p50_ms']:.1f}",
+                f"{result['latency']['p99_ms']:.1f}",
+                result["errors"],
+            ]
+            for workers, result in sorted(results.items())
+        ],
+    ))
+    write_json(args.output, {"config": vars(args), "results": results})
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
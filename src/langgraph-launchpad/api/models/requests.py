@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -43,6 +43,19 @@ class ChatRequest(BaseModel):
         description="Whether to stream the response"
     )
     
+    graph: Optional[str] = Field(
+        None,
+        description="Registered graph to run. Defaults to the server's default graph.",
+        max_length=255
+    )
+    
+    user_id: Optional[str] = Field(
+        None,
+        description="If given, the thread must belong to this user",
+        min_length=1,
+        max_length=255
+    )
+    
     class Config:
         json_schema_extra = {
             "example": {
@@ -61,4 +74,62 @@ class UpdateThreadRequest(BaseModel):
         description="New user ID for the thread",
         min_length=1,
         max_length=255
-    )
\ No newline at end of file
+    )
+
+
+class BulkCreateThreadsRequest(BaseModel):
+    """Request model for creating many threads at once."""
+    
+    threads: List[CreateThreadRequest] = Field(
+        ...,
+        description="Threads to create, in order",
+        min_length=1
+    )
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "threads": [{"user_id": "user123"}, {"user_id": "user456"}]
+            }
+        }
+
+
+class BulkDeleteThreadsRequest(BaseModel):
+    """Request model for deleting many threads at once."""
+    
+    thread_ids: List[int] = Field(
+        ...,
+        description="IDs of the threads to delete",
+        min_length=1
+    )
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "thread_ids": [1, 2, 3]
+            }
+        }
+
+
+class ReloadGraphRequest(BaseModel):
+    """Request model for hot-swapping a graph to a new version."""
+    
+    factory: Optional[str] = Field(
+        None,
+        description=(
+            "module:function graph factory, one of those in graph_factories. "
+            "Defaults to the active version's factory."
+        ),
+        examples=["langgraph_launchpad.graph.builder:create_graph"]
+    )
+    
+    reload_modules: List[str] = Field(
+        default_factory=list,
+        description="Modules of this package to re-import, in order, before the factory module",
+        examples=[["langgraph_launchpad.graph.nodes.example_agent"]]
+    )
+    
+    activate: bool = Field(
+        default=True,
+        description="Whether new runs should switch to the new version"
+    )
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import List, Optional, Any, Dict
 
 from pydantic import BaseModel, Field
@@ -34,6 +34,39 @@ class CreateThreadResponse(BaseModel):
         }
 
 
+class ForkThreadResponse(BaseModel):
+    """Response model for forking a thread."""
+    
+    thread_id: int = Field(
+        ...,
+        description="The unique identifier for the new thread",
+        example=2
+    )
+    
+    user_id: str = Field(
+        ...,
+        description="User ID for the new thread's owner",
+        example="user123"
+    )
+    
+    created_at: datetime = Field(
+        ...,
+        description="Thread creation timestamp"
+    )
+    
+    parent_thread_id: int = Field(
+        ...,
+        description="The thread that was forked",
+        example=1
+    )
+    
+    parent_checkpoint_id: Optional[str] = Field(
+        None,
+        description="The parent's checkpoint the new thread starts from; null if the parent had none",
+        example="1f1cb605-eb47-63c6-8006-a052a64593c2"
+    )
+
+
 class MessageResponse(BaseModel):
     """Response model for individual messages."""
     
@@ -86,6 +119,82 @@ class ChatResponse(BaseModel):
     )
 
 
+class BulkThreadResult(BaseModel):
+    """Per-item outcome of a bulk thread operation."""
+    
+    index: int = Field(
+        ...,
+        description="Position of the item in the request",
+        example=0
+    )
+    
+    status: str = Field(
+        ...,
+        description="Outcome: created, deleted, not_found or failed",
+        example="created"
+    )
+    
+    thread_id: Optional[int] = Field(
+        None,
+        description="The thread ID",
+        example=1
+    )
+    
+    user_id: Optional[str] = Field(
+        None,
+        description="The thread owner's user ID",
+        example="user123"
+    )
+    
+    created_at: Optional[datetime] = Field(
+        None,
+        description="Thread creation timestamp"
+    )
+    
+    error: Optional[str] = Field(
+        None,
+        description="Error message when the item failed"
+    )
+
+
+class BulkCreateThreadsResponse(BaseModel):
+    """Response model for bulk thread creation."""
+    
+    results: List[BulkThreadResult] = Field(
+        ...,
+        description="One result per requested thread, in request order"
+    )
+    
+    created: int = Field(
+        ...,
+        description="Number of threads created"
+    )
+    
+    failed: int = Field(
+        ...,
+        description="Number of threads that could not be created"
+    )
+
+
+class BulkDeleteThreadsResponse(BaseModel):
+    """Response model for bulk thread deletion."""
+    
+    results: List[BulkThreadResult] = Field(
+        ...,
+        description="One result per requested thread ID, in request order"
+    )
+    
+    deleted: int = Field(
+        ...,
+        description="Number of threads deleted"
+    )
+    
+    not_found: int = Field(
+        ...,
+        description="Number of requested threads that did not exist"
+    )
+
+
 class ThreadHistoryResponse(BaseModel):
     """Response model for thread history."""
     
@@ -142,9 +251,9 @@ class ThreadInfo(BaseModel):
         description="Thread last update timestamp"
     )
     
-    message_count: int = Field(
-        default=0,
-        description="Number of messages in the thread"
+    message_count: Optional[int] = Field(
+        default=None,
+        description="Number of messages in the thread; null if not counted yet (counts are stored in the background)"
     )
 
 
@@ -235,4 +344,688 @@ class HealthResponse(BaseModel):
     timestamp: datetime = Field(
         ...,
         description="Health check timestamp"
-    )
\ No newline at end of file
+    )
+
+
+class DependencyCheck(BaseModel):
+    """Result of one dependency connectivity check."""
+    
+    ok: bool = Field(
+        ...,
+        description="Whether the dependency answered in time"
+    )
+    
+    latency_ms: Optional[float] = Field(
+        None,
+        description="Time the check took in milliseconds"
+    )
+    
+    error: Optional[str] = Field(
+        None,
+        description="Why the check failed"
+    )
+
+
+class PoolStatus(BaseModel):
+    """Connection usage of a database pool."""
+    
+    size: int = Field(
+        ...,
+        description="Connections the pool keeps open"
+    )
+    
+    checked_out: int = Field(
+        ...,
+        description="Connections currently in use"
+    )
+    
+    overflow: int = Field(
+        ...,
+        description="Connections open beyond the pool size"
+    )
+    
+    capacity: Optional[int] = Field(
+        None,
+        description="Most connections the pool hands out; null if unlimited"
+    )
+    
+    saturation: Optional[float] = Field(
+        None,
+        description="Share of the capacity in use"
+    )
+
+
+class ReadinessResponse(BaseModel):
+    """Response model for the readiness check."""
+    
+    status: str = Field(
+        ...,
+        description="'ready' or 'not_ready'",
+        example="ready"
+    )
+    
+    reasons: List[str] = Field(
+        ...,
+        description="Why the worker is not ready; empty when it is"
+    )
+    
+    checks: Dict[str, DependencyCheck] = Field(
+        ...,
+        description="Connectivity checks by dependency"
+    )
+    
+    event_loop_lag_ms: float = Field(
+        ...,
+        description="Most recent event loop lag in milliseconds"
+    )
+    
+    event_loop_max_lag_ms: float = Field(
+        ...,
+        description="Worst event loop lag over the sampling window in milliseconds"
+    )
+    
+    pools: Dict[str, PoolStatus] = Field(
+        ...,
+        description="Database connection pool usage"
+    )
+    
+    runs_in_flight: int = Field(
+        ...,
+        description="Graph runs holding a run slot in this worker"
+    )
+    
+    runs_queued: int = Field(
+        ...,
+        description="Graph runs waiting for a run slot in this worker"
+    )
+    
+    timestamp: datetime = Field(
+        ...,
+        description="Check timestamp"
+    )
+
+
+class MetricsResponse(BaseModel):
+    """Response model for the in-process metrics export."""
+    
+    counters: Dict[str, List[Dict[str, Any]]] = Field(
+        ...,
+        description="Counter series by name"
+    )
+    
+    gauges: Dict[str, List[Dict[str, Any]]] = Field(
+        ...,
+        description="Gauge series by name"
+    )
+    
+    histograms: Dict[str, List[Dict[str, Any]]] = Field(
+        ...,
+        description="Histogram summaries by name"
+    )
+
+
+class CompactionResponse(BaseModel):
+    """Response model for a checkpoint compaction run."""
+    
+    keep_last: int = Field(
+        ...,
+        description="Checkpoints kept per thread (0 keeps all)",
+        example=20
+    )
+    
+    threads_trimmed: int = Field(
+        ...,
+        description="Threads that had checkpoints removed"
+    )
+    
+    orphaned_threads: int = Field(
+        ...,
+        description="Deleted threads whose leftover checkpoint data was purged"
+    )
+    
+    rows_deleted: Dict[str, int] = Field(
+        ...,
+        description="Rows deleted per checkpointer table"
+    )
+    
+    vacuumed: bool = Field(
+        ...,
+        description="Whether VACUUM/ANALYZE ran"
+    )
+    
+    vacuum_seconds: float = Field(
+        ...,
+        description="Time spent in VACUUM/ANALYZE"
+    )
+    
+    bytes_before: int = Field(
+        ...,
+        description="Checkpoint storage in use before compaction"
+    )
+    
+    bytes_after: int = Field(
+        ...,
+        description="Checkpoint storage in use after compaction"
+    )
+    
+    bytes_reclaimed: int = Field(
+        ...,
+        description="Bytes freed by this run"
+    )
+    
+    duration_seconds: float = Field(
+        ...,
+        description="Total run time"
+    )
+
+
+class ArchiveStatsResponse(BaseModel):
+    """Response model for cold-storage archive statistics."""
+    
+    hot_threads: int = Field(
+        ...,
+        description="Threads whose history is in the database"
+    )
+    
+    cold_threads: int = Field(
+        ...,
+        description="Threads whose history is archived to files"
+    )
+    
+    cold_bytes: int = Field(
+        ...,
+        description="Compressed size of all archive files"
+    )
+    
+    rehydrations: int = Field(
+        ...,
+        description="Threads restored from the archive by this worker"
+    )
+    
+    rehydration_latency_ms: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Rehydration latency summary (mean, p50, p95, p99, max) for this worker"
+    )
+
+
+class ArchiveRunResponse(BaseModel):
+    """Response model for an archival run."""
+    
+    candidates: int = Field(
+        ...,
+        description="Inactive threads selected for archival"
+    )
+    
+    archived: int = Field(
+        ...,
+        description="Threads moved to cold storage"
+    )
+    
+    skipped: int = Field(
+        ...,
+        description="Threads left hot because they became active or failed"
+    )
+    
+    bytes_written: int = Field(
+        ...,
+        description="Compressed bytes written to the archive"
+    )
+
+
+class GraphVersionInfo(BaseModel):
+    """Response model for one registered graph version."""
+    
+    name: str = Field(
+        ...,
+        description="Graph name"
+    )
+    
+    version: int = Field(
+        ...,
+        description="Version number, increasing per graph"
+    )
+    
+    factory: Optional[str] = Field(
+        None,
+        description="module:function factory path"
+    )
+    
+    active: bool = Field(
+        ...,
+        description="Whether new runs use this version"
+    )
+    
+    compiled: bool = Field(
+        ...,
+        description="Whether the compiled graph is cached"
+    )
+    
+    in_flight: int = Field(
+        ...,
+        description="Runs currently executing on this version"
+    )
+    
+    registered_at: float = Field(
+        ...,
+        description="Registration time (Unix seconds)"
+    )
+
+
+class GraphListResponse(BaseModel):
+    """Response model for the graph registry."""
+    
+    default: str = Field(
+        ...,
+        description="Graph used when a request names none"
+    )
+    
+    graphs: List[GraphVersionInfo] = Field(
+        ...,
+        description="Every registered graph version"
+    )
+
+
+class SchedulerUserInfo(BaseModel):
+    """Scheduler state of one user with runs in flight or queued."""
+    
+    user_id: str = Field(
+        ...,
+        description="User the runs belong to"
+    )
+    
+    weight: float = Field(
+        ...,
+        description="Fair-share weight of the user"
+    )
+    
+    in_flight: int = Field(
+        ...,
+        description="Runs of this user currently executing"
+    )
+    
+    queued: int = Field(
+        ...,
+        description="Runs of this user waiting for a slot"
+    )
+
+
+class SchedulerStatsResponse(BaseModel):
+    """Response model for the graph run scheduler of this worker."""
+    
+    max_concurrency: int = Field(
+        ...,
+        description="Graph runs executing at once on this worker"
+    )
+    
+    per_user_concurrency: int = Field(
+        ...,
+        description="Graph runs one user may execute at once on this worker"
+    )
+    
+    in_flight: int = Field(
+        ...,
+        description="Runs currently executing"
+    )
+    
+    queued: int = Field(
+        ...,
+        description="Runs waiting for a slot"
+    )
+    
+    users: List[SchedulerUserInfo] = Field(
+        default_factory=list,
+        description="Users with runs in flight or queued"
+    )
+    
+    wait_seconds: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Queue wait summary across users since this worker started"
+    )
+
+
+class BlockingReport(BaseModel):
+    """One event loop stall caught by the blocking call detector."""
+    
+    route: str = Field(
+        ...,
+        description="Route of the request whose task held the loop, or '-' outside requests"
+    )
+    
+    task: Optional[str] = Field(
+        None,
+        description="Name of the asyncio task that held the loop"
+    )
+    
+    blocked_ms: float = Field(
+        ...,
+        description="How long the loop had been blocked when the stack was captured"
+    )
+    
+    stack: List[str] = Field(
+        ...,
+        description="Loop thread stack at that moment, innermost frame last"
+    )
+    
+    at: float = Field(
+        ...,
+        description="Unix time of the report"
+    )
+
+
+class BlockingStatsResponse(BaseModel):
+    """Response model for the blocking call detector."""
+    
+    enabled: bool = Field(
+        ...,
+        description="Whether the detector is running in this worker"
+    )
+    
+    threshold_ms: float = Field(
+        ...,
+        description="Stall length that is reported"
+    )
+    
+    blocked_by_route: Dict[str, float] = Field(
+        ...,
+        description="Stalls reported per route since this worker started"
+    )
+    
+    reports: List[BlockingReport] = Field(
+        ...,
+        description="Most recent stalls, newest first"
+    )
+
+
+class AllocationStat(BaseModel):
+    """Memory allocated at one site, from a tracemalloc snapshot."""
+    
+    location: str = Field(
+        ...,
+        description="Innermost file:line of the allocation site"
+    )
+    
+    traceback: List[str] = Field(
+        ...,
+        description="Recorded frames, innermost first"
+    )
+    
+    bytes: int = Field(
+        ...,
+        description="Bytes allocated there and still alive"
+    )
+    
+    count: int = Field(
+        ...,
+        description="Live allocations there"
+    )
+    
+    bytes_diff: Optional[int] = Field(
+        None,
+        description="Change in bytes since the baseline snapshot"
+    )
+    
+    count_diff: Optional[int] = Field(
+        None,
+        description="Change in allocations since the baseline snapshot"
+    )
+
+
+class MemorySnapshotResponse(BaseModel):
+    """Response model for a memory snapshot or diff."""
+    
+    top: List[AllocationStat] = Field(
+        ...,
+        description="Largest allocation sites, or largest growth for a diff"
+    )
+    
+    traced_bytes: Optional[int] = Field(
+        None,
+        description="Bytes traced in the snapshot"
+    )
+    
+    traced_bytes_diff: Optional[int] = Field(
+        None,
+        description="Change in traced bytes since the baseline snapshot"
+    )
+    
+    rss_bytes: int = Field(
+        ...,
+        description="Resident memory of this worker"
+    )
+    
+    traced_current_bytes: int = Field(
+        ...,
+        description="Bytes currently traced by tracemalloc"
+    )
+    
+    traced_peak_bytes: int = Field(
+        ...,
+        description="Traced peak since tracing started or the last sampled request"
+    )
+
+
+class MemoryStatsResponse(BaseModel):
+    """Response model for memory profiling state."""
+    
+    tracing: bool = Field(
+        ...,
+        description="Whether tracemalloc is tracing allocations"
+    )
+    
+    rss_bytes: int = Field(
+        ...,
+        description="Resident memory of this worker"
+    )
+    
+    traced_current_bytes: int = Field(
+        ...,
+        description="Bytes currently traced by tracemalloc"
+    )
+    
+    traced_peak_bytes: int = Field(
+        ...,
+        description="Traced peak since tracing started or the last sampled request"
+    )
+    
+    route_peak_bytes: Dict[str, Dict[str, float]] = Field(
+        ...,
+        description="Peak allocation summary of sampled requests per route"
+    )
+    
+    broadcast_buffered_events: int = Field(
+        ...,
+        description="Run events held in subscriber buffers and live run replays"
+    )
+
+
+class ThreadMemory(BaseModel):
+    """Approximate graph state size of one thread."""
+    
+    thread_id: str = Field(
+        ...,
+        description="Thread ID"
+    )
+    
+    approximate_bytes: int = Field(
+        ...,
+        description="Estimated in-memory size of the thread's latest state"
+    )
+
+
+class ThreadMemoryResponse(BaseModel):
+    """Response model for per-thread graph state sizes."""
+    
+    threads: List[ThreadMemory] = Field(
+        ...,
+        description="Largest threads first"
+    )
+    
+    thread_count: int = Field(
+        ...,
+        description="Threads measured"
+    )
+    
+    total_bytes: int = Field(
+        ...,
+        description="Estimated size of all measured threads"
+    )
+    
+    cache_bytes: int = Field(
+        ...,
+        description="Estimated bytes held by the thread state cache"
+    )
+    
+    cache_max_bytes: int = Field(
+        ...,
+        description="Byte budget of the thread state cache"
+    )
+
+
+class SearchHit(BaseModel):
+    """A message matching a search query."""
+    
+    thread_id: int = Field(
+        ...,
+        description="Thread containing the message"
+    )
+    
+    user_id: str = Field(
+        ...,
+        description="The thread owner's user ID"
+    )
+    
+    position: int = Field(
+        ...,
+        description="Index of the message in the thread's conversation"
+    )
+    
+    role: str = Field(
+        ...,
+        description="Message type, e.g. human or ai"
+    )
+    
+    snippet: str = Field(
+        ...,
+        description="Excerpt of the message with matches in [brackets]"
+    )
+    
+    rank: float = Field(
+        ...,
+        description="Relevance score; higher is better"
+    )
+
+
+class SearchResponse(BaseModel):
+    """Response model for message search."""
+    
+    query: str = Field(
+        ...,
+        description="The phrase searched for"
+    )
+    
+    results: List[SearchHit] = Field(
+        ...,
+        description="Matching messages, best first"
+    )
+    
+    limit: int = Field(
+        ...,
+        description="Page size"
+    )
+    
+    offset: int = Field(
+        ...,
+        description="Matches skipped before this page"
+    )
+    
+    has_more: bool = Field(
+        ...,
+        description="Whether another page of matches exists"
+    )
+
+
+class SearchBackfillResponse(BaseModel):
+    """Response model for a search index backfill run."""
+    
+    threads: int = Field(
+        ...,
+        description="Threads indexed in this run"
+    )
+    
+    messages: int = Field(
+        ...,
+        description="Messages added to the index"
+    )
+    
+    next_after: Optional[int] = Field(
+        None,
+        description="Pass as 'after' to continue the backfill; null when done"
+    )
+
+
+class UsageStatsResponse(BaseModel):
+    """Response model for usage statistics."""
+    
+    user_id: Optional[str] = Field(
+        None,
+        description="User the usage belongs to; null for all users"
+    )
+    
+    day: Optional[date] = Field(
+        None,
+        description="UTC day the usage belongs to; null for all time"
+    )
+    
+    threads_created: int = Field(
+        ...,
+        description="Threads created"
+    )
+    
+    threads_deleted: int = Field(
+        ...,
+        description="Threads deleted"
+    )
+    
+    active_threads: int = Field(
+        ...,
+        description="Threads created minus threads deleted"
+    )
+    
+    turns: int = Field(
+        ...,
+        description="Completed chat turns"
+    )
+    
+    prompt_tokens: int = Field(
+        ...,
+        description="Model input tokens reported for those turns"
+    )
+    
+    completion_tokens: int = Field(
+        ...,
+        description="Model output tokens reported for those turns"
+    )
+    
+    mean_latency_ms: float = Field(
+        ...,
+        description="Mean chat turn latency in milliseconds"
+    )
+    
+    max_latency_ms: float = Field(
+        ...,
+        description="Slowest chat turn in milliseconds"
+    )
+
+
+class DailyUsageResponse(BaseModel):
+    """Response model for per-day usage statistics."""
+    
+    user_id: Optional[str] = Field(
+        None,
+        description="User the usage belongs to; null for all users"
+    )
+    
+    days: List[UsageStatsResponse] = Field(
+        ...,
+        description="Usage per UTC day, oldest first"
+    )
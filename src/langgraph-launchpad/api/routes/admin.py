@@ -0,0 +1,304 @@
+from typing import List, Literal, Optional
+
+import structlog
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+
+from ...core.archive import archive_inactive_threads, archive_stats
+from ...core.blocking import get_blocking_detector
+from ...core.broadcast import get_broker
+from ...core.memory import get_memory_profiler, thread_state_sizes
+from ...core.retention import compact_checkpoints
+from ...core.scheduler import get_scheduler
+from ...core.search import backfill_search_index
+from ...graph.registry import get_registry
+from ...utils.exceptions import GraphNotFoundException
+from ...utils.metrics import metrics
+from ..models.requests import ReloadGraphRequest
+from ..models.responses import (
+    ArchiveRunResponse,
+    ArchiveStatsResponse,
+    BlockingStatsResponse,
+    CompactionResponse,
+    ErrorResponse,
+    GraphListResponse,
+    MemorySnapshotResponse,
+    MemoryStatsResponse,
+    MetricsResponse,
+    SchedulerStatsResponse,
+    SearchBackfillResponse,
+    ThreadMemoryResponse,
+)
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+logger = structlog.get_logger()
+
+
+@router.get(
+    "/metrics",
+    response_model=MetricsResponse,
+    summary="Export metrics",
+    description="Export this worker's in-process counters, gauges and histograms",
+)
+async def get_metrics() -> MetricsResponse:
+    """Export in-process metrics."""
+    return MetricsResponse(**metrics.snapshot())
+
+
+@router.post(
+    "/checkpoints/compact",
+    response_model=CompactionResponse,
+    responses={
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    },
+    summary="Compact checkpoints",
+    description="Trim threads to their latest checkpoints, purge orphaned data and optionally VACUUM",
+)
+async def compact(
+    keep_last: Optional[int] = None,
+    vacuum: bool = False,
+) -> CompactionResponse:
+    """Run checkpoint compaction now."""
+    try:
+        logger.info("Running checkpoint compaction", keep_last=keep_last, vacuum=vacuum)
+        result = await run_in_threadpool(compact_checkpoints, keep_last, vacuum)
+        return CompactionResponse(**result)
+    
+    except Exception as e:
+        logger.error("Checkpoint compaction failed", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to compact checkpoints"
+        )
+
+
+@router.get(
+    "/archive",
+    response_model=ArchiveStatsResponse,
+    responses={
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    },
+    summary="Archive statistics",
+    description="Count hot and archived threads, archive size and rehydration latency",
+)
+async def get_archive_stats() -> ArchiveStatsResponse:
+    """Get cold-storage archive statistics."""
+    try:
+        return ArchiveStatsResponse(**await run_in_threadpool(archive_stats))
+    
+    except Exception as e:
+        logger.error("Failed to read archive statistics", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to read archive statistics"
+        )
+
+
+@router.post(
+    "/archive/run",
+    response_model=ArchiveRunResponse,
+    responses={
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    },
+    summary="Archive inactive threads",
+    description="Move the history of inactive threads to cold storage now",
+)
+async def run_archive(limit: Optional[int] = None) -> ArchiveRunResponse:
+    """Run thread archival now."""
+    try:
+        logger.info("Running thread archival", limit=limit)
+        result = await run_in_threadpool(archive_inactive_threads, limit)
+        return ArchiveRunResponse(**result)
+    
+    except Exception as e:
+        logger.error("Thread archival failed", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to archive threads"
+        )
+
+
+@router.post(
+    "/search/backfill",
+    response_model=SearchBackfillResponse,
+    responses={
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    },
+    summary="Backfill the search index",
+    description="Index the messages of threads not yet in the search index, continuing after the 'after' thread ID",
+)
+async def run_search_backfill(limit: Optional[int] = None, after: int = 0) -> SearchBackfillResponse:
+    """Index existing threads for message search."""
+    try:
+        logger.info("Backfilling search index", limit=limit, after=after)
+        return SearchBackfillResponse(**await run_in_threadpool(backfill_search_index, limit, after))
+    
+    except Exception as e:
+        logger.error("Search index backfill failed", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to backfill the search index"
+        )
+
+
+def _graph_list() -> GraphListResponse:
+    registry = get_registry()
+    return GraphListResponse(default=registry.default, graphs=registry.describe())
+
+
+@router.get(
+    "/graphs",
+    response_model=GraphListResponse,
+    summary="List graphs",
+    description="List every registered graph version, which one is active and its in-flight runs",
+)
+async def list_graphs() -> GraphListResponse:
+    """List registered graphs."""
+    return _graph_list()
+
+
+@router.post(
+    "/graphs/{name}/reload",
+    response_model=GraphListResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Factory or module not allowed, or failed to load or compile"},
+        404: {"model": ErrorResponse, "description": "Graph not found"},
+    },
+    summary="Hot-swap a graph",
+    description=(
+        "Re-import a configured graph factory, compile it as a new version and make new runs use it. "
+        "Only factories in graph_factories and modules of this package can be reloaded. "
+        "Runs already in progress finish on the version they started with."
+    ),
+)
+async def reload_graph(name: str, request: ReloadGraphRequest) -> GraphListResponse:
+    """Register and activate a new version of a graph."""
+    try:
+        logger.info("Reloading graph", graph=name, factory=request.factory)
+        await run_in_threadpool(
+            get_registry().reload,
+            name,
+            request.factory,
+            request.reload_modules,
+            request.activate,
+        )
+        return _graph_list()
+    
+    except GraphNotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
+    except Exception as e:
+        logger.error("Graph reload failed", graph=name, error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to reload graph '{name}': {e}"
+        )
+
+
+@router.post(
+    "/graphs/{name}/versions/{version}/activate",
+    response_model=GraphListResponse,
+    responses={
+        404: {"model": ErrorResponse, "description": "Graph version not found"},
+    },
+    summary="Activate a graph version",
+    description="Switch new runs of a graph to an already registered version, e.g. to roll back",
+)
+async def activate_graph(name: str, version: int) -> GraphListResponse:
+    """Activate a registered graph version."""
+    try:
+        get_registry().activate(name, version)
+        return _graph_list()
+    
+    except GraphNotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
+
+
+@router.get(
+    "/scheduler",
+    response_model=SchedulerStatsResponse,
+    summary="Get run scheduler state",
+    description="Show run slots in use, queued runs per user and per-user queue wait times on this worker",
+)
+async def get_scheduler_stats() -> SchedulerStatsResponse:
+    """Get graph run scheduler state."""
+    return SchedulerStatsResponse(**get_scheduler().snapshot())
+
+
+@router.get(
+    "/blocking",
+    response_model=BlockingStatsResponse,
+    summary="Get blocked event loop reports",
+    description="Show event loop stalls per route and recent stacks (needs BLOCKING_DETECTOR_ENABLED)",
+)
+async def get_blocking_stats() -> BlockingStatsResponse:
+    """Get blocking call detector reports."""
+    return BlockingStatsResponse(**get_blocking_detector().snapshot())
+
+
+@router.get(
+    "/memory",
+    response_model=MemoryStatsResponse,
+    summary="Get memory usage",
+    description="Show this worker's RSS, traced memory, sampled per-route peak allocation and buffered run events",
+)
+async def get_memory_stats() -> MemoryStatsResponse:
+    """Get memory usage and per-route allocation peaks."""
+    profiler = get_memory_profiler()
+    return MemoryStatsResponse(
+        tracing=profiler.tracing,
+        route_peak_bytes=profiler.route_peaks(),
+        broadcast_buffered_events=get_broker().buffered_events(),
+        **profiler.usage(),
+    )
+
+
+@router.post(
+    "/memory/snapshot",
+    response_model=MemorySnapshotResponse,
+    responses={
+        409: {"model": ErrorResponse, "description": "Memory profiling is not enabled"},
+    },
+    summary="Take a memory snapshot",
+    description="Snapshot traced allocations, list the largest sites and keep it as the diff baseline",
+)
+async def take_memory_snapshot(
+    group_by: Literal["lineno", "filename", "traceback"] = "lineno",
+) -> MemorySnapshotResponse:
+    """Take a tracemalloc snapshot."""
+    try:
+        return MemorySnapshotResponse(**await run_in_threadpool(get_memory_profiler().snapshot, group_by))
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@router.get(
+    "/memory/diff",
+    response_model=MemorySnapshotResponse,
+    responses={
+        409: {"model": ErrorResponse, "description": "Memory profiling is not enabled or no snapshot was taken"},
+    },
+    summary="Diff memory against the snapshot",
+    description="Compare traced allocations with the last snapshot, largest growth first",
+)
+async def diff_memory_snapshot(
+    group_by: Literal["lineno", "filename", "traceback"] = "lineno",
+) -> MemorySnapshotResponse:
+    """Diff a new tracemalloc snapshot against the baseline."""
+    try:
+        return MemorySnapshotResponse(**await run_in_threadpool(get_memory_profiler().diff, group_by))
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@router.get(
+    "/memory/threads",
+    response_model=ThreadMemoryResponse,
+    summary="Get graph state size per thread",
+    description="Estimate the in-memory size of graph state per cached thread, or of the given threads",
+)
+async def get_thread_memory(
+    thread_id: Optional[List[int]] = Query(None, description="Measure these threads' latest state instead"),
+    limit: int = Query(20, ge=1, le=1000),
+) -> ThreadMemoryResponse:
+    """Estimate graph state size per thread."""
+    return ThreadMemoryResponse(**await run_in_threadpool(thread_state_sizes, thread_id, limit))
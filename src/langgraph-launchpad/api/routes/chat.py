@@ -1,28 +1,53 @@
 import json
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from ...core.database import get_db
-from ...core.models import Thread
-from ...utils.exceptions import GraphExecutionException, ThreadNotFoundException
+from ...config.settings import get_settings
+from ...core.archive import ensure_thread_hot
+from ...core.broadcast import broadcast_run, get_broker
+from ...core.database import get_read_db, get_read_session_factory
+from ...core.deadline import DEADLINE_HEADER, request_deadline, use_deadline
+from ...core.scheduler import get_scheduler
+from ...core.thread_cache import require_thread
+from ...utils.exceptions import (
+    DeadlineExceededException,
+    GraphExecutionException,
+    GraphNotFoundException,
+    SchedulerRejectedException,
+    ThreadNotFoundException,
+)
 from ..models.requests import ChatRequest
 from ..models.responses import ChatResponse, ErrorResponse
 from ...graph.builder import call_chatbot, stream_chatbot
+from ...graph.registry import get_registry
 
 router = APIRouter(tags=["chat"])
 logger = structlog.get_logger()
 
 
+def _deadline(timeout_header: Optional[str]) -> Optional[float]:
+    try:
+        return request_deadline(timeout_header)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{DEADLINE_HEADER} must be a positive number of seconds"
+        )
+
+
 @router.post(
     "/threads/{thread_id}/chat",
     response_model=ChatResponse,
     responses={
-        404: {"model": ErrorResponse, "description": "Thread not found"},
+        404: {"model": ErrorResponse, "description": "Thread or graph not found"},
+        429: {"model": ErrorResponse, "description": "Too many runs queued for this user"},
         500: {"model": ErrorResponse, "description": "Internal server error"},
+        504: {"model": ErrorResponse, "description": "Deadline passed before the run could start"},
     },
     summary="Send a chat message",
     description="Send a message to the AI agent in a specific thread",
@@ -30,9 +55,11 @@ logger = structlog.get_logger()
 async def chat(
     thread_id: int,
     request: ChatRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db),
+    timeout: Optional[str] = Header(None, alias=DEADLINE_HEADER),
 ) -> ChatResponse:
     """Send a chat message to the AI agent."""
+    deadline = _deadline(timeout)
     try:
         logger.info(
             "Processing chat message",
@@ -41,17 +68,24 @@ async def chat(
             reasoning=request.reasoning
         )
         
-        # Verify thread exists
-        thread = db.query(Thread).filter(Thread.thread_id == thread_id).first()
-        if not thread:
-            raise ThreadNotFoundException(thread_id)
+        # Verify thread exists (cached, so usually no database round trip)
+        owner = require_thread(db, thread_id, request.user_id)
         
-        # Call the chatbot
-        response_content = call_chatbot(
-            question=request.message,
-            thread_id=thread_id,
-            reasoning=request.reasoning
-        )
+        # Restore archived history before the graph loads its state
+        await run_in_threadpool(ensure_thread_hot, thread_id)
+        
+        # Wait for the owner's fair share of run slots, then run off the event loop;
+        # nodes that outlive the deadline fall back to degraded replies
+        with use_deadline(deadline):
+            async with get_scheduler().slot(owner), broadcast_run(thread_id, request.message) as broadcast:
+                response_content = await run_in_threadpool(
+                    call_chatbot,
+                    question=request.message,
+                    thread_id=thread_id,
+                    reasoning=request.reasoning,
+                    graph=request.graph
+                )
+                broadcast(response_content)
         
         logger.info("Chat message processed successfully", thread_id=thread_id)
         
@@ -67,6 +101,21 @@ async def chat(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Thread {thread_id} not found"
         )
+    except GraphNotFoundException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=e.message
+        )
+    except SchedulerRejectedException as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=e.message
+        )
+    except DeadlineExceededException as e:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=e.message
+        )
     except GraphExecutionException as e:
         logger.error("Graph execution failed", error=str(e), thread_id=thread_id)
         raise HTTPException(
@@ -84,7 +133,7 @@ async def chat(
 @router.post(
     "/threads/{thread_id}/chat/stream",
     responses={
-        404: {"description": "Thread not found"},
+        404: {"description": "Thread or graph not found"},
         500: {"description": "Internal server error"},
     },
     summary="Send a chat message with streaming",
@@ -93,9 +142,11 @@ async def chat(
 async def chat_stream(
     thread_id: int,
     request: ChatRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db),
+    timeout: Optional[str] = Header(None, alias=DEADLINE_HEADER),
 ):
     """Send a chat message with streaming response."""
+    deadline = _deadline(timeout)
     try:
         logger.info(
             "Processing streaming chat message",
@@ -103,28 +154,43 @@ async def chat_stream(
             message_length=len(request.message)
         )
         
-        # Verify thread exists
-        thread = db.query(Thread).filter(Thread.thread_id == thread_id).first()
-        if not thread:
+        # Verify thread exists (cached, so usually no database round trip)
+        try:
+            owner = require_thread(db, thread_id, request.user_id)
+        except ThreadNotFoundException:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Thread {thread_id} not found"
             )
         
+        try:
+            get_registry().get(request.graph)
+        except GraphNotFoundException as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
+        
+        await run_in_threadpool(ensure_thread_hot, thread_id)
+        
         async def generate_response() -> AsyncGenerator[str, None]:
             """Generate streaming response."""
             try:
-                async for chunk in stream_chatbot(
-                    question=request.message,
-                    thread_id=thread_id,
-                    reasoning=request.reasoning
-                ):
-                    # Format as Server-Sent Events
-                    yield f"data: {json.dumps({'content': chunk, 'type': 'content'})}\n\n"
+                # The body streams in its own task, so the deadline is applied here
+                with use_deadline(deadline):
+                    async with get_scheduler().slot(owner):
+                        async for chunk in stream_chatbot(
+                            question=request.message,
+                            thread_id=thread_id,
+                            reasoning=request.reasoning,
+                            graph=request.graph
+                        ):
+                            # Format as Server-Sent Events
+                            yield f"data: {json.dumps({'content': chunk, 'type': 'content'})}\n\n"
                 
                 # Send completion signal
                 yield f"data: {json.dumps({'type': 'done'})}\n\n"
             
+            except (SchedulerRejectedException, DeadlineExceededException) as e:
+                logger.warning("Streaming run not started", error=e.message, thread_id=thread_id)
+                yield f"data: {json.dumps({'type': 'error', 'error': e.message})}\n\n"
             except Exception as e:
                 logger.error("Streaming failed", error=str(e), thread_id=thread_id)
                 error_data = {
@@ -155,6 +221,55 @@ async def chat_stream(
         )
 
 
+@router.get(
+    "/threads/{thread_id}/events",
+    responses={
+        404: {"description": "Thread not found"},
+    },
+    summary="Watch a thread's runs",
+    description="Server-Sent Events of runs on a thread, whichever client started them",
+)
+async def thread_events(
+    thread_id: int,
+    user_id: Optional[str] = Query(None, max_length=255, description="Only allow this user's thread"),
+    db: Session = Depends(get_read_db),
+):
+    """Subscribe to a thread's run events."""
+    try:
+        require_thread(db, thread_id, user_id)
+    except ThreadNotFoundException:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Thread {thread_id} not found"
+        )
+    
+    keepalive = get_settings().broadcast_keepalive_seconds
+    
+    async def generate_events() -> AsyncGenerator[str, None]:
+        """Relay run events until the client disconnects."""
+        async with get_broker().subscribe(thread_id) as subscription:
+            logger.info("Run event subscriber attached", thread_id=thread_id)
+            yield f"data: {json.dumps({'type': 'subscribed', 'thread_id': thread_id})}\n\n"
+            while True:
+                event = await subscription.get(timeout=keepalive)
+                if event is None:
+                    # Comment line so proxies keep an idle stream open
+                    yield ": keepalive\n\n"
+                else:
+                    yield f"data: {json.dumps(event)}\n\n"
+    
+    return StreamingResponse(
+        generate_events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "Access-Control-Allow-Origin": "*",
+            "Access-Control-Allow-Headers": "*",
+        }
+    )
+
+
 @router.websocket("/threads/{thread_id}/chat/ws")
 async def chat_websocket(websocket: WebSocket, thread_id: int):
     """WebSocket endpoint for real-time chat."""
@@ -162,8 +277,17 @@ async def chat_websocket(websocket: WebSocket, thread_id: int):
     logger.info("WebSocket connection established", thread_id=thread_id)
     
     try:
-        # Verify thread exists (you might want to pass db session differently in websockets)
-        # For now, we'll skip the verification or implement it differently
+        # Verify thread exists; there is no request-scoped session for websockets
+        with get_read_session_factory()() as db:
+            try:
+                owner = require_thread(db, thread_id)
+            except ThreadNotFoundException:
+                await websocket.send_text(json.dumps({
+                    "type": "error",
+                    "error": f"Thread {thread_id} not found"
+                }))
+                await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+                return
         
         while True:
             # Receive message from client
@@ -172,6 +296,7 @@ async def chat_websocket(websocket: WebSocket, thread_id: int):
                 message_data = json.loads(data)
                 message = message_data.get("message", "")
                 reasoning = message_data.get("reasoning", False)
+                graph = message_data.get("graph")
                 
                 if not message:
                     await websocket.send_text(json.dumps({
@@ -180,22 +305,40 @@ async def chat_websocket(websocket: WebSocket, thread_id: int):
                     }))
                     continue
                 
+                try:
+                    deadline = request_deadline(message_data.get("timeout"))
+                except (TypeError, ValueError):
+                    await websocket.send_text(json.dumps({
+                        "type": "error",
+                        "error": "timeout must be a positive number of seconds"
+                    }))
+                    continue
+                
+                user_id = message_data.get("user_id")
+                if user_id is not None:
+                    with get_read_session_factory()() as db:
+                        require_thread(db, thread_id, user_id)
+                
                 logger.info("Processing WebSocket message", thread_id=thread_id)
+                await run_in_threadpool(ensure_thread_hot, thread_id)
                 
                 # Stream response back to client
-                async for chunk in stream_chatbot(
-                    question=message,
-                    thread_id=thread_id,
-                    reasoning=reasoning
-                ):
-                    await websocket.send_text(json.dumps({
-                        "type": "content",
-                        "content": chunk
-                    }))
+                with use_deadline(deadline):
+                    async with get_scheduler().slot(owner):
+                        async for chunk in stream_chatbot(
+                            question=message,
+                            thread_id=thread_id,
+                            reasoning=reasoning,
+                            graph=graph
+                        ):
+                            await websocket.send_text(json.dumps({
+                                "type": "content",
+                                "content": chunk
+                            }))
                 
                 # Send completion signal
                 await websocket.send_text(json.dumps({"type": "done"}))
-                
+            
             except json.JSONDecodeError:
                 await websocket.send_text(json.dumps({
                     "type": "error",
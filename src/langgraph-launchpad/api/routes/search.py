@@ -0,0 +1,44 @@
+from typing import Optional
+
+import structlog
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from ...core.database import get_read_db
+from ...core.search import search_messages
+from ..models.responses import ErrorResponse, SearchResponse
+
+router = APIRouter(prefix="/search", tags=["search"])
+logger = structlog.get_logger()
+
+
+@router.get(
+    "",
+    response_model=SearchResponse,
+    responses={
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    },
+    summary="Search messages",
+    description="Find conversation messages containing a phrase, ranked by relevance",
+)
+async def search(
+    q: str = Query(..., min_length=1, max_length=500, description="Phrase to search for"),
+    user_id: Optional[str] = Query(None, max_length=255, description="Only search this user's threads"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db)
+) -> SearchResponse:
+    """Search indexed conversation messages."""
+    try:
+        logger.info("Searching messages", query_length=len(q), user_id=user_id, limit=limit, offset=offset)
+        
+        page = await run_in_threadpool(search_messages, db, q, user_id=user_id, limit=limit, offset=offset)
+        return SearchResponse(query=q, limit=limit, offset=offset, **page)
+    
+    except Exception as e:
+        logger.error("Message search failed", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to search messages"
+        )
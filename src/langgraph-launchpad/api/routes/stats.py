@@ -0,0 +1,84 @@
+from datetime import date
+from typing import Any, Dict, Optional
+
+import structlog
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from ...core.database import get_read_db
+from ...core.usage import daily_usage, get_usage
+from ..models.responses import DailyUsageResponse, ErrorResponse, UsageStatsResponse
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+logger = structlog.get_logger()
+
+
+def _stats(usage: Dict[str, Any]) -> UsageStatsResponse:
+    turns = int(usage["turns"])
+    return UsageStatsResponse(
+        user_id=usage["user_id"],
+        day=usage["day"],
+        threads_created=int(usage["threads_created"]),
+        threads_deleted=int(usage["threads_deleted"]),
+        active_threads=int(usage["threads_created"] - usage["threads_deleted"]),
+        turns=turns,
+        prompt_tokens=int(usage["prompt_tokens"]),
+        completion_tokens=int(usage["completion_tokens"]),
+        mean_latency_ms=usage["latency_ms_total"] / turns if turns else 0.0,
+        max_latency_ms=usage["latency_ms_max"],
+    )
+
+
+@router.get(
+    "",
+    response_model=UsageStatsResponse,
+    responses={
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    },
+    summary="Get usage statistics",
+    description="Threads, turns, tokens and latency for a user or everyone, for one day or all time",
+)
+async def get_stats(
+    user_id: Optional[str] = Query(None, min_length=1, max_length=255, description="Only count this user"),
+    day: Optional[date] = Query(None, description="Only count this UTC day"),
+    db: Session = Depends(get_read_db)
+) -> UsageStatsResponse:
+    """Get usage statistics from the rollup table."""
+    try:
+        return _stats(get_usage(db, user_id=user_id, day=day))
+    
+    except Exception as e:
+        logger.error("Failed to get usage statistics", error=str(e), user_id=user_id)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get usage statistics"
+        )
+
+
+@router.get(
+    "/daily",
+    response_model=DailyUsageResponse,
+    responses={
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    },
+    summary="Get daily usage statistics",
+    description="Usage statistics for each of the last N UTC days",
+)
+async def get_daily_stats(
+    user_id: Optional[str] = Query(None, min_length=1, max_length=255, description="Only count this user"),
+    days: int = Query(30, ge=1, le=366, description="Number of days, ending today"),
+    db: Session = Depends(get_read_db)
+) -> DailyUsageResponse:
+    """Get per-day usage statistics from the rollup table."""
+    try:
+        return DailyUsageResponse(
+            user_id=user_id,
+            days=[_stats(usage) for usage in daily_usage(db, user_id=user_id, days=days)],
+        )
+    
+    except Exception as e:
+        logger.error("Failed to get daily usage statistics", error=str(e), user_id=user_id)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get daily usage statistics"
+        )
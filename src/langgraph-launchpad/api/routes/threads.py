@@ -1,21 +1,37 @@
-from typing import List
+from typing import Any, Dict, List, Optional
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, insert, select
 from sqlalchemy.orm import Session
 
-from ...core.database import get_db
+from ...config.settings import get_settings
+from ...core.archive import ensure_thread_hot
+from ...core.database import get_db, get_read_db
+from ...core.fork import fork_thread
+from ...core.listing import encode_json, latest_messages, message_dicts, thread_page, thread_row
 from ...core.models import Thread
-from ...utils.exceptions import ThreadNotFoundException
-from ..models.requests import CreateThreadRequest, UpdateThreadRequest
+from ...core.retention import purge_threads
+from ...core.thread_cache import forget_threads, remember_threads
+from ...core.usage import record_threads_created, record_threads_deleted
+from ...utils.exceptions import CheckpointNotFoundException, ThreadNotFoundException
+from ..models.requests import (
+    BulkCreateThreadsRequest,
+    BulkDeleteThreadsRequest,
+    CreateThreadRequest,
+    UpdateThreadRequest,
+)
 from ..models.responses import (
     AllThreadsResponse,
+    BulkCreateThreadsResponse,
+    BulkDeleteThreadsResponse,
+    BulkThreadResult,
     CreateThreadResponse,
+    ForkThreadResponse,
     ThreadHistoryResponse,
-    ThreadInfo,
     ErrorResponse,
 )
-from ...graph.builder import get_thread_messages
 
 router = APIRouter(prefix="/threads", tags=["threads"])
 logger = structlog.get_logger()
@@ -40,10 +56,9 @@ async def create_thread(
     try:
         logger.info("Creating new thread", user_id=request.user_id)
         
-        thread = Thread(user_id=request.user_id)
-        db.add(thread)
-        db.commit()
-        db.refresh(thread)
+        thread = (await run_in_threadpool(_insert_threads, db, [request.user_id]))[0]
+        remember_threads([(thread.thread_id, thread.user_id)])
+        record_threads_created([thread.user_id])
         
         logger.info("Thread created successfully", thread_id=thread.thread_id)
         
@@ -55,13 +70,191 @@ async def create_thread(
     
     except Exception as e:
         logger.error("Failed to create thread", error=str(e), user_id=request.user_id)
-        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create thread"
         )
 
 
+def _check_bulk_size(count: int) -> None:
+    """Reject bulk requests above the configured item limit."""
+    limit = get_settings().bulk_max_items
+    if count > limit:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {limit} threads per bulk request, got {count}"
+        )
+
+
+def _insert_threads(db: Session, user_ids: List[str]) -> List[Any]:
+    """Insert threads with one multi-row INSERT ... RETURNING, in request order."""
+    try:
+        rows = db.execute(
+            insert(Thread).returning(
+                Thread.thread_id,
+                Thread.user_id,
+                Thread.created_at,
+                sort_by_parameter_order=True,
+            ),
+            [{"user_id": user_id} for user_id in user_ids],
+        ).all()
+        db.commit()
+        return rows
+    except Exception:
+        db.rollback()
+        raise
+
+
+def _delete_threads(db: Session, thread_ids: List[int]) -> Dict[int, str]:
+    """Delete the threads that exist and return their owners."""
+    try:
+        owners = dict(
+            db.execute(select(Thread.thread_id, Thread.user_id).where(Thread.thread_id.in_(thread_ids))).all()
+        )
+        if owners:
+            db.execute(delete(Thread).where(Thread.thread_id.in_(owners)))
+        db.commit()
+        return owners
+    except Exception:
+        db.rollback()
+        raise
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkCreateThreadsResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        413: {"model": ErrorResponse, "description": "Too many items"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    },
+    summary="Create threads in bulk",
+    description="Create many conversation threads in a single batched insert",
+)
+async def bulk_create_threads(
+    request: BulkCreateThreadsRequest,
+    db: Session = Depends(get_db)
+) -> BulkCreateThreadsResponse:
+    """Create many conversation threads at once."""
+    _check_bulk_size(len(request.threads))
+    logger.info("Creating threads in bulk", count=len(request.threads))
+    
+    try:
+        # One multi-row INSERT ... RETURNING instead of a commit and refresh per thread
+        rows = await run_in_threadpool(_insert_threads, db, [item.user_id for item in request.threads])
+    
+    except Exception as e:
+        logger.error("Failed to create threads in bulk", error=str(e), count=len(request.threads))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create threads"
+        )
+    
+    remember_threads([(row.thread_id, row.user_id) for row in rows])
+    record_threads_created(row.user_id for row in rows)
+    results = [
+        BulkThreadResult(
+            index=index,
+            status="created",
+            thread_id=row.thread_id,
+            user_id=row.user_id,
+            created_at=row.created_at,
+        )
+        for index, row in enumerate(rows)
+    ]
+    logger.info("Threads created in bulk", count=len(results))
+    return BulkCreateThreadsResponse(results=results, created=len(results), failed=0)
+
+
+@router.delete(
+    "/bulk",
+    response_model=BulkDeleteThreadsResponse,
+    responses={
+        413: {"model": ErrorResponse, "description": "Too many items"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    },
+    summary="Delete threads in bulk",
+    description="Delete many conversation threads and their history in batched statements",
+)
+async def bulk_delete_threads(
+    request: BulkDeleteThreadsRequest,
+    db: Session = Depends(get_db)
+) -> BulkDeleteThreadsResponse:
+    """Delete many conversation threads at once."""
+    _check_bulk_size(len(request.thread_ids))
+    logger.info("Deleting threads in bulk", count=len(request.thread_ids))
+    
+    try:
+        owners = await run_in_threadpool(_delete_threads, db, list(dict.fromkeys(request.thread_ids)))
+        existing = set(owners)
+        forget_threads(existing)
+        record_threads_deleted(owners.values())
+    
+    except Exception as e:
+        logger.error("Failed to delete threads in bulk", error=str(e), count=len(request.thread_ids))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to delete threads"
+        )
+    
+    # Same contract as single deletes: leftovers are swept by compaction
+    try:
+        await run_in_threadpool(purge_threads, existing)
+    except Exception as e:
+        logger.error("Failed to purge thread checkpoints", error=str(e), count=len(existing))
+    
+    results = [
+        BulkThreadResult(
+            index=index,
+            status="deleted" if thread_id in existing else "not_found",
+            thread_id=thread_id,
+        )
+        for index, thread_id in enumerate(request.thread_ids)
+    ]
+    logger.info("Threads deleted in bulk", deleted=len(existing))
+    return BulkDeleteThreadsResponse(
+        results=results,
+        deleted=len(existing),
+        not_found=sum(1 for result in results if result.status == "not_found"),
+    )
+
+
+@router.post(
+    "/{thread_id}/fork",
+    response_model=ForkThreadResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        404: {"model": ErrorResponse, "description": "Thread or checkpoint not found"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    },
+    summary="Fork a thread",
+    description="Create a new thread starting from a checkpoint of this one, without re-running the graph",
+)
+async def fork_thread_route(
+    thread_id: int,
+    checkpoint_id: Optional[str] = Query(None, max_length=64, description="Checkpoint to fork from, latest by default"),
+    user_id: Optional[str] = Query(None, max_length=255, description="Owner of the new thread, the parent's by default"),
+) -> ForkThreadResponse:
+    """Fork a conversation thread."""
+    try:
+        logger.info("Forking thread", thread_id=thread_id, checkpoint_id=checkpoint_id)
+        fork = await run_in_threadpool(fork_thread, thread_id, checkpoint_id, user_id)
+        record_threads_created([fork["user_id"]])
+        return ForkThreadResponse(**fork)
+    
+    except (ThreadNotFoundException, CheckpointNotFoundException) as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=e.message
+        )
+    except Exception as e:
+        logger.error("Failed to fork thread", error=str(e), thread_id=thread_id)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fork thread"
+        )
+
+
 @router.get(
     "/{thread_id}",
     response_model=ThreadHistoryResponse,
@@ -74,36 +267,29 @@ async def create_thread(
 )
 async def get_thread_history(
     thread_id: int,
-    db: Session = Depends(get_db)
-) -> ThreadHistoryResponse:
+    db: Session = Depends(get_read_db)
+) -> Response:
     """Get thread conversation history."""
     try:
         logger.info("Retrieving thread history", thread_id=thread_id)
         
-        thread = db.query(Thread).filter(Thread.thread_id == thread_id).first()
-        if not thread:
+        thread = thread_row(db, thread_id)
+        if thread is None:
             raise ThreadNotFoundException(thread_id)
         
-        messages = get_thread_messages(thread_id)
+        await run_in_threadpool(ensure_thread_hot, thread_id, touch=False)
+        messages = await run_in_threadpool(latest_messages, thread_id)
         
-        # Convert messages to response format
-        from ..models.responses import MessageResponse
-        message_responses = []
-        for msg in messages:
-            message_responses.append(
-                MessageResponse(
-                    is_user=getattr(msg, "name", "") == "user",
-                    content=getattr(msg, "content", ""),
-                    metadata=getattr(msg, "additional_kwargs", {}),
-                )
-            )
-        
-        return ThreadHistoryResponse(
-            thread_id=thread.thread_id,
-            user_id=thread.user_id,
-            messages=message_responses,
-            created_at=thread.created_at,
-            updated_at=thread.updated_at,
+        # Plain dicts straight to JSON bytes; the fields are ThreadHistoryResponse's
+        return Response(
+            content=encode_json({
+                "thread_id": thread["thread_id"],
+                "user_id": thread["user_id"],
+                "messages": message_dicts(messages),
+                "created_at": thread["created_at"],
+                "updated_at": thread["updated_at"],
+            }),
+            media_type="application/json",
         )
     
     except ThreadNotFoundException:
@@ -131,35 +317,17 @@ async def get_thread_history(
 async def get_all_threads(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
-) -> AllThreadsResponse:
+    db: Session = Depends(get_read_db)
+) -> Response:
     """Get all threads with pagination."""
     try:
         logger.info("Retrieving all threads", skip=skip, limit=limit)
         
-        threads = db.query(Thread).offset(skip).limit(limit).all()
-        total = db.query(Thread).count()
-        
-        thread_infos = []
-        for thread in threads:
-            # Get message count for each thread
-            try:
-                messages = get_thread_messages(thread.thread_id)
-                message_count = len(messages)
-            except Exception:
-                message_count = 0
-            
-            thread_infos.append(
-                ThreadInfo(
-                    thread_id=thread.thread_id,
-                    user_id=thread.user_id,
-                    created_at=thread.created_at,
-                    updated_at=thread.updated_at,
-                    message_count=message_count,
-                )
-            )
-        
-        return AllThreadsResponse(threads=thread_infos, total=total)
+        threads, total = await run_in_threadpool(thread_page, db, skip=skip, limit=limit)
+        return Response(
+            content=encode_json({"threads": threads, "total": total}),
+            media_type="application/json",
+        )
     
     except Exception as e:
         logger.error("Failed to retrieve threads", error=str(e))
@@ -187,15 +355,22 @@ async def delete_thread(
     try:
         logger.info("Deleting thread", thread_id=thread_id)
         
-        thread = db.query(Thread).filter(Thread.thread_id == thread_id).first()
-        if not thread:
+        owners = await run_in_threadpool(_delete_threads, db, [thread_id])
+        if not owners:
             raise ThreadNotFoundException(thread_id)
         
-        db.delete(thread)
-        db.commit()
+        forget_threads([thread_id])
+        record_threads_deleted(owners.values())
         
-        logger.info("Thread deleted successfully", thread_id=thread_id)
+        # Checkpoints live in the checkpointer's own tables; anything left
+        # behind if this fails is picked up by the compaction job's orphan sweep.
+        try:
+            await run_in_threadpool(purge_threads, [thread_id])
+        except Exception as e:
+            logger.error("Failed to purge thread checkpoints", error=str(e), thread_id=thread_id)
         
+        logger.info("Thread deleted successfully", thread_id=thread_id)
+    
     except ThreadNotFoundException:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -203,7 +378,6 @@ async def delete_thread(
         )
     except Exception as e:
         logger.error("Failed to delete thread", error=str(e), thread_id=thread_id)
-        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete thread"
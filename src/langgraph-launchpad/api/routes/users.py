@@ -1,17 +1,21 @@
+from typing import Literal
+
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from ...core.database import get_db
+from ...core.database import get_read_db
+from ...core.export import buffered, export_user_threads, gzip_chunks, ndjson_lines
+from ...core.listing import encode_json, thread_page
 from ...core.models import Thread
 from ...utils.exceptions import UserNotFoundException
 from ..models.responses import (
     AllUsersResponse,
     UserThreadsResponse,
-    ThreadInfo,
     ErrorResponse,
 )
-from ...graph.builder import get_thread_messages
 
 router = APIRouter(prefix="/users", tags=["users"])
 logger = structlog.get_logger()
@@ -26,7 +30,7 @@ logger = structlog.get_logger()
     summary="List all users",
     description="Retrieve a list of all users who have threads",
 )
-async def get_all_users(db: Session = Depends(get_db)) -> AllUsersResponse:
+async def get_all_users(db: Session = Depends(get_read_db)) -> AllUsersResponse:
     """Get all users."""
     try:
         logger.info("Retrieving all users")
@@ -58,51 +62,19 @@ async def get_user_threads(
     user_id: str,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
-) -> UserThreadsResponse:
+    db: Session = Depends(get_read_db)
+) -> Response:
     """Get all threads for a specific user."""
     try:
         logger.info("Retrieving user threads", user_id=user_id, skip=skip, limit=limit)
         
-        threads = (
-            db.query(Thread)
-            .filter(Thread.user_id == user_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
-        
-        if not threads:
-            # Check if user exists at all
-            user_exists = db.query(Thread).filter(Thread.user_id == user_id).first()
-            if not user_exists:
-                raise UserNotFoundException(user_id)
+        threads, total = await run_in_threadpool(thread_page, db, user_id=user_id, skip=skip, limit=limit)
+        if not total:
+            raise UserNotFoundException(user_id)
         
-        total = db.query(Thread).filter(Thread.user_id == user_id).count()
-        
-        thread_infos = []
-        for thread in threads:
-            # Get message count for each thread
-            try:
-                messages = get_thread_messages(thread.thread_id)
-                message_count = len(messages)
-            except Exception:
-                message_count = 0
-            
-            thread_infos.append(
-                ThreadInfo(
-                    thread_id=thread.thread_id,
-                    user_id=thread.user_id,
-                    created_at=thread.created_at,
-                    updated_at=thread.updated_at,
-                    message_count=message_count,
-                )
-            )
-        
-        return UserThreadsResponse(
-            user_id=user_id,
-            threads=thread_infos,
-            total=total
+        return Response(
+            content=encode_json({"user_id": user_id, "threads": threads, "total": total}),
+            media_type="application/json",
         )
     
     except UserNotFoundException:
@@ -115,4 +87,50 @@ async def get_user_threads(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve user threads"
-        )
\ No newline at end of file
+        )
+
+
+@router.get(
+    "/{user_id}/export",
+    responses={
+        200: {
+            "content": {"application/x-ndjson": {}, "application/gzip": {}},
+            "description": "One JSON record per line: thread, its messages, then the next thread; ends with an end record",
+        },
+        404: {"model": ErrorResponse, "description": "User not found"},
+    },
+    summary="Export a user's threads",
+    description=(
+        "Stream every thread and message of a user as NDJSON, optionally gzipped. "
+        "Resume an interrupted export with after_thread_id set to the last complete thread."
+    ),
+)
+async def export_user(
+    user_id: str,
+    format: Literal["ndjson", "gzip"] = Query("ndjson", description="ndjson, or gzip for gzipped NDJSON"),
+    after_thread_id: int = Query(0, ge=0, description="Only export threads with a higher ID"),
+    db: Session = Depends(get_read_db)
+) -> StreamingResponse:
+    """Stream a compliance export of a user's threads."""
+    if not db.query(Thread.thread_id).filter(Thread.user_id == user_id).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User '{user_id}' not found"
+        )
+    
+    logger.info("Exporting user threads", user_id=user_id, format=format, after_thread_id=after_thread_id)
+    
+    # The synchronous iterator is consumed in the threadpool, one 64 KiB write at a time
+    body = ndjson_lines(export_user_threads(user_id, after_thread_id))
+    filename = f"{user_id}-threads.ndjson"
+    media_type = "application/x-ndjson"
+    if format == "gzip":
+        body = gzip_chunks(body)
+        filename += ".gz"
+        media_type = "application/gzip"
+    
+    return StreamingResponse(
+        buffered(body),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -26,16 +26,450 @@ class Settings(BaseSettings):
         description="Database connection URL"
     )
     
+    # SQLite performance profile, applied to every engine and checkpointer connection
+    sqlite_journal_mode: Literal["WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY"] = Field(
+        default="WAL",
+        description="SQLite journal mode; WAL lets readers proceed while one connection writes"
+    )
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = Field(
+        default="NORMAL",
+        description="SQLite fsync level; NORMAL is durable across crashes in WAL mode"
+    )
+    sqlite_busy_timeout_ms: int = Field(
+        default=5000,
+        ge=0,
+        description="How long SQLite waits for a lock held by another connection"
+    )
+    sqlite_cache_size_kib: int = Field(
+        default=65536,
+        ge=0,
+        description="Page cache per connection in KiB"
+    )
+    sqlite_mmap_size: int = Field(
+        default=268435456,
+        ge=0,
+        description="Bytes of the database file to memory-map (0 disables)"
+    )
+    sqlite_temp_store: Literal["DEFAULT", "FILE", "MEMORY"] = Field(
+        default="MEMORY",
+        description="Where SQLite keeps temporary tables and indices"
+    )
+    sqlite_read_pool_size: int = Field(
+        default=4,
+        ge=0,
+        description="Read-only connections beside the single writer (0 shares the writer)"
+    )
+    sqlite_shards: int = Field(
+        default=0,
+        ge=0,
+        le=256,
+        description="Spread thread checkpoints and stats over this many SQLite files by consistent hashing (0 keeps one file)"
+    )
+    
     # API configuration
     host: str = Field(default="0.0.0.0", description="API host")
     port: int = Field(default=8000, description="API port")
     debug: bool = Field(default=False, description="Debug mode")
+    prewarm: bool = Field(
+        default=False,
+        description="Open database pools and compile the graph before accepting traffic"
+    )
+    
+    bulk_max_items: int = Field(
+        default=1000,
+        ge=1,
+        description="Maximum threads per bulk create or delete request"
+    )
+    
+    # Serving configuration
+    serve_mode: Literal["development", "production"] = Field(
+        default="development",
+        description="Development runs one reloadable process; production runs a worker pool"
+    )
+    workers: int = Field(default=1, ge=1, description="Worker processes in production mode")
+    worker_max_requests: int = Field(
+        default=0,
+        ge=0,
+        description="Recycle a worker after this many requests (0 disables)"
+    )
+    worker_max_requests_jitter: int = Field(
+        default=0,
+        ge=0,
+        description="Random extra requests per worker so workers do not recycle together"
+    )
+    worker_memory_limit_mb: int = Field(
+        default=0,
+        ge=0,
+        description="Recycle a worker once its resident memory exceeds this (0 disables)"
+    )
+    worker_memory_check_interval: int = Field(
+        default=100,
+        ge=1,
+        description="Requests between worker memory checks"
+    )
+    worker_graceful_timeout: int = Field(
+        default=30,
+        ge=0,
+        description="Seconds a stopping worker waits for in-flight requests"
+    )
+    
+    # Graph run scheduling (per worker)
+    scheduler_max_concurrency: int = Field(
+        default=32,
+        ge=1,
+        description="Graph runs executing at once per worker"
+    )
+    scheduler_per_user_concurrency: int = Field(
+        default=4,
+        ge=1,
+        description="Graph runs one user may execute at once per worker"
+    )
+    scheduler_max_queued_per_user: int = Field(
+        default=100,
+        ge=0,
+        description="Runs one user may have waiting for a slot before requests are rejected with 429 (0 runs only what fits in a free slot)"
+    )
+    scheduler_queue_timeout_seconds: float = Field(
+        default=60.0,
+        ge=0,
+        description="Longest a run waits for a slot before being rejected (0 waits forever)"
+    )
+    scheduler_default_weight: float = Field(
+        default=1.0,
+        gt=0,
+        description="Fair-share weight of users without an explicit weight"
+    )
+    scheduler_user_weights: str = Field(
+        default="",
+        description="Comma-separated user=weight overrides, e.g. 'premium-user=4,batch-user=0.5'"
+    )
+    
+    # Checkpoint serialization configuration
+    checkpoint_serializer: str = Field(
+        default="compact",
+        description="'compact', 'default' (LangGraph JsonPlus) or a 'module:Class' path"
+    )
+    checkpoint_compression: Literal["none", "zstd"] = Field(
+        default="zstd",
+        description="Compression for large checkpoint payloads with the compact serializer"
+    )
+    checkpoint_compression_threshold_bytes: int = Field(
+        default=1024,
+        ge=0,
+        description="Payloads smaller than this are stored uncompressed"
+    )
+    checkpoint_compression_level: int = Field(
+        default=3,
+        ge=1,
+        le=22,
+        description="zstd compression level"
+    )
+    
+    # Checkpoint cache configuration
+    checkpoint_cache_enabled: bool = Field(
+        default=True,
+        description="Keep each recent thread's latest checkpoint in memory (write-through)"
+    )
+    checkpoint_cache_max_entries: int = Field(
+        default=1024,
+        ge=1,
+        description="Threads kept in the checkpoint cache per worker"
+    )
+    checkpoint_cache_max_mb: int = Field(
+        default=64,
+        ge=1,
+        description="Approximate memory budget of the checkpoint cache per worker"
+    )
+    checkpoint_cache_verify: bool = Field(
+        default=True,
+        description="Check the cached checkpoint ID against storage before use (needed with several workers)"
+    )
+    
+    # Thread lookup cache configuration
+    thread_cache_max_entries: int = Field(
+        default=10000,
+        ge=1,
+        description="Threads whose existence and owner are cached per worker"
+    )
+    thread_cache_ttl_seconds: float = Field(
+        default=30.0,
+        ge=0,
+        description="How long an existing thread's owner is cached (0 disables the cache)"
+    )
+    thread_cache_negative_ttl_seconds: float = Field(
+        default=5.0,
+        ge=0,
+        description="How long a missing thread is remembered as missing"
+    )
+    
+    # Checkpoint retention configuration
+    checkpoint_compaction_enabled: bool = Field(
+        default=False,
+        description="Run the background checkpoint compaction job"
+    )
+    checkpoint_retention_keep_last: int = Field(
+        default=0,
+        ge=0,
+        description="Checkpoints kept per thread and namespace by compaction (0 keeps all)"
+    )
+    checkpoint_retention_interval_seconds: int = Field(
+        default=3600,
+        ge=1,
+        description="Seconds between compaction runs"
+    )
+    checkpoint_retention_batch_size: int = Field(
+        default=200,
+        ge=1,
+        description="Threads trimmed per transaction so writers are not blocked for long"
+    )
+    checkpoint_retention_purge_orphans: bool = Field(
+        default=True,
+        description="Delete checkpoint data whose thread no longer exists"
+    )
+    checkpoint_vacuum_every: int = Field(
+        default=24,
+        ge=0,
+        description="Compaction runs between VACUUM/ANALYZE passes (0 disables)"
+    )
+    
+    # Cold storage configuration
+    archive_enabled: bool = Field(
+        default=False,
+        description="Run the background job that archives inactive threads"
+    )
+    archive_dir: str = Field(
+        default="./archive",
+        description="Directory holding compressed per-thread archives"
+    )
+    archive_inactive_after_seconds: int = Field(
+        default=86400,
+        ge=0,
+        description="Archive threads whose updated_at is older than this"
+    )
+    archive_interval_seconds: int = Field(
+        default=3600,
+        ge=1,
+        description="Seconds between archival runs"
+    )
+    archive_batch_size: int = Field(
+        default=100,
+        ge=1,
+        description="Threads archived per run"
+    )
+    
+    # Message search configuration
+    search_index_enabled: bool = Field(
+        default=True,
+        description="Copy new conversation messages into the full-text search index after each turn"
+    )
+    search_language: str = Field(
+        default="english",
+        pattern=r"^[a-z_]+$",
+        description="PostgreSQL text search configuration used for stemming (SQLite uses FTS5's unicode61 tokenizer)"
+    )
+    search_backfill_batch_size: int = Field(
+        default=500,
+        ge=1,
+        description="Threads indexed per backfill request"
+    )
+    
+    message_count_backfill_interval_seconds: float = Field(
+        default=5.0,
+        gt=0,
+        description="Seconds between runs counting the messages of threads with no stored count"
+    )
+    message_count_backfill_batch_size: int = Field(
+        default=200,
+        ge=1,
+        description="Threads counted per message count backfill run"
+    )
+    
+    # Usage analytics configuration
+    usage_rollups_enabled: bool = Field(
+        default=True,
+        description="Maintain per-user and per-day usage rollups for /stats"
+    )
+    usage_flush_interval_seconds: float = Field(
+        default=5.0,
+        gt=0,
+        description="Seconds between flushes of buffered usage counters to the rollup table"
+    )
+    
+    # Health and readiness configuration
+    loop_lag_interval_seconds: float = Field(
+        default=0.25,
+        gt=0,
+        description="Seconds between event loop lag samples"
+    )
+    loop_lag_window_seconds: float = Field(
+        default=5.0,
+        gt=0,
+        description="Window over which readiness takes the worst event loop lag"
+    )
+    readiness_check_timeout_seconds: float = Field(
+        default=2.0,
+        gt=0,
+        description="Timeout of each dependency connectivity check in /health/ready"
+    )
+    readiness_max_loop_lag_seconds: float = Field(
+        default=0.5,
+        gt=0,
+        description="Event loop lag above which the worker reports not ready"
+    )
+    readiness_max_pool_saturation: float = Field(
+        default=1.0,
+        gt=0,
+        le=1,
+        description="Share of pool connections in use above which the worker reports not ready (1 disables)"
+    )
+    readiness_max_queued_runs: int = Field(
+        default=0,
+        ge=0,
+        description="Queued graph runs above which the worker reports not ready (0 disables)"
+    )
+    
+    # Blocking call detector (debug instrumentation)
+    blocking_detector_enabled: bool = Field(
+        default=False,
+        description="Log and count callbacks that hold the event loop longer than blocking_threshold_ms"
+    )
+    blocking_threshold_ms: float = Field(
+        default=100.0,
+        gt=0,
+        description="Event loop stall, in milliseconds, reported by the blocking call detector"
+    )
+    blocking_stack_depth: int = Field(
+        default=30,
+        ge=1,
+        description="Innermost stack frames captured for each blocked event loop report"
+    )
+    
+    # Memory profiling (debug instrumentation)
+    memory_profiling_enabled: bool = Field(
+        default=False,
+        description="Trace allocations with tracemalloc and sample per-route peak allocation"
+    )
+    memory_trace_frames: int = Field(
+        default=10,
+        ge=1,
+        description="Stack frames recorded per traced allocation"
+    )
+    memory_sample_rate: float = Field(
+        default=0.1,
+        ge=0,
+        le=1,
+        description="Share of requests whose peak allocation is sampled"
+    )
+    memory_sample_max_seconds: float = Field(
+        default=10.0,
+        gt=0,
+        description="Longest a sampled request is measured; streams and long downloads are cut off here"
+    )
+    memory_top_allocations: int = Field(
+        default=25,
+        ge=1,
+        description="Allocation sites listed in memory snapshots and diffs"
+    )
+    
+    # Run broadcast configuration
+    broadcast_backend: str = Field(
+        default="local",
+        description="'local' (this worker only) or a 'module:Class' BroadcastBackend for cross-worker fan-out"
+    )
+    broadcast_subscriber_buffer: int = Field(
+        default=256,
+        ge=1,
+        description="Run events buffered per subscriber before the oldest are dropped"
+    )
+    broadcast_keepalive_seconds: float = Field(
+        default=15.0,
+        gt=0,
+        description="Idle seconds between keep-alive comments on event streams"
+    )
+    broadcast_max_run_age_seconds: float = Field(
+        default=600.0,
+        ge=0,
+        description="Seconds a run in progress is replayed to new subscribers without its last event (0 disables the limit)"
+    )
+    
+    # Export configuration
+    export_batch_size: int = Field(
+        default=200,
+        ge=1,
+        description="Threads fetched per query while streaming a user export"
+    )
     
     # Logging configuration
     log_level: str = Field(default="INFO", description="Logging level")
     
     # LangGraph configuration
     openai_api_key: str = Field(default="", description="OpenAI API key")
+    offline_response_latency_ms: int = Field(
+        default=0,
+        ge=0,
+        description="Simulated model latency of the responses used without an API key (load testing)"
+    )
+    offline_response_slow_ratio: float = Field(
+        default=0.0,
+        ge=0,
+        le=1,
+        description="Fraction of simulated model calls that take 10x the simulated latency"
+    )
+    offline_response_error_ratio: float = Field(
+        default=0.0,
+        ge=0,
+        le=1,
+        description="Fraction of simulated model calls that fail with a retryable error"
+    )
+    request_timeout_seconds: float = Field(
+        default=120.0,
+        ge=0,
+        description="Deadline for a chat request's graph run; clients may shorten it with X-Request-Timeout (0 disables)"
+    )
+    node_timeout_seconds: float = Field(
+        default=60.0,
+        ge=0,
+        description="Longest a single graph node may run before its degraded fallback is used (0 disables)"
+    )
+    llm_timeout_seconds: float = Field(
+        default=30.0,
+        ge=0,
+        description="Timeout of a single model call, further capped by the request deadline (0 disables)"
+    )
+    llm_max_attempts: int = Field(
+        default=3,
+        ge=1,
+        description="Attempts per model call on retryable errors (1 disables retries)"
+    )
+    llm_retry_backoff_seconds: float = Field(
+        default=0.2,
+        ge=0,
+        description="Base of the jittered exponential backoff between model call retries"
+    )
+    llm_retry_backoff_max_seconds: float = Field(
+        default=5.0,
+        ge=0,
+        description="Longest backoff between model call retries"
+    )
+    llm_hedge_percentile: float = Field(
+        default=0.0,
+        ge=0,
+        lt=100,
+        description="Send a duplicate model call once one runs longer than this latency percentile, e.g. 95 (0 disables hedging; the losing call still runs to completion and is billed)"
+    )
+    llm_hedge_min_samples: int = Field(
+        default=20,
+        ge=1,
+        description="Calls a node must have made before its latency percentile is used for hedging"
+    )
+    graph_factories: str = Field(
+        default="default=langgraph_launchpad.graph.builder:create_graph",
+        description="Comma-separated name=module:function graph factories to register"
+    )
+    default_graph: str = Field(
+        default="default",
+        description="Graph used by requests that do not name one"
+    )
     
     @property
     def is_sqlite(self) -> bool:
@@ -46,6 +480,25 @@ class Settings(BaseSettings):
     def is_postgresql(self) -> bool:
         """Check if using PostgreSQL database."""
         return self.database_type == "postgresql"
+    
+    @property
+    def sqlite_read_split(self) -> bool:
+        """Check if SQLite reads go to a separate pool of read-only connections."""
+        return (
+            self.is_sqlite
+            and self.sqlite_journal_mode == "WAL"
+            and self.sqlite_read_pool_size > 0
+        )
+    
+    @property
+    def sqlite_sharded(self) -> bool:
+        """Check if per-thread SQLite data is spread over shard files."""
+        return self.is_sqlite and self.sqlite_shards > 1
+    
+    @property
+    def is_production(self) -> bool:
+        """Check if running in production serve mode."""
+        return self.serve_mode == "production"
 
 
 @lru_cache()
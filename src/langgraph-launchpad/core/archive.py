@@ -0,0 +1,464 @@
+import base64
+import gzip
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import structlog
+from sqlalchemy import bindparam, delete, exists, func, select, text, update
+
+from ..config.settings import get_settings
+from ..utils.metrics import metrics
+from .checkpoint import checkpoint_tables, get_checkpointer, invalidate_cached_threads
+from .database import get_engine, get_read_engine
+from .jobs import PeriodicJob
+from .models import ArchivedThread, Thread
+from .serializer import zstandard
+from .sharding import checkpoint_engine, scatter, shard_connection, shard_groups
+from .thread_cache import get_thread_cache
+
+logger = structlog.get_logger()
+
+ARCHIVE_FORMAT = 1
+
+# PostgreSQL checkpointer columns stored as JSONB rather than bytes
+JSONB_COLUMNS = {"checkpoints": {"checkpoint", "metadata"}}
+
+
+class ThreadBecameActive(Exception):
+    """Raised to abort archiving a thread that was used while being archived."""
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, memoryview):
+        value = value.tobytes()
+    if isinstance(value, (bytes, bytearray)):
+        return {"$b64": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, (dict, list)):
+        return {"$json": value}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "$b64" in value:
+            return base64.b64decode(value["$b64"])
+        if "$json" in value:
+            return json.dumps(value["$json"])
+    return value
+
+
+def _compress(payload: bytes) -> Tuple[bytes, str]:
+    if zstandard is not None:
+        level = get_settings().checkpoint_compression_level
+        return zstandard.ZstdCompressor(level=level).compress(payload), ".json.zst"
+    return gzip.compress(payload), ".json.gz"
+
+
+def _decompress(data: bytes, path: str) -> bytes:
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read this archive")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def archive_path(thread_id: int, suffix: str) -> str:
+    """Get the archive file path for a thread, fanned out over subdirectories."""
+    archive_dir = os.path.abspath(get_settings().archive_dir)
+    return os.path.join(archive_dir, f"{thread_id % 1000:03d}", f"{thread_id}{suffix}")
+
+
+def _write_atomically(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(data)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+
+
+def _inactive_cutoff() -> datetime:
+    seconds = get_settings().archive_inactive_after_seconds
+    return datetime.now(timezone.utc) - timedelta(seconds=seconds)
+
+
+def archive_thread(thread_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Move a thread's checkpoint history into a compressed file.
+    
+    The rows of every checkpointer table are written to the archive before
+    anything is deleted. The delete transaction first re-checks that the
+    thread is still inactive, so a chat turn that touched the thread in the
+    meantime aborts the archive instead of losing its checkpoints.
+    
+    Args:
+        thread_id: The thread to archive
+    
+    Returns:
+        A summary of the archive, or None if the thread had no history or
+        became active while it was being archived
+    """
+    settings = get_settings()
+    engine = get_engine()
+    get_checkpointer()
+    
+    tables: Dict[str, Dict[str, Any]] = {}
+    with checkpoint_engine(thread_id).connect() as conn:
+        for table in checkpoint_tables():
+            result = conn.execute(
+                text(f"SELECT * FROM {table} WHERE thread_id = :thread_id"),
+                {"thread_id": str(thread_id)},
+            )
+            tables[table] = {
+                "columns": list(result.keys()),
+                "rows": [[_encode_value(value) for value in row] for row in result],
+            }
+    
+    row_count = sum(len(table["rows"]) for table in tables.values())
+    if not tables["checkpoints"]["rows"]:
+        return None
+    
+    payload = json.dumps({
+        "format": ARCHIVE_FORMAT,
+        "thread_id": thread_id,
+        "backend": settings.database_type,
+        "tables": tables,
+    }).encode("utf-8")
+    data, suffix = _compress(payload)
+    path = archive_path(thread_id, suffix)
+    _write_atomically(path, data)
+    
+    shard_committed = False
+    try:
+        with engine.begin() as conn:
+            # Taking the row (and on SQLite the write lock) first means any
+            # chat turn that touched the thread since selection is seen here.
+            still_inactive = conn.execute(
+                update(Thread)
+                .where(Thread.thread_id == thread_id, Thread.updated_at < _inactive_cutoff())
+                .values(updated_at=Thread.updated_at)
+            ).rowcount
+            if not still_inactive:
+                raise ThreadBecameActive()
+            
+            conn.execute(ArchivedThread.__table__.insert().values(
+                thread_id=thread_id,
+                path=path,
+                size_bytes=len(data),
+                checkpoint_rows=row_count,
+            ))
+            with shard_connection(conn, checkpoint_engine(thread_id)) as shard_conn:
+                for table in checkpoint_tables():
+                    shard_conn.execute(
+                        text(f"DELETE FROM {table} WHERE thread_id = :thread_id"),
+                        {"thread_id": str(thread_id)},
+                    )
+            shard_committed = shard_conn is not conn
+    except ThreadBecameActive:
+        os.remove(path)
+        logger.info("Thread became active during archival", thread_id=thread_id)
+        return None
+    except Exception:
+        if shard_committed:
+            # The shard's delete committed before the marker failed to: the file is the only copy left
+            logger.error("Archived thread has no marker, keeping its archive file", thread_id=thread_id, path=path)
+        else:
+            os.remove(path)
+        raise
+    
+    invalidate_cached_threads([thread_id])
+    metrics.inc("threads_archived_total")
+    metrics.inc("archive_bytes_written_total", len(data))
+    logger.info("Thread archived", thread_id=thread_id, rows=row_count, bytes=len(data))
+    return {
+        "thread_id": thread_id,
+        "path": path,
+        "rows": row_count,
+        "raw_bytes": len(payload),
+        "size_bytes": len(data),
+    }
+
+
+def _restore_rows(conn: Any, archive: Dict[str, Any]) -> int:
+    is_postgresql = get_settings().is_postgresql
+    restored = 0
+    for table, content in archive["tables"].items():
+        if not content["rows"]:
+            continue
+        
+        columns = content["columns"]
+        jsonb = JSONB_COLUMNS.get(table, set()) if is_postgresql else set()
+        placeholders = [
+            f"CAST(:c{index} AS jsonb)" if column in jsonb else f":c{index}"
+            for index, column in enumerate(columns)
+        ]
+        statement = text(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(placeholders)})"
+        )
+        conn.execute(statement, [
+            {f"c{index}": _decode_value(value) for index, value in enumerate(row)}
+            for row in content["rows"]
+        ])
+        restored += len(content["rows"])
+    return restored
+
+
+def _archived_rows(archive: Dict[str, Any], table: str) -> List[Dict[str, Any]]:
+    content = archive["tables"].get(table) or {"columns": [], "rows": []}
+    return [
+        dict(zip(content["columns"], (_decode_value(value) for value in row)))
+        for row in content["rows"]
+    ]
+
+
+def _read_archive(path: str) -> Dict[str, Any]:
+    with open(path, "rb") as handle:
+        return json.loads(_decompress(handle.read(), path))
+
+
+def read_archived_messages(thread_id: int) -> Optional[List[Any]]:
+    """
+    Load the messages of an archived thread's latest checkpoint from its archive file.
+    
+    The thread stays archived: nothing is written to the database.
+    
+    Returns:
+        The messages, or None if the thread is not archived (any more)
+    
+    Raises:
+        OSError, ValueError: If the archive file cannot be read or decoded
+    """
+    def archived_path() -> Optional[str]:
+        with get_read_engine().connect() as conn:
+            return conn.execute(
+                select(ArchivedThread.path).where(ArchivedThread.thread_id == thread_id)
+            ).scalar()
+    
+    path = archived_path()
+    if path is None:
+        return None
+    try:
+        archive = _read_archive(path)
+    except FileNotFoundError:
+        # Rehydrated in the meantime, which removes the file after the marker
+        if archived_path() is None:
+            return None
+        raise
+    
+    checkpoints = [row for row in _archived_rows(archive, "checkpoints") if row["checkpoint_ns"] == ""]
+    if not checkpoints:
+        return []
+    latest = max(checkpoints, key=lambda row: row["checkpoint_id"])
+    serde = get_checkpointer().serde
+    
+    if "checkpoint_blobs" not in archive["tables"]:
+        checkpoint = serde.loads_typed((latest["type"], latest["checkpoint"]))
+        return checkpoint["channel_values"].get("messages", [])
+    
+    # PostgreSQL keeps the checkpoint as JSON and each channel value as a versioned blob
+    checkpoint = json.loads(latest["checkpoint"])
+    inline = checkpoint.get("channel_values") or {}
+    if "messages" in inline:
+        return inline["messages"]
+    version = checkpoint.get("channel_versions", {}).get("messages")
+    for blob in _archived_rows(archive, "checkpoint_blobs"):
+        if blob["checkpoint_ns"] == "" and blob["channel"] == "messages" and blob["version"] == str(version):
+            return [] if blob["type"] == "empty" else serde.loads_typed((blob["type"], blob["blob"]))
+    return []
+
+
+def rehydrate_thread(thread_id: int) -> bool:
+    """
+    Restore an archived thread's checkpoint history into the hot database.
+    
+    The archive marker is deleted and the rows inserted in one transaction,
+    so concurrent requests for the same thread restore it exactly once.
+    
+    Returns:
+        True if this call restored the thread
+    """
+    start = time.perf_counter()
+    engine = get_engine()
+    get_checkpointer()
+    
+    with engine.begin() as conn:
+        path = conn.execute(
+            delete(ArchivedThread)
+            .where(ArchivedThread.thread_id == thread_id)
+            .returning(ArchivedThread.path)
+        ).scalar()
+        if path is None:
+            return False
+        
+        archive = _read_archive(path)
+        with shard_connection(conn, checkpoint_engine(thread_id)) as shard_conn:
+            # A restore whose marker delete failed to commit after its shard's did left these behind
+            if shard_conn is not conn:
+                for table in checkpoint_tables():
+                    shard_conn.execute(
+                        text(f"DELETE FROM {table} WHERE thread_id = :thread_id"),
+                        {"thread_id": str(thread_id)},
+                    )
+            rows = _restore_rows(shard_conn, archive)
+    
+    try:
+        os.remove(path)
+    except OSError as e:
+        logger.warning("Failed to remove archive file", path=path, error=str(e))
+    
+    elapsed = time.perf_counter() - start
+    metrics.inc("threads_rehydrated_total")
+    metrics.observe("thread_rehydration_seconds", elapsed)
+    logger.info("Thread rehydrated", thread_id=thread_id, rows=rows, seconds=elapsed)
+    return True
+
+
+def ensure_thread_hot(thread_id: int, touch: bool = True) -> bool:
+    """
+    Rehydrate a thread if it was archived, marking it active when ``touch``.
+    
+    Runs and other writes touch ``updated_at`` first, which closes the race
+    with a concurrent archival run. Reads pass ``touch=False``: they only
+    look for the archive marker on the read engine and write nothing unless
+    the thread has to be restored, so reading history neither takes the
+    write lock nor counts as activity. A read racing an archival run can
+    miss the thread's history once; it is restored on the next request.
+    A thread this worker touched less than half the archival age ago
+    cannot have been archived since, so both checks are skipped for it.
+    
+    Blocks on the database; call it from a worker thread.
+    
+    Returns:
+        True if the thread had to be rehydrated
+    """
+    settings = get_settings()
+    cache = get_thread_cache()
+    touch_interval = min(settings.thread_cache_ttl_seconds, settings.archive_inactive_after_seconds / 2)
+    if cache.touched_recently(thread_id, touch_interval):
+        return False
+    
+    archived_query = select(ArchivedThread.thread_id).where(ArchivedThread.thread_id == thread_id)
+    if not touch:
+        with get_read_engine().connect() as conn:
+            archived = conn.execute(archived_query).first()
+        return archived is not None and rehydrate_thread(thread_id)
+    
+    with get_engine().begin() as conn:
+        conn.execute(
+            update(Thread).where(Thread.thread_id == thread_id).values(updated_at=func.now())
+        )
+        archived = conn.execute(archived_query).first()
+    
+    cache.mark_touched(thread_id)
+    if archived is None:
+        return False
+    return rehydrate_thread(thread_id)
+
+
+def discard_archives(thread_ids: Iterable[int]) -> int:
+    """Delete the archive markers and files of deleted threads."""
+    ids = list(thread_ids)
+    if not ids:
+        return 0
+    
+    with get_engine().begin() as conn:
+        paths = conn.execute(
+            delete(ArchivedThread)
+            .where(ArchivedThread.thread_id.in_(ids))
+            .returning(ArchivedThread.path)
+        ).scalars().all()
+    
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError as e:
+            logger.warning("Failed to remove archive file", path=path, error=str(e))
+    return len(paths)
+
+
+def _with_checkpoints(thread_ids: List[int]) -> Set[int]:
+    def lookup(group: Tuple[Any, List[int]]) -> List[str]:
+        engine, ids = group
+        statement = text("SELECT DISTINCT thread_id FROM checkpoints WHERE thread_id IN :thread_ids").bindparams(
+            bindparam("thread_ids", expanding=True)
+        )
+        with engine.connect() as conn:
+            return conn.execute(statement, {"thread_ids": [str(thread_id) for thread_id in ids]}).scalars().all()
+    
+    return {int(thread_id) for found in scatter(lookup, shard_groups(thread_ids)) for thread_id in found}
+
+
+def archive_inactive_threads(limit: Optional[int] = None) -> Dict[str, Any]:
+    """Archive up to ``limit`` threads that have been inactive past the configured age."""
+    settings = get_settings()
+    limit = limit or settings.archive_batch_size
+    get_checkpointer()
+    
+    # Checkpoints may live in shard files, so threads without any are
+    # filtered out per page rather than with a subquery
+    candidates: List[int] = []
+    offset = 0
+    while len(candidates) < limit:
+        with get_engine().connect() as conn:
+            page = conn.execute(
+                select(Thread.thread_id)
+                .where(Thread.updated_at < _inactive_cutoff())
+                .where(~exists().where(ArchivedThread.thread_id == Thread.thread_id))
+                .order_by(Thread.updated_at, Thread.thread_id)
+                .offset(offset)
+                .limit(limit)
+            ).scalars().all()
+        with_history = _with_checkpoints(page)
+        candidates.extend(thread_id for thread_id in page if thread_id in with_history)
+        if len(page) < limit:
+            break
+        offset += len(page)
+    candidates = candidates[:limit]
+    
+    archived, skipped, written = 0, 0, 0
+    for thread_id in candidates:
+        try:
+            result = archive_thread(thread_id)
+        except Exception as e:
+            logger.error("Failed to archive thread", thread_id=thread_id, error=str(e))
+            result = None
+        if result is None:
+            skipped += 1
+            continue
+        archived += 1
+        written += result["size_bytes"]
+    
+    return {"candidates": len(candidates), "archived": archived, "skipped": skipped, "bytes_written": written}
+
+
+def archive_stats() -> Dict[str, Any]:
+    """Get hot/cold thread counts, archive size and rehydration latency."""
+    with get_engine().connect() as conn:
+        total = conn.execute(select(func.count()).select_from(Thread)).scalar() or 0
+        cold, cold_bytes = conn.execute(
+            select(func.count(), func.coalesce(func.sum(ArchivedThread.size_bytes), 0))
+        ).one()
+    
+    latency = next(
+        iter(metrics.snapshot()["histograms"].get("thread_rehydration_seconds", [])),
+        {"value": {}},
+    )["value"]
+    return {
+        "hot_threads": total - cold,
+        "cold_threads": cold,
+        "cold_bytes": cold_bytes,
+        "rehydrations": int(metrics.total("threads_rehydrated_total")),
+        "rehydration_latency_ms": {key: value * 1000 for key, value in latency.items() if key != "count"},
+    }
+
+
+def create_archive_job() -> Optional[PeriodicJob]:
+    """Create the background archival job if it is enabled."""
+    settings = get_settings()
+    if not settings.archive_enabled:
+        return None
+    return PeriodicJob("thread-archival", settings.archive_interval_seconds, archive_inactive_threads)
\ No newline at end of file
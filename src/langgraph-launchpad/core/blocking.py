@@ -0,0 +1,223 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+import weakref
+from collections import deque
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, Optional
+
+import structlog
+
+from ..config.settings import get_settings
+from ..utils.metrics import metrics
+
+logger = structlog.get_logger()
+
+# Route label for stalls outside any request (startup, background jobs)
+NO_ROUTE = "-"
+
+
+class RouteRef:
+    """The ASGI scope of the request a task works for; routing fills in the route later."""
+    
+    __slots__ = ("scope",)
+    
+    def __init__(self, scope: Dict[str, Any]):
+        self.scope = scope
+    
+    @property
+    def name(self) -> str:
+        route = self.scope.get("route")
+        path = getattr(route, "path", None) or self.scope.get("path", "?")
+        method = self.scope.get("method") or self.scope.get("type", "").upper()
+        return f"{method} {path}"
+
+
+_request_route: ContextVar[Optional[RouteRef]] = ContextVar("blocking_request_route", default=None)
+
+
+class BlockingDetector:
+    """
+    Flag anything that holds the event loop longer than a threshold.
+    
+    A heartbeat task on the loop records when it last ran; a watchdog
+    thread notices when the heartbeat is overdue by more than
+    ``threshold_seconds`` and captures the loop thread's stack right then,
+    while the blocking call is still on it. Each stall is logged once with
+    that stack and the request route of the running task, and counted per
+    route in ``event_loop_blocked_total``; its full duration is observed
+    in ``event_loop_blocked_seconds`` when the loop gets going again.
+    
+    Routes are attributed through a task factory: tasks inherit the route
+    of the request that created them (see ``BlockingRouteMiddleware``).
+    
+    Sampling is cheap but not free (one wakeup per ``threshold / 2`` on the
+    loop and twice that in the watchdog), hence opt-in.
+    """
+    
+    def __init__(self, threshold_seconds: float, stack_depth: int, max_reports: int = 50):
+        self.threshold_seconds = threshold_seconds
+        self.stack_depth = stack_depth
+        self.tick_seconds = threshold_seconds / 2
+        self.reports: Deque[Dict[str, Any]] = deque(maxlen=max_reports)
+        self._reports_lock = threading.Lock()
+        self._task_routes: "weakref.WeakKeyDictionary[asyncio.Task, RouteRef]" = weakref.WeakKeyDictionary()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._previous_factory: Optional[Callable[..., Any]] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._last_tick = 0.0
+    
+    def start(self) -> None:
+        """Install on the running loop; call from the loop thread."""
+        if self._loop is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._previous_factory = self._loop.get_task_factory()
+        self._loop.set_task_factory(self._task_factory)
+        
+        self._last_tick = time.monotonic()
+        self._heartbeat_task = self._loop.create_task(self._heartbeat())
+        self._stopped.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="blocking-detector", daemon=True)
+        self._watchdog.start()
+        logger.info("Blocking call detector started", threshold_ms=self.threshold_seconds * 1000)
+    
+    async def stop(self) -> None:
+        if self._loop is None:
+            return
+        self._stopped.set()
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+            except asyncio.CancelledError:
+                pass
+        self._loop.set_task_factory(self._previous_factory)
+        self._loop = None
+    
+    def track(self, ref: RouteRef) -> None:
+        """Attribute the current task to a request."""
+        task = asyncio.current_task()
+        if task is not None:
+            self._task_routes[task] = ref
+    
+    def _task_factory(self, loop: asyncio.AbstractEventLoop, coro: Any, **kwargs: Any) -> asyncio.Future:
+        if self._previous_factory is not None:
+            task = self._previous_factory(loop, coro, **kwargs)
+        else:
+            task = asyncio.Task(coro, loop=loop, **kwargs)
+        context = kwargs.get("context")
+        ref = context.get(_request_route) if context is not None else _request_route.get()
+        if ref is not None:
+            self._task_routes[task] = ref
+        return task
+    
+    async def _heartbeat(self) -> None:
+        while True:
+            self._last_tick = time.monotonic()
+            await asyncio.sleep(self.tick_seconds)
+    
+    def _watch(self) -> None:
+        stalled_tick: Optional[float] = None
+        route = NO_ROUTE
+        while not self._stopped.wait(self.tick_seconds / 2):
+            last_tick = self._last_tick
+            if stalled_tick is not None:
+                if last_tick != stalled_tick:
+                    # Heartbeat ran again: the stall is over
+                    blocked = last_tick - stalled_tick - self.tick_seconds
+                    metrics.observe("event_loop_blocked_seconds", max(blocked, 0.0), route=route)
+                    stalled_tick = None
+                continue
+            
+            overdue = time.monotonic() - last_tick - self.tick_seconds
+            if overdue > self.threshold_seconds:
+                reported = self._report(overdue)
+                if reported is not None:
+                    stalled_tick, route = last_tick, reported
+    
+    def _report(self, overdue: float) -> Optional[str]:
+        # Called on the watchdog thread: name the loop explicitly
+        task = asyncio.current_task(self._loop)
+        frame = sys._current_frames().get(self._loop_thread)
+        if task is None and frame is not None and frame.f_code.co_filename.endswith("selectors.py"):
+            # Waiting in select: the loop was starved (GIL, CPU), not held by a callback
+            return None
+        
+        ref = self._task_routes.get(task) if task is not None else None
+        route = ref.name if ref is not None else NO_ROUTE
+        stack = [
+            f"{entry.filename}:{entry.lineno} in {entry.name}"
+            for entry in (traceback.extract_stack(frame, limit=self.stack_depth) if frame else [])
+        ]
+        report = {
+            "route": route,
+            "task": task.get_name() if task is not None else None,
+            "blocked_ms": overdue * 1000,
+            "stack": stack,
+            "at": time.time(),
+        }
+        with self._reports_lock:
+            self.reports.append(report)
+        metrics.inc("event_loop_blocked_total", route=route)
+        logger.warning(
+            "Event loop blocked",
+            route=route,
+            task=report["task"],
+            blocked_ms=round(report["blocked_ms"], 1),
+            threshold_ms=self.threshold_seconds * 1000,
+            stack=stack,
+        )
+        return route
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Stall counts per route and the most recent reports, newest first."""
+        counts: Dict[str, float] = {
+            series["labels"]["route"]: series["value"]
+            for series in metrics.snapshot()["counters"].get("event_loop_blocked_total", [])
+        }
+        with self._reports_lock:
+            reports = list(reversed(self.reports))
+        return {
+            "enabled": self._loop is not None,
+            "threshold_ms": self.threshold_seconds * 1000,
+            "blocked_by_route": counts,
+            "reports": reports,
+        }
+
+
+@lru_cache()
+def get_blocking_detector() -> BlockingDetector:
+    """Get this worker's blocking call detector."""
+    settings = get_settings()
+    return BlockingDetector(
+        threshold_seconds=settings.blocking_threshold_ms / 1000,
+        stack_depth=settings.blocking_stack_depth,
+    )
+
+
+class BlockingRouteMiddleware:
+    """ASGI middleware tagging each request's tasks with its route for the blocking detector."""
+    
+    def __init__(self, app: Any):
+        self.app = app
+    
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+        
+        ref = RouteRef(scope)
+        token = _request_route.set(ref)
+        get_blocking_detector().track(ref)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_route.reset(token)
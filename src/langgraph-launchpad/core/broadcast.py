@@ -0,0 +1,247 @@
+import asyncio
+import importlib
+import time
+import uuid
+from collections import deque
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Set
+
+import structlog
+
+from ..config.settings import get_settings
+from ..utils.metrics import metrics
+
+logger = structlog.get_logger()
+
+RunEvent = Dict[str, Any]
+# (thread_id, event, origin worker) handed to the broker by a backend
+Deliver = Callable[[int, RunEvent, str], None]
+
+# Events that end a run
+TERMINAL_EVENTS = ("done", "error")
+
+
+class BroadcastBackend:
+    """
+    Fans run events out to the other workers.
+    
+    The base class is the in-process backend: it sends nothing anywhere, so
+    subscribers only see runs executing in their own worker. Cross-worker
+    backends (Redis pub/sub, PostgreSQL LISTEN/NOTIFY, ...) subclass it and
+    are selected with the ``broadcast_backend`` setting.
+    """
+    
+    async def start(self, deliver: Deliver) -> None:
+        """
+        Start receiving events from other workers.
+        
+        ``deliver`` may be called from any thread; the broker hands the
+        events over to its event loop.
+        """
+    
+    def publish(self, thread_id: int, event: RunEvent, origin: str) -> None:
+        """Send an event to the other workers. Must queue and return, never block."""
+    
+    async def stop(self) -> None:
+        """Stop receiving and release connections."""
+
+
+class Subscription:
+    """
+    One subscriber's bounded event buffer.
+    
+    The producer never waits for a subscriber: when the buffer is full the
+    oldest event is dropped and the subscriber gets a ``lagged`` event with
+    the number of events it missed before the rest.
+    """
+    
+    def __init__(self, thread_id: int, max_buffered: int):
+        self.thread_id = thread_id
+        self.max_buffered = max_buffered
+        self._events: Deque[RunEvent] = deque()
+        self._ready = asyncio.Event()
+        self._dropped = 0
+    
+    def __len__(self) -> int:
+        return len(self._events)
+    
+    def offer(self, event: RunEvent) -> None:
+        if len(self._events) >= self.max_buffered:
+            self._events.popleft()
+            self._dropped += 1
+            metrics.inc("broadcast_events_dropped_total")
+        self._events.append(event)
+        self._ready.set()
+    
+    async def get(self, timeout: Optional[float] = None) -> Optional[RunEvent]:
+        """Wait for the next event; None if ``timeout`` passes first."""
+        if not self._events:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        
+        if self._dropped:
+            dropped, self._dropped = self._dropped, 0
+            return {"type": "lagged", "thread_id": self.thread_id, "dropped": dropped}
+        return self._events.popleft()
+
+
+class _LiveRun:
+    __slots__ = ("started", "events")
+    
+    def __init__(self, max_events: int):
+        self.started = time.monotonic()
+        self.events: Deque[RunEvent] = deque(maxlen=max_events)
+
+
+class RunBroker:
+    """
+    Publish/subscribe of graph run events, keyed by thread.
+    
+    Runs publish ``run_started``, ``content`` and ``done``/``error`` events;
+    every subscriber of the thread gets them, whichever client started the
+    run. The events of a run still in progress are kept (up to the buffer
+    size) so a subscriber attaching mid-run sees it from the start.
+    
+    Events from the backend take the same path as local ones. All broker
+    state lives on the event loop thread, so no locks are needed.
+    """
+    
+    def __init__(self, backend: BroadcastBackend, max_buffered: int, max_run_age_seconds: float):
+        self.backend = backend
+        self.max_buffered = max_buffered
+        self.max_run_age_seconds = max_run_age_seconds
+        self.worker_id = uuid.uuid4().hex
+        self._subscribers: Dict[int, Set[Subscription]] = {}
+        self._runs: Dict[int, _LiveRun] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        await self.backend.start(self._receive)
+    
+    async def stop(self) -> None:
+        await self.backend.stop()
+    
+    def publish(self, thread_id: int, event: RunEvent) -> None:
+        """Send an event to this thread's subscribers here and in other workers."""
+        event = {"thread_id": thread_id, **event}
+        self._dispatch(thread_id, event)
+        try:
+            self.backend.publish(thread_id, event, self.worker_id)
+        except Exception as e:
+            metrics.inc("broadcast_backend_errors_total")
+            logger.error("Failed to publish run event", thread_id=thread_id, error=str(e))
+    
+    def _receive(self, thread_id: int, event: RunEvent, origin: str) -> None:
+        if origin == self.worker_id or self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._dispatch, thread_id, event)
+    
+    def _dispatch(self, thread_id: int, event: RunEvent) -> None:
+        kind = event.get("type")
+        if kind == "run_started":
+            self._runs[thread_id] = _LiveRun(self.max_buffered)
+        run = self._runs.get(thread_id)
+        if run is not None:
+            if kind in TERMINAL_EVENTS:
+                del self._runs[thread_id]
+            else:
+                run.events.append(event)
+        
+        subscribers = self._subscribers.get(thread_id)
+        if subscribers:
+            for subscription in subscribers:
+                subscription.offer(event)
+            metrics.inc("broadcast_events_delivered_total", len(subscribers))
+    
+    def live_run(self, thread_id: int) -> List[RunEvent]:
+        """Events so far of the run in progress on a thread, if any."""
+        run = self._runs.get(thread_id)
+        if run is None:
+            return []
+        if 0 < self.max_run_age_seconds < time.monotonic() - run.started:
+            # The worker running it went away without sending its last event
+            del self._runs[thread_id]
+            return []
+        return list(run.events)
+    
+    def buffered_events(self) -> int:
+        """Events held in subscriber buffers and live run replays."""
+        queued = sum(len(subscription) for subscribers in self._subscribers.values() for subscription in subscribers)
+        return queued + sum(len(run.events) for run in self._runs.values())
+    
+    def subscriber_count(self, thread_id: Optional[int] = None) -> int:
+        if thread_id is not None:
+            return len(self._subscribers.get(thread_id, ()))
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+    
+    @asynccontextmanager
+    async def subscribe(self, thread_id: int) -> AsyncIterator[Subscription]:
+        """Subscribe to a thread's run events, starting with any run in progress."""
+        subscription = Subscription(thread_id, self.max_buffered)
+        for event in self.live_run(thread_id):
+            subscription.offer(event)
+        
+        self._subscribers.setdefault(thread_id, set()).add(subscription)
+        metrics.set_gauge("broadcast_subscribers", self.subscriber_count())
+        try:
+            yield subscription
+        finally:
+            subscribers = self._subscribers.get(thread_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[thread_id]
+            metrics.set_gauge("broadcast_subscribers", self.subscriber_count())
+
+
+def create_backend(name: str) -> BroadcastBackend:
+    """Create the backend named by the ``broadcast_backend`` setting: ``local`` or a ``module:Class`` path."""
+    if name == "local":
+        return BroadcastBackend()
+    module_name, _, class_name = name.partition(":")
+    if not class_name:
+        raise ValueError(f"Broadcast backend must be 'local' or 'module:Class', got {name!r}")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+@lru_cache()
+def get_broker() -> RunBroker:
+    """Get this worker's run broker."""
+    settings = get_settings()
+    return RunBroker(
+        backend=create_backend(settings.broadcast_backend),
+        max_buffered=settings.broadcast_subscriber_buffer,
+        max_run_age_seconds=settings.broadcast_max_run_age_seconds,
+    )
+
+
+@asynccontextmanager
+async def broadcast_run(thread_id: int, question: str) -> AsyncIterator[Callable[[str], None]]:
+    """
+    Publish a run's lifecycle to the thread's subscribers.
+    
+    Publishes ``run_started`` on entry and ``done`` or ``error`` on exit,
+    and yields a function publishing each piece of reply content.
+    """
+    broker = get_broker()
+    run_id = uuid.uuid4().hex
+    broker.publish(thread_id, {"type": "run_started", "run_id": run_id, "question": question})
+    
+    def send(content: str) -> None:
+        broker.publish(thread_id, {"type": "content", "run_id": run_id, "content": content})
+    
+    try:
+        yield send
+    except Exception:
+        broker.publish(thread_id, {"type": "error", "run_id": run_id, "error": "Run failed"})
+        raise
+    except BaseException:
+        # Cancelled, e.g. the client that posted the message disconnected
+        broker.publish(thread_id, {"type": "error", "run_id": run_id, "error": "Run cancelled"})
+        raise
+    broker.publish(thread_id, {"type": "done", "run_id": run_id})
@@ -1,20 +1,122 @@
-from langgraph.checkpoint.postgres import PostgresSaver
-from langgraph.checkpoint.sqlite import SqliteSaver
+from functools import lru_cache
+from typing import Any, Iterable, Tuple
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
 
 from ..config.settings import get_settings
+from .checkpoint_cache import CachingCheckpointSaver
+from .serializer import create_serializer
+from .sharding import shard_for, shard_path
+from .sqlite import connect_sqlite
+from .threaded_saver import ThreadedCheckpointSaver
+
+
+def postgres_conninfo(database_url: str) -> str:
+    """Convert a SQLAlchemy PostgreSQL URL into a libpq connection string."""
+    scheme, sep, rest = database_url.partition("://")
+    return f"{scheme.split('+')[0]}{sep}{rest}"
+
+
+def sqlite_path(database_url: str) -> str:
+    """Extract the database file path from a SQLite URL."""
+    return database_url.replace("sqlite:///", "")
+
+
+def checkpoint_tables() -> Tuple[str, ...]:
+    """Get the tables the configured checkpointer stores thread data in."""
+    if get_settings().is_postgresql:
+        return ("checkpoints", "checkpoint_blobs", "checkpoint_writes")
+    return ("checkpoints", "writes")
+
+
+def checkpoint_writes_table() -> str:
+    """Get the table holding pending writes for the configured checkpointer."""
+    return "checkpoint_writes" if get_settings().is_postgresql else "writes"
+
 
+def create_sqlite_saver(path: str, serde: Any) -> BaseCheckpointSaver:
+    """Create a checkpointer on one SQLite file, with read-only connections if reads are split."""
+    settings = get_settings()
+    if settings.sqlite_read_split:
+        from .sqlite_saver import ReadSplitSqliteSaver
+        
+        return ReadSplitSqliteSaver(
+            connect_sqlite(path),
+            path,
+            settings.sqlite_read_pool_size,
+            serde=serde,
+        )
+    
+    from langgraph.checkpoint.sqlite import SqliteSaver
+    
+    return SqliteSaver(connect_sqlite(path), serde=serde)
 
-def create_checkpointer():
+
+def create_checkpointer() -> BaseCheckpointSaver:
     """Create appropriate checkpointer based on database type."""
     settings = get_settings()
+    serde = create_serializer()
     
+    # ``from_conn_string`` is a context manager, so build the savers directly
+    # to keep the connection open for the lifetime of the application.
+    # Backend packages are imported here so only the configured one is loaded.
     if settings.is_postgresql:
-        return PostgresSaver.from_conn_string(settings.database_url)
+        from langgraph.checkpoint.postgres import PostgresSaver
+        from psycopg import Connection
+        from psycopg.rows import dict_row
+        
+        conn = Connection.connect(
+            postgres_conninfo(settings.database_url),
+            autocommit=True,
+            prepare_threshold=0,
+            row_factory=dict_row,
+        )
+        saver = PostgresSaver(conn, serde=serde)
+    elif settings.sqlite_sharded:
+        from .sqlite_saver import ShardedSqliteSaver
+        
+        savers = [
+            create_sqlite_saver(shard_path(settings.database_url, index), serde)
+            for index in range(settings.sqlite_shards)
+        ]
+        saver = ShardedSqliteSaver(savers, shard_for, serde=serde)
     else:
-        # Extract database path from SQLite URL
-        db_path = settings.database_url.replace("sqlite:///", "")
-        return SqliteSaver.from_conn_string(db_path)
+        saver = create_sqlite_saver(sqlite_path(settings.database_url), serde)
+    
+    saver.setup()
+    
+    if settings.checkpoint_cache_enabled:
+        return CachingCheckpointSaver(
+            saver,
+            max_entries=settings.checkpoint_cache_max_entries,
+            max_bytes=settings.checkpoint_cache_max_mb * 2**20,
+            verify=settings.checkpoint_cache_verify,
+        )
+    # The savers are synchronous; streamed runs need the async methods too
+    return ThreadedCheckpointSaver(saver)
+
+
+@lru_cache()
+def get_checkpointer() -> BaseCheckpointSaver:
+    """Get the application checkpointer, creating it on first use."""
+    return create_checkpointer()
+
+
+def invalidate_cached_threads(thread_ids: Iterable[Any]) -> None:
+    """Drop cached thread state after deleting or rewriting checkpoints directly."""
+    if not get_checkpointer.cache_info().currsize:
+        return
+    saver = get_checkpointer()
+    if isinstance(saver, CachingCheckpointSaver):
+        saver.invalidate(thread_ids)
 
 
-# Create global checkpointer instance
-checkpointer = create_checkpointer()
\ No newline at end of file
+def close_checkpointer() -> None:
+    """Close the checkpointer connection and drop the cached instance."""
+    if get_checkpointer.cache_info().currsize:
+        saver = get_checkpointer()
+        if hasattr(saver, "close"):
+            saver.close()
+        else:
+            saver.conn.close()
+    get_checkpointer.cache_clear()
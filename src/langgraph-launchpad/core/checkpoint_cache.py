@@ -0,0 +1,259 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import structlog
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    copy_checkpoint,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from sqlalchemy import text
+
+from ..utils.metrics import metrics
+from .sharding import checkpoint_read_engine
+from .threaded_saver import ThreadedCheckpointSaver
+
+logger = structlog.get_logger()
+
+LATEST_CHECKPOINT_SQL = text(
+    "SELECT checkpoint_id FROM checkpoints "
+    "WHERE thread_id = :thread_id AND checkpoint_ns = :checkpoint_ns "
+    "ORDER BY checkpoint_id DESC LIMIT 1"
+)
+
+CacheKey = Tuple[str, str]
+
+
+def approximate_size(obj: Any, depth: int = 0) -> int:
+    """Roughly estimate the memory held by a checkpoint value, in bytes."""
+    if depth > 8:
+        return 64
+    if isinstance(obj, (str, bytes, bytearray)):
+        return 49 + len(obj)
+    if isinstance(obj, dict):
+        return 64 + sum(
+            approximate_size(key, depth + 1) + approximate_size(value, depth + 1)
+            for key, value in obj.items()
+        )
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return 56 + 8 * len(obj) + sum(approximate_size(item, depth + 1) for item in obj)
+    if hasattr(obj, "__dict__"):
+        return 64 + approximate_size(vars(obj), depth + 1)
+    return 32
+
+
+def _cache_key(config: RunnableConfig) -> CacheKey:
+    configurable = config["configurable"]
+    return str(configurable["thread_id"]), configurable.get("checkpoint_ns", "")
+
+
+class ThreadStateCache:
+    """Thread-safe LRU of latest checkpoint tuples, bounded by entries and bytes."""
+    
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries: "OrderedDict[CacheKey, Tuple[CheckpointTuple, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: CacheKey) -> Optional[CheckpointTuple]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+    
+    def set(self, key: CacheKey, value: CheckpointTuple) -> None:
+        size = approximate_size(value.checkpoint) + approximate_size(value.metadata)
+        evicted = 0
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[1]
+            if size > self.max_bytes:
+                self._publish()
+                return
+            
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+                evicted += 1
+            self._publish()
+        
+        if evicted:
+            metrics.inc("checkpoint_cache_evictions_total", evicted)
+    
+    def discard(self, key: CacheKey) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.bytes -= entry[1]
+                self._publish()
+    
+    def discard_threads(self, thread_ids: Iterable[str]) -> int:
+        """Drop every namespace of the given threads."""
+        ids = set(thread_ids)
+        removed = 0
+        with self._lock:
+            for key in [key for key in self._entries if key[0] in ids]:
+                self.bytes -= self._entries.pop(key)[1]
+                removed += 1
+            self._publish()
+        return removed
+    
+    def sizes(self) -> List[Tuple[str, int]]:
+        """Approximate bytes held per cached thread, all namespaces together."""
+        totals: Dict[str, int] = {}
+        with self._lock:
+            for (thread_id, _), (_, size) in self._entries.items():
+                totals[thread_id] = totals.get(thread_id, 0) + size
+        return list(totals.items())
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+            self._publish()
+    
+    def _publish(self) -> None:
+        metrics.set_gauge("checkpoint_cache_entries", len(self._entries))
+        metrics.set_gauge("checkpoint_cache_bytes", self.bytes)
+
+
+class CachingCheckpointSaver(ThreadedCheckpointSaver):
+    """
+    Write-through cache of each thread's latest checkpoint in front of a saver.
+    
+    ``put`` stores the new checkpoint in the backing saver and then in the
+    cache, so the next turn on this worker skips loading and deserializing
+    it. With ``verify`` the cached checkpoint ID is compared against the
+    newest ID in storage (one indexed lookup) before it is served, which
+    catches turns run by other workers. Lookups of specific checkpoints
+    and history listings always go to the backing saver.
+    
+    The async methods come from ``ThreadedCheckpointSaver`` and run these
+    sync ones in a worker thread.
+    """
+    
+    def __init__(
+        self,
+        inner: BaseCheckpointSaver,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 2**20,
+        verify: bool = True,
+        cache: Optional[ThreadStateCache] = None,
+    ):
+        super().__init__(inner)
+        self.verify = verify
+        self.cache = cache or ThreadStateCache(max_entries, max_bytes)
+    
+    def with_allowlist(self, *args: Any, **kwargs: Any) -> "CachingCheckpointSaver":
+        inner = self.inner.with_allowlist(*args, **kwargs)
+        if inner is self.inner:
+            return self
+        return CachingCheckpointSaver(inner, verify=self.verify, cache=self.cache)
+    
+    def invalidate(self, thread_ids: Iterable[Any]) -> int:
+        """Forget the cached state of threads deleted or rewritten outside the saver."""
+        return self.cache.discard_threads(str(thread_id) for thread_id in thread_ids)
+    
+    def _latest_checkpoint_id(self, key: CacheKey) -> Optional[str]:
+        with checkpoint_read_engine(key[0]).connect() as conn:
+            return conn.execute(
+                LATEST_CHECKPOINT_SQL, {"thread_id": key[0], "checkpoint_ns": key[1]}
+            ).scalar()
+    
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        if get_checkpoint_id(config):
+            return self.inner.get_tuple(config)
+        
+        key = _cache_key(config)
+        cached = self.cache.get(key)
+        if cached is not None:
+            cached_id = cached.config["configurable"]["checkpoint_id"]
+            if not self.verify or self._latest_checkpoint_id(key) == cached_id:
+                metrics.inc("checkpoint_cache_requests_total", result="hit")
+                return cached._replace(checkpoint=copy_checkpoint(cached.checkpoint))
+            metrics.inc("checkpoint_cache_requests_total", result="stale")
+        else:
+            metrics.inc("checkpoint_cache_requests_total", result="miss")
+        
+        loaded = self.inner.get_tuple(config)
+        if loaded is not None and not loaded.pending_writes:
+            self.cache.set(key, loaded._replace(checkpoint=copy_checkpoint(loaded.checkpoint)))
+        else:
+            self.cache.discard(key)
+        return loaded
+    
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        next_config = self.inner.put(config, checkpoint, metadata, new_versions)
+        parent_config = None
+        if get_checkpoint_id(config):
+            # Keep only the address; the run's config holds callbacks and stream writers
+            thread_id, checkpoint_ns = _cache_key(config)
+            parent_config = {
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": get_checkpoint_id(config),
+                }
+            }
+        self.cache.set(
+            _cache_key(next_config),
+            CheckpointTuple(
+                config=next_config,
+                checkpoint=copy_checkpoint(checkpoint),
+                metadata=get_checkpoint_metadata(config, metadata),
+                parent_config=parent_config,
+                pending_writes=[],
+            ),
+        )
+        return next_config
+    
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        # Pending writes change what get_tuple returns, so reload next time
+        self.cache.discard(_cache_key(config))
+        self.inner.put_writes(config, writes, task_id, task_path)
+    
+    def delete_thread(self, thread_id: str) -> None:
+        self.invalidate([thread_id])
+        self.inner.delete_thread(thread_id)
+    
+    def delete_for_runs(self, run_ids: Sequence[str]) -> None:
+        # Any thread's latest checkpoint may belong to one of the runs
+        self.cache.clear()
+        self.inner.delete_for_runs(run_ids)
+    
+    def copy_thread(self, source_thread_id: str, target_thread_id: str) -> None:
+        self.invalidate([target_thread_id])
+        self.inner.copy_thread(source_thread_id, target_thread_id)
+    
+    def prune(self, thread_ids: Sequence[str], *, strategy: str = "keep_latest") -> None:
+        self.invalidate(thread_ids)
+        self.inner.prune(thread_ids, strategy=strategy)
@@ -1,37 +1,91 @@
 import os
+from functools import lru_cache
 from typing import Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session, sessionmaker
 
 from ..config.settings import get_settings
+from .sqlite import configure_sqlite_connection, configure_sqlite_read_connection, read_only_url
 
-settings = get_settings()
-
-# Create engine with appropriate configuration
-connect_args = {}
-if settings.is_sqlite:
-    connect_args = {"check_same_thread": False}
-    # Ensure the database directory exists
-    db_path = settings.database_url.replace("sqlite:///", "")
-    if db_path.startswith("./"):
-        db_dir = os.path.dirname(os.path.abspath(db_path))
-        os.makedirs(db_dir, exist_ok=True)
-
-engine = create_engine(
-    settings.database_url,
-    connect_args=connect_args,
-    echo=settings.debug,
-)
-
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+@lru_cache()
+def get_engine() -> Engine:
+    """Get the read-write database engine, creating it on first use."""
+    settings = get_settings()
+    
+    # Create engine with appropriate configuration
+    connect_args = {}
+    engine_args = {}
+    if settings.is_sqlite:
+        connect_args = {"check_same_thread": False}
+        # SQLite allows one writer at a time; a single pooled connection
+        # queues writers in-process instead of contending on the file lock.
+        if settings.sqlite_read_split:
+            engine_args = {"pool_size": 1, "max_overflow": 0}
+        # Ensure the database directory exists
+        db_path = settings.database_url.replace("sqlite:///", "")
+        if db_path.startswith("./"):
+            db_dir = os.path.dirname(os.path.abspath(db_path))
+            os.makedirs(db_dir, exist_ok=True)
+    
+    engine = create_engine(
+        settings.database_url,
+        connect_args=connect_args,
+        echo=settings.debug,
+        **engine_args,
+    )
+    if settings.is_sqlite:
+        event.listen(engine, "connect", configure_sqlite_connection)
+    return engine
+
+
+@lru_cache()
+def get_read_engine() -> Engine:
+    """Get the engine for read-only queries, creating it on first use."""
+    settings = get_settings()
+    if not settings.sqlite_read_split:
+        return get_engine()
+    
+    engine = create_engine(
+        read_only_url(settings.database_url),
+        connect_args={"check_same_thread": False},
+        echo=settings.debug,
+        pool_size=settings.sqlite_read_pool_size,
+        max_overflow=0,
+    )
+    event.listen(engine, "connect", configure_sqlite_read_connection)
+    return engine
+
+
+@lru_cache()
+def get_session_factory() -> sessionmaker:
+    """Get the session factory bound to the read-write engine."""
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+
+
+@lru_cache()
+def get_read_session_factory() -> sessionmaker:
+    """Get the session factory bound to the read-only engine."""
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_read_engine())
+
+
 def get_db() -> Generator[Session, None, None]:
     """Get database session."""
-    db = SessionLocal()
+    db = get_session_factory()()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db() -> Generator[Session, None, None]:
+    """Get a database session for routes that only read."""
+    db = get_read_session_factory()()
     try:
         yield db
     finally:
@@ -40,4 +94,28 @@ def get_db() -> Generator[Session, None, None]:
 
 def create_tables() -> None:
     """Create all database tables."""
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    Base.metadata.create_all(bind=get_engine())
+
+
+def prewarm_database() -> None:
+    """Open the engines' pool connections ahead of the first request."""
+    engines = [get_engine()]
+    if get_read_engine() is not engines[0]:
+        engines.append(get_read_engine())
+    
+    for engine in engines:
+        size = engine.pool.size() if hasattr(engine.pool, "size") else 1
+        connections = [engine.connect() for _ in range(max(size, 1))]
+        for connection in connections:
+            connection.close()
+
+
+def dispose_engine() -> None:
+    """Close pooled connections and drop the cached engines."""
+    for factory in (get_read_engine, get_engine):
+        if factory.cache_info().currsize:
+            factory().dispose()
+    get_read_session_factory.cache_clear()
+    get_session_factory.cache_clear()
+    get_read_engine.cache_clear()
+    get_engine.cache_clear()
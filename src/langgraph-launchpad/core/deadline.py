@@ -0,0 +1,115 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import structlog
+
+from ..config.settings import get_settings
+from ..utils.exceptions import DeadlineExceededException
+from ..utils.metrics import metrics
+
+logger = structlog.get_logger()
+
+# Header clients use to shorten (never extend) the request timeout, in seconds
+DEADLINE_HEADER = "X-Request-Timeout"
+
+# Absolute deadline of the current request on the ``time.monotonic`` clock
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+def request_deadline(timeout_header: Optional[str] = None) -> Optional[float]:
+    """
+    Work out when the current request must finish.
+    
+    Args:
+        timeout_header: Value of the ``X-Request-Timeout`` header, if sent.
+            It can only shorten ``request_timeout_seconds``.
+    
+    Returns:
+        A ``time.monotonic`` deadline, or None when requests are unbounded
+    
+    Raises:
+        ValueError: If the header is not a positive number of seconds
+    """
+    timeout = get_settings().request_timeout_seconds or None
+    if timeout_header is not None:
+        requested = float(timeout_header)
+        if not requested > 0:
+            raise ValueError(f"{DEADLINE_HEADER} must be a positive number of seconds")
+        timeout = min(timeout, requested) if timeout else requested
+    return time.monotonic() + timeout if timeout else None
+
+
+@contextmanager
+def use_deadline(deadline: Optional[float]) -> Iterator[None]:
+    """Apply a deadline to everything run in this context, keeping any earlier one."""
+    current = _deadline.get()
+    if deadline is not None and current is not None:
+        deadline = min(deadline, current)
+    token = _deadline.set(deadline if deadline is not None else current)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline, or None without one."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def time_budget(cap: float = 0, stage: str = "request") -> Optional[float]:
+    """
+    Seconds a step may take: the remaining deadline, capped at ``cap`` if set.
+    
+    Returns:
+        The budget, or None when neither a deadline nor a cap applies
+    
+    Raises:
+        DeadlineExceededException: If the deadline has already passed
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceededException(stage, 0.0)
+    if cap and cap > 0:
+        return cap if left is None else min(cap, left)
+    return left
+
+
+def with_time_budget(
+    node: str,
+    fallback: Callable[[Dict[str, Any], DeadlineExceededException], dict],
+) -> Callable[[Callable[..., dict]], Callable[..., dict]]:
+    """
+    Decorate a graph node so it returns ``fallback(state, error)`` when it runs out of time.
+    
+    The node runs in place under a deadline of the smaller of
+    ``node_timeout_seconds`` and what is left of the request deadline.
+    Model calls take their timeout from that deadline (see
+    ``graph.llm``), so a slow model call times out within the node's
+    budget; when the node then raises ``DeadlineExceededException``,
+    ``node_timeouts_total{node}`` is incremented and the degraded
+    fallback update is returned instead. Work outside model calls is not
+    interrupted.
+    """
+    def decorate(func: Callable[..., dict]) -> Callable[..., dict]:
+        @wraps(func)
+        def wrapper(state: Dict[str, Any], *args: Any, **kwargs: Any) -> dict:
+            try:
+                budget = time_budget(get_settings().node_timeout_seconds, stage=node)
+                if budget is None:
+                    return func(state, *args, **kwargs)
+                with use_deadline(time.monotonic() + budget):
+                    return func(state, *args, **kwargs)
+            
+            except DeadlineExceededException as e:
+                metrics.inc("node_timeouts_total", node=node)
+                logger.warning("Graph node ran out of time", node=node, budget_seconds=e.details["budget_seconds"])
+                return fallback(state, e)
+        
+        return wrapper
+    
+    return decorate
@@ -0,0 +1,141 @@
+import json
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import structlog
+from sqlalchemy import select
+
+from ..config.settings import get_settings
+from ..utils.metrics import metrics
+from .archive import read_archived_messages
+from .checkpoint import get_checkpointer
+from .checkpoint_cache import CachingCheckpointSaver
+from .database import get_read_engine
+from .models import ArchivedThread, Thread
+from .search import message_text
+
+logger = structlog.get_logger()
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _thread_batches(user_id: str, after_thread_id: int, batch_size: int) -> Iterator[List[Any]]:
+    # Keyset pages in short transactions: memory stays at one batch and no
+    # connection or read snapshot is held while a slow client downloads
+    last = after_thread_id
+    while True:
+        with get_read_engine().connect() as conn:
+            rows = conn.execute(
+                select(
+                    Thread.thread_id,
+                    Thread.created_at,
+                    Thread.updated_at,
+                    ArchivedThread.thread_id.is_not(None).label("archived"),
+                )
+                .outerjoin(ArchivedThread, ArchivedThread.thread_id == Thread.thread_id)
+                .where(Thread.user_id == user_id, Thread.thread_id > last)
+                .order_by(Thread.thread_id)
+                .limit(batch_size)
+            ).all()
+        if not rows:
+            return
+        yield rows
+        if len(rows) < batch_size:
+            return
+        last = rows[-1].thread_id
+
+
+def export_user_threads(user_id: str, after_thread_id: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Yield export records for every thread of a user, in thread ID order.
+    
+    Each thread produces a ``thread`` record carrying its ``message_count``
+    followed by that many ``message`` records, and the export ends with an
+    ``end`` record. A client that was cut off can resume by passing the
+    last thread whose messages all arrived as ``after_thread_id``.
+    
+    Messages come from the thread's latest checkpoint. Archived threads are
+    not rehydrated for an export; their checkpoint is read from the archive
+    file instead and the thread record says so in ``source``. An archive
+    that cannot be read aborts the export rather than leaving the thread
+    out or empty.
+    """
+    saver = get_checkpointer()
+    # Read past the thread state cache so an export does not evict hot threads
+    storage = saver.inner if isinstance(saver, CachingCheckpointSaver) else saver
+    
+    threads = 0
+    messages = 0
+    last_thread_id = None
+    for batch in _thread_batches(user_id, after_thread_id, get_settings().export_batch_size):
+        for row in batch:
+            history = None
+            if row.archived:
+                source = "archive"
+                try:
+                    history = read_archived_messages(row.thread_id)
+                except Exception as e:
+                    logger.error("Failed to read thread archive for export", thread_id=row.thread_id, error=str(e))
+                    raise
+            if history is None:
+                # Not archived, or rehydrated since the batch was read
+                source = "checkpoint"
+                state = storage.get_tuple({"configurable": {"thread_id": str(row.thread_id)}})
+                history = state.checkpoint["channel_values"].get("messages", []) if state else []
+            records = [
+                {"position": position, "role": message.type, "content": message_text(message)}
+                for position, message in enumerate(history)
+            ]
+            
+            yield {
+                "type": "thread",
+                "thread_id": row.thread_id,
+                "user_id": user_id,
+                "created_at": _timestamp(row.created_at),
+                "updated_at": _timestamp(row.updated_at),
+                "message_count": len(records),
+                "source": source,
+            }
+            for record in records:
+                yield {"type": "message", "thread_id": row.thread_id, **record}
+            
+            threads += 1
+            messages += len(records)
+            last_thread_id = row.thread_id
+    
+    metrics.inc("export_threads_total", threads)
+    logger.info("Export finished", user_id=user_id, threads=threads, messages=messages)
+    yield {"type": "end", "threads": threads, "messages": messages, "last_thread_id": last_thread_id}
+
+
+def ndjson_lines(records: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    """Encode records as newline-delimited JSON."""
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Gzip a byte stream incrementally."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def buffered(chunks: Iterable[bytes], min_bytes: int = 64 * 1024) -> Iterator[bytes]:
+    """Join small chunks into writes of at least ``min_bytes`` (except the last)."""
+    pending: List[bytes] = []
+    size = 0
+    for chunk in chunks:
+        pending.append(chunk)
+        size += len(chunk)
+        if size >= min_bytes:
+            yield b"".join(pending)
+            pending, size = [], 0
+    if pending:
+        yield b"".join(pending)
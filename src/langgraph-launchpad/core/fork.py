@@ -0,0 +1,186 @@
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+import structlog
+from sqlalchemy import bindparam, insert, select, text
+from sqlalchemy.engine import Connection
+
+from ..config.settings import get_settings
+from ..utils.exceptions import CheckpointNotFoundException, ThreadNotFoundException
+from ..utils.metrics import metrics
+from .archive import ensure_thread_hot
+from .checkpoint import checkpoint_writes_table, get_checkpointer
+from .database import get_engine
+from .models import Thread, ThreadFork
+from .sharding import checkpoint_engine, shard_connection
+from .thread_cache import remember_threads
+
+logger = structlog.get_logger()
+
+# Forks start from a checkpoint of the root graph; subgraph namespaces are per run
+ROOT_NS = ""
+
+FORK_CHECKPOINT_SQL = text(
+    "SELECT checkpoint_id FROM checkpoints "
+    "WHERE thread_id = :thread_id AND checkpoint_ns = :checkpoint_ns AND checkpoint_id = :checkpoint_id"
+)
+
+LATEST_CHECKPOINT_SQL = text(
+    "SELECT checkpoint_id FROM checkpoints "
+    "WHERE thread_id = :thread_id AND checkpoint_ns = :checkpoint_ns "
+    "ORDER BY checkpoint_id DESC LIMIT 1"
+)
+
+# Only the blobs holding the channel versions the forked checkpoint points at
+COPY_BLOBS_SQL = """
+INSERT INTO checkpoint_blobs ({columns})
+SELECT {values} FROM checkpoint_blobs b
+JOIN checkpoints c
+    ON c.thread_id = b.thread_id
+    AND c.checkpoint_ns = b.checkpoint_ns
+    AND (c.checkpoint -> 'channel_versions' ->> b.channel) = b.version
+WHERE c.thread_id = :parent AND c.checkpoint_ns = :checkpoint_ns AND c.checkpoint_id = :checkpoint_id
+"""
+
+
+def _columns(conn: Connection, table: str) -> List[str]:
+    return list(conn.execute(text(f"SELECT * FROM {table} WHERE 1 = 0")).keys())
+
+
+def _select_list(columns: List[str], prefix: str = "") -> str:
+    overrides = {"thread_id": ":child", "parent_checkpoint_id": "NULL"}
+    return ", ".join(overrides.get(column, f"{prefix}{column}") for column in columns)
+
+
+def _copy_checkpoint(source: Connection, target: Connection, parent: str, child: str, checkpoint_id: str) -> int:
+    """Copy one checkpoint with its pending writes (and blobs) to another thread, row for row."""
+    params = {"parent": parent, "child": child, "checkpoint_ns": ROOT_NS, "checkpoint_id": checkpoint_id}
+    where = "WHERE thread_id = :parent AND checkpoint_ns = :checkpoint_ns AND checkpoint_id = :checkpoint_id"
+    
+    copied = 0
+    for table in ("checkpoints", checkpoint_writes_table()):
+        columns = _columns(source, table)
+        if source is target:
+            copied += target.execute(
+                text(f"INSERT INTO {table} ({', '.join(columns)}) SELECT {_select_list(columns)} FROM {table} {where}"),
+                params,
+            ).rowcount
+            continue
+        
+        # Parent and fork are in different shard files: move the stored values across as they are
+        rows = [
+            dict(row._mapping, thread_id=child, **({"parent_checkpoint_id": None} if table == "checkpoints" else {}))
+            for row in source.execute(text(f"SELECT * FROM {table} {where}"), params)
+        ]
+        if rows:
+            placeholders = ", ".join(f":{column}" for column in columns)
+            target.execute(text(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"), rows)
+        copied += len(rows)
+    
+    if get_settings().is_postgresql:
+        # No shards on PostgreSQL, so the copy stays inside one connection
+        columns = _columns(target, "checkpoint_blobs")
+        copied += target.execute(
+            text(COPY_BLOBS_SQL.format(columns=", ".join(columns), values=_select_list(columns, "b."))),
+            params,
+        ).rowcount
+    return copied
+
+
+def fork_thread(
+    thread_id: int,
+    checkpoint_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Create a new thread whose state starts at a checkpoint of another thread.
+    
+    The checkpoint's stored rows are copied as they are, inside the
+    database (or from shard file to shard file): nothing is deserialized
+    and the graph is not run. Only that
+    one checkpoint is copied, not the checkpoints before it, so the cost
+    does not depend on how many turns the parent has had. The fork records
+    its parent and starting checkpoint in ``thread_forks``; after that the
+    two threads are independent, and deleting one leaves the other intact.
+    
+    Args:
+        thread_id: The thread to fork
+        checkpoint_id: Checkpoint to start from. Defaults to the latest;
+            a parent without checkpoints forks into an empty thread.
+        user_id: Owner of the new thread. Defaults to the parent's owner.
+    
+    Returns:
+        The new thread and its lineage
+    
+    Raises:
+        ThreadNotFoundException: If the parent thread does not exist
+        CheckpointNotFoundException: If the parent has no such checkpoint
+    """
+    start = time.perf_counter()
+    ensure_thread_hot(thread_id)
+    # Make sure the checkpointer has created its tables
+    get_checkpointer()
+    parent = str(thread_id)
+    
+    with get_engine().begin() as conn, shard_connection(conn, checkpoint_engine(thread_id)) as source:
+        owner = conn.execute(select(Thread.user_id).where(Thread.thread_id == thread_id)).scalar()
+        if owner is None:
+            raise ThreadNotFoundException(thread_id)
+        
+        params = {"thread_id": parent, "checkpoint_ns": ROOT_NS, "checkpoint_id": checkpoint_id}
+        if checkpoint_id is None:
+            forked_from = source.execute(LATEST_CHECKPOINT_SQL, params).scalar()
+        else:
+            forked_from = source.execute(FORK_CHECKPOINT_SQL, params).scalar()
+            if forked_from is None:
+                raise CheckpointNotFoundException(thread_id, checkpoint_id)
+        
+        row = conn.execute(
+            insert(Thread)
+            .values(user_id=user_id or owner)
+            .returning(Thread.thread_id, Thread.user_id, Thread.created_at)
+        ).one()
+        conn.execute(insert(ThreadFork).values(
+            thread_id=row.thread_id,
+            parent_thread_id=thread_id,
+            parent_checkpoint_id=forked_from,
+        ))
+        rows = 0
+        if forked_from:
+            target_engine = checkpoint_engine(row.thread_id)
+            if target_engine is source.engine:
+                rows = _copy_checkpoint(source, source, parent, str(row.thread_id), forked_from)
+            else:
+                with shard_connection(conn, target_engine) as target:
+                    rows = _copy_checkpoint(source, target, parent, str(row.thread_id), forked_from)
+    
+    remember_threads([(row.thread_id, row.user_id)])
+    elapsed = time.perf_counter() - start
+    metrics.inc("threads_forked_total")
+    metrics.observe("thread_fork_seconds", elapsed)
+    logger.info(
+        "Thread forked",
+        thread_id=row.thread_id,
+        parent_thread_id=thread_id,
+        checkpoint_id=forked_from,
+        rows=rows,
+        seconds=elapsed,
+    )
+    return {
+        "thread_id": row.thread_id,
+        "user_id": row.user_id,
+        "created_at": row.created_at,
+        "parent_thread_id": thread_id,
+        "parent_checkpoint_id": forked_from,
+    }
+
+
+def delete_lineage(conn: Connection, thread_ids: Iterable[int]) -> int:
+    """Remove deleted threads' fork lineage inside the caller's transaction."""
+    ids = [int(thread_id) for thread_id in thread_ids]
+    if not ids:
+        return 0
+    statement = text("DELETE FROM thread_forks WHERE thread_id IN :thread_ids").bindparams(
+        bindparam("thread_ids", expanding=True)
+    )
+    return conn.execute(statement, {"thread_ids": ids}).rowcount
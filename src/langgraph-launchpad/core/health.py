@@ -0,0 +1,222 @@
+import asyncio
+import math
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import structlog
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from ..config.settings import get_settings
+from ..utils.metrics import metrics
+from .checkpoint import get_checkpointer
+from .checkpoint_cache import CachingCheckpointSaver
+from .database import get_engine, get_read_engine
+from .scheduler import get_scheduler
+from .sharding import get_shard_engines
+
+logger = structlog.get_logger()
+
+# Thread ID the checkpointer probe looks up; it never has checkpoints
+PROBE_THREAD_ID = "__readiness_probe__"
+
+
+class LoopLagMonitor:
+    """
+    Continuously sample how late the event loop runs a timer callback.
+    
+    A task sleeps ``interval_seconds`` at a time and records how much later
+    than asked it woke up. Anything that blocks the loop (sync I/O, CPU
+    work in a route) shows up as lag. ``lag_seconds`` also counts the stall
+    in progress, so a check that runs right after a long block sees it even
+    before the sampler's own wakeup does.
+    """
+    
+    def __init__(self, interval_seconds: float, window_seconds: float):
+        self.interval_seconds = interval_seconds
+        self._samples: Deque[float] = deque(maxlen=max(1, math.ceil(window_seconds / interval_seconds)))
+        self._expected: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._expected = loop.time() + self.interval_seconds
+            await asyncio.sleep(self.interval_seconds)
+            lag = max(0.0, loop.time() - self._expected)
+            self._samples.append(lag)
+            metrics.set_gauge("event_loop_lag_seconds", lag)
+            metrics.observe("event_loop_lag_sample_seconds", lag)
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+    
+    def _pending(self) -> float:
+        if self._expected is None:
+            return 0.0
+        return max(0.0, asyncio.get_running_loop().time() - self._expected)
+    
+    def lag_seconds(self) -> float:
+        """Most recent lag, or the stall in progress if longer."""
+        last = self._samples[-1] if self._samples else 0.0
+        return max(last, self._pending())
+    
+    def max_lag_seconds(self) -> float:
+        """Worst lag over the sampling window."""
+        return max([self._pending(), *self._samples])
+
+
+@lru_cache()
+def get_loop_monitor() -> LoopLagMonitor:
+    """Get this worker's event loop lag monitor."""
+    settings = get_settings()
+    return LoopLagMonitor(settings.loop_lag_interval_seconds, settings.loop_lag_window_seconds)
+
+
+class DependencyProbe:
+    """
+    Connectivity check run in a thread with a timeout.
+    
+    A probe that times out keeps running in its thread (a blocked driver
+    call cannot be interrupted). Until it returns, later checks report
+    failure straight away instead of starting another one, so a hung
+    dependency cannot pile up probe threads.
+    """
+    
+    def __init__(self, name: str, check: Callable[[], Any]):
+        self.name = name
+        self.check = check
+        self._pending: Optional["asyncio.Future[Any]"] = None
+    
+    async def run(self, timeout: float) -> Dict[str, Any]:
+        if self._pending is not None and not self._pending.done():
+            return {"ok": False, "latency_ms": None, "error": "previous check has not returned"}
+        
+        start = time.perf_counter()
+        self._pending = asyncio.ensure_future(asyncio.to_thread(self.check))
+        try:
+            await asyncio.wait_for(asyncio.shield(self._pending), timeout)
+        except asyncio.TimeoutError:
+            error = f"no response within {timeout:g}s"
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        else:
+            latency = time.perf_counter() - start
+            metrics.observe("readiness_check_seconds", latency, dependency=self.name)
+            return {"ok": True, "latency_ms": latency * 1000, "error": None}
+        
+        metrics.inc("readiness_check_failures_total", dependency=self.name)
+        logger.warning("Readiness check failed", dependency=self.name, error=error)
+        return {"ok": False, "latency_ms": (time.perf_counter() - start) * 1000, "error": error}
+
+
+def _ping_engine(engine: Engine) -> None:
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+def _ping_checkpointer() -> None:
+    saver = get_checkpointer()
+    # Go to storage; a cache hit would not prove the connection works
+    storage = saver.inner if isinstance(saver, CachingCheckpointSaver) else saver
+    storage.get_tuple({"configurable": {"thread_id": PROBE_THREAD_ID}})
+
+
+@lru_cache()
+def get_probes() -> List[DependencyProbe]:
+    """Get this worker's dependency probes."""
+    probes = [DependencyProbe("database", lambda: _ping_engine(get_engine()))]
+    if get_settings().sqlite_read_split:
+        probes.append(DependencyProbe("database_read", lambda: _ping_engine(get_read_engine())))
+    for index, engine in enumerate(get_shard_engines()):
+        probes.append(DependencyProbe(f"database_shard{index}", lambda engine=engine: _ping_engine(engine)))
+    probes.append(DependencyProbe("checkpointer", _ping_checkpointer))
+    return probes
+
+
+def pool_status(engine: Engine) -> Optional[Dict[str, Any]]:
+    """Connection usage of an engine's pool, or None for pools that do not track it."""
+    pool = engine.pool
+    if not hasattr(pool, "checkedout") or not hasattr(pool, "size"):
+        return None
+    size = pool.size()
+    # A negative max_overflow means the pool has no limit
+    max_overflow = getattr(pool, "_max_overflow", 0)
+    capacity = size + max_overflow if max_overflow >= 0 else None
+    checked_out = pool.checkedout()
+    return {
+        "size": size,
+        "checked_out": checked_out,
+        "overflow": max(pool.overflow(), 0),
+        "capacity": capacity,
+        "saturation": checked_out / capacity if capacity else None,
+    }
+
+
+async def readiness() -> Dict[str, Any]:
+    """
+    Check whether this worker should receive traffic.
+    
+    Probes each dependency with ``readiness_check_timeout_seconds`` and
+    compares event loop lag, pool saturation and queued runs against their
+    ``readiness_max_*`` thresholds.
+    
+    Returns:
+        ``ready``, the ``reasons`` it is not, and the measurements behind them
+    """
+    settings = get_settings()
+    reasons: List[str] = []
+    
+    probes = get_probes()
+    results = await asyncio.gather(*(probe.run(settings.readiness_check_timeout_seconds) for probe in probes))
+    checks = {probe.name: result for probe, result in zip(probes, results)}
+    reasons.extend(f"{name}: {result['error']}" for name, result in checks.items() if not result["ok"])
+    
+    monitor = get_loop_monitor()
+    lag = monitor.max_lag_seconds()
+    if not monitor.running:
+        reasons.append("event loop lag monitor is not running")
+    elif lag > settings.readiness_max_loop_lag_seconds:
+        reasons.append(f"event loop lag {lag * 1000:.0f}ms over {settings.readiness_max_loop_lag_seconds * 1000:.0f}ms")
+    
+    pools = {"database": pool_status(get_engine())}
+    if get_read_engine() is not get_engine():
+        pools["database_read"] = pool_status(get_read_engine())
+    for index, engine in enumerate(get_shard_engines()):
+        pools[f"database_shard{index}"] = pool_status(engine)
+    for name, pool in pools.items():
+        if pool and pool["saturation"] is not None and pool["saturation"] > settings.readiness_max_pool_saturation:
+            reasons.append(f"{name} pool {pool['checked_out']}/{pool['capacity']} connections in use")
+    
+    scheduler = get_scheduler()
+    if settings.readiness_max_queued_runs and scheduler.queued > settings.readiness_max_queued_runs:
+        reasons.append(f"{scheduler.queued} runs queued")
+    
+    ready = not reasons
+    metrics.set_gauge("ready", 1 if ready else 0)
+    return {
+        "ready": ready,
+        "reasons": reasons,
+        "checks": checks,
+        "event_loop_lag_ms": monitor.lag_seconds() * 1000,
+        "event_loop_max_lag_ms": lag * 1000,
+        "pools": {name: pool for name, pool in pools.items() if pool is not None},
+        "runs_in_flight": scheduler.in_flight,
+        "runs_queued": scheduler.queued,
+    }
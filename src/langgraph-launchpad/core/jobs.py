@@ -0,0 +1,123 @@
+import asyncio
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+import structlog
+from sqlalchemy import text
+
+from ..config.settings import get_settings
+from ..utils.metrics import metrics
+from .checkpoint import sqlite_path
+from .database import get_engine
+
+logger = structlog.get_logger()
+
+
+@contextmanager
+def job_lock(name: str) -> Iterator[bool]:
+    """
+    Try to take a cross-process lock for a maintenance job.
+    
+    Every worker runs the background jobs, so only the one holding the lock
+    does the work. PostgreSQL uses a session advisory lock; SQLite uses an
+    ``flock`` on a file next to the database. Yields whether the lock was taken.
+    """
+    settings = get_settings()
+    
+    if settings.is_postgresql:
+        with get_engine().connect() as conn:
+            acquired = conn.execute(
+                text("SELECT pg_try_advisory_lock(hashtext(:name))"), {"name": name}
+            ).scalar()
+            try:
+                yield bool(acquired)
+            finally:
+                if acquired:
+                    conn.execute(text("SELECT pg_advisory_unlock(hashtext(:name))"), {"name": name})
+        return
+    
+    try:
+        import fcntl
+    except ImportError:
+        # No flock on this platform; fall back to running in every process
+        yield True
+        return
+    
+    lock_path = f"{os.path.abspath(sqlite_path(settings.database_url))}.{name}.lock"
+    with open(lock_path, "a") as handle:
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+class PeriodicJob:
+    """
+    Run a blocking maintenance function periodically off the event loop.
+    
+    Exclusive jobs run in one process at a time (see ``job_lock``); others,
+    such as flushing per-process buffers, run in every worker.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        interval_seconds: float,
+        func: Callable[[], Any],
+        exclusive: bool = True,
+    ):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.func = func
+        self.exclusive = exclusive
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self) -> None:
+        """Schedule the job on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=f"job:{self.name}")
+    
+    async def stop(self) -> None:
+        """Cancel the job and wait for it to finish."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+    
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception as e:
+                metrics.inc("job_failures_total", job=self.name)
+                logger.error("Background job failed", job=self.name, error=str(e))
+    
+    def run_once(self) -> Optional[Any]:
+        """Run the job now if no other process is running it."""
+        if not self.exclusive:
+            return self._timed_run()
+        
+        with job_lock(self.name) as acquired:
+            if not acquired:
+                logger.debug("Background job already running elsewhere", job=self.name)
+                return None
+            return self._timed_run()
+    
+    def _timed_run(self) -> Any:
+        start = time.perf_counter()
+        result = self.func()
+        metrics.inc("job_runs_total", job=self.name)
+        metrics.observe("job_duration_seconds", time.perf_counter() - start, job=self.name)
+        return result
\ No newline at end of file
@@ -0,0 +1,231 @@
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import structlog
+from sqlalchemy import bindparam, func, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from ..config.settings import get_settings
+from ..utils.metrics import metrics
+from .checkpoint import get_checkpointer
+from .database import get_engine
+from .jobs import PeriodicJob
+from .models import Thread, ThreadStats
+from .sharding import get_shard_ring, scatter, shard_groups
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = structlog.get_logger()
+
+THREAD_COLUMNS = (Thread.thread_id, Thread.user_id, Thread.created_at, Thread.updated_at)
+
+# ThreadInfo fields, in response order
+THREAD_INFO_COLUMNS = THREAD_COLUMNS + (ThreadStats.message_count,)
+
+# Last thread id the backfill job looked at; it resumes after it and wraps around
+_backfill_after = 0
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        # Pydantic's format: UTC as "Z" rather than "+00:00"
+        text = value.isoformat()
+        return text[:-6] + "Z" if value.utcoffset() == timedelta(0) else text
+    return str(value)
+
+
+def encode_json(payload: Any) -> bytes:
+    """Encode a response body of plain dicts, lists and datetimes, with orjson if installed."""
+    if orjson is not None:
+        return orjson.dumps(payload, default=_json_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=_json_default).encode("utf-8")
+
+
+def latest_messages(thread_id: int) -> List[Any]:
+    """Get the messages in a thread's latest checkpoint, without building a graph state snapshot."""
+    state = get_checkpointer().get_tuple({"configurable": {"thread_id": str(thread_id)}})
+    return list(state.checkpoint["channel_values"].get("messages", [])) if state else []
+
+
+def _upsert_statement(overwrite: bool) -> Any:
+    if get_settings().is_postgresql:
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    
+    statement = insert(ThreadStats)
+    if not overwrite:
+        return statement.on_conflict_do_nothing(index_elements=["thread_id"])
+    return statement.on_conflict_do_update(
+        index_elements=["thread_id"],
+        set_={"message_count": statement.excluded.message_count},
+    )
+
+
+def record_message_counts(counts: Dict[int, int], overwrite: bool = True) -> None:
+    """
+    Store threads' message counts. Failures are logged, never raised.
+    
+    With ``overwrite=False`` existing counts are kept, so a backfill cannot
+    replace the count a turn on the thread wrote meanwhile.
+    """
+    if not counts:
+        return
+    try:
+        for engine, thread_ids in shard_groups(counts):
+            with engine.begin() as conn:
+                conn.execute(_upsert_statement(overwrite), [
+                    {"thread_id": thread_id, "message_count": counts[thread_id]} for thread_id in thread_ids
+                ])
+    except Exception as e:
+        logger.error("Failed to record thread message counts", threads=len(counts), error=str(e))
+
+
+def delete_thread_stats(conn: Connection, thread_ids: Iterable[int]) -> int:
+    """Remove deleted threads' stats inside the caller's transaction."""
+    ids = [int(thread_id) for thread_id in thread_ids]
+    if not ids:
+        return 0
+    statement = text("DELETE FROM thread_stats WHERE thread_id IN :thread_ids").bindparams(
+        bindparam("thread_ids", expanding=True)
+    )
+    return conn.execute(statement, {"thread_ids": ids}).rowcount
+
+
+def stored_message_counts(thread_ids: List[int]) -> Dict[int, int]:
+    """Read threads' stored message counts from the shards holding them, in parallel."""
+    def lookup(group: Tuple[Engine, List[int]]) -> List[Tuple[int, int]]:
+        engine, ids = group
+        with engine.connect() as conn:
+            return conn.execute(
+                select(ThreadStats.thread_id, ThreadStats.message_count).where(ThreadStats.thread_id.in_(ids))
+            ).all()
+    
+    return {thread_id: count for rows in scatter(lookup, shard_groups(thread_ids)) for thread_id, count in rows}
+
+
+def thread_page(
+    db: Session,
+    user_id: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Read a page of threads as ``ThreadInfo`` dicts, and the total count.
+    
+    Only the response's columns are selected, as plain rows: no ORM
+    objects or identity map. Message counts come from ``thread_stats``;
+    threads without a row yet (last used before counts were recorded, or
+    forked) are listed with ``None`` until ``backfill_message_counts``
+    stores one, so a page never loads checkpoints or writes.
+    
+    With sharded storage the counts live in the shard files: the page is
+    read from the main database and its counts gathered from the shards.
+    """
+    sharded = get_shard_ring() is not None
+    if sharded:
+        query = select(*THREAD_COLUMNS)
+    else:
+        query = select(*THREAD_INFO_COLUMNS).outerjoin(ThreadStats, ThreadStats.thread_id == Thread.thread_id)
+    total = select(func.count()).select_from(Thread)
+    if user_id is not None:
+        query = query.where(Thread.user_id == user_id)
+        total = total.where(Thread.user_id == user_id)
+    
+    rows = db.execute(query.order_by(Thread.thread_id).offset(skip).limit(limit)).all()
+    threads = [dict(row._mapping) for row in rows]
+    if sharded:
+        stored = stored_message_counts([thread["thread_id"] for thread in threads])
+        for thread in threads:
+            thread["message_count"] = stored.get(thread["thread_id"])
+    
+    return threads, db.execute(total).scalar()
+
+
+def uncounted_threads(after: int, limit: int) -> Tuple[List[int], int]:
+    """
+    Find threads with ids above ``after`` that have no stored message count.
+    
+    Looks at up to ``limit`` threads, in id order. With sharded storage the
+    counts live in the shard files, so the threads' ids are read from the
+    main database and checked against them.
+    
+    Returns:
+        The uncounted thread ids, and the id to look after next time (0
+        once the last thread was reached)
+    """
+    sharded = get_shard_ring() is not None
+    query = select(Thread.thread_id).where(Thread.thread_id > after)
+    if not sharded:
+        query = query.outerjoin(ThreadStats, ThreadStats.thread_id == Thread.thread_id).where(
+            ThreadStats.thread_id.is_(None)
+        )
+    with get_engine().connect() as conn:
+        thread_ids = list(conn.execute(query.order_by(Thread.thread_id).limit(limit)).scalars())
+    
+    resume_after = thread_ids[-1] if len(thread_ids) == limit else 0
+    if sharded:
+        stored = stored_message_counts(thread_ids)
+        thread_ids = [thread_id for thread_id in thread_ids if thread_id not in stored]
+    return thread_ids, resume_after
+
+
+def backfill_message_counts() -> int:
+    """
+    Count and store the messages of threads that have no stored count.
+    
+    Each run handles the next ``message_count_backfill_batch_size`` threads
+    after the last one it looked at, starting over at the first thread once
+    it reaches the end. Each thread's latest checkpoint is loaded once;
+    counts a turn stored meanwhile are kept. Threads that fail to load are
+    retried on the next pass.
+    
+    Returns:
+        The number of counts stored
+    """
+    global _backfill_after
+    batch_size = get_settings().message_count_backfill_batch_size
+    thread_ids, _backfill_after = uncounted_threads(_backfill_after, batch_size)
+    
+    counts: Dict[int, int] = {}
+    for thread_id in thread_ids:
+        try:
+            counts[thread_id] = len(latest_messages(thread_id))
+        except Exception as e:
+            logger.warning("Failed to count thread messages", thread_id=thread_id, error=str(e))
+    if counts:
+        record_message_counts(counts, overwrite=False)
+        metrics.inc("thread_message_counts_backfilled_total", len(counts))
+    return len(counts)
+
+
+def create_message_count_backfill_job() -> PeriodicJob:
+    """Create the job storing message counts of threads that have none."""
+    return PeriodicJob(
+        "message-count-backfill",
+        get_settings().message_count_backfill_interval_seconds,
+        backfill_message_counts,
+    )
+
+
+def thread_row(db: Session, thread_id: int) -> Optional[Dict[str, Any]]:
+    """Read one thread's columns, or None if it does not exist."""
+    row = db.execute(select(*THREAD_COLUMNS).where(Thread.thread_id == thread_id)).first()
+    return dict(row._mapping) if row is not None else None
+
+
+def message_dicts(messages: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Convert messages to ``MessageResponse`` dicts."""
+    return [
+        {
+            "is_user": getattr(message, "name", "") == "user",
+            "content": getattr(message, "content", ""),
+            "metadata": getattr(message, "additional_kwargs", {}),
+        }
+        for message in messages
+    ]
@@ -0,0 +1,211 @@
+import asyncio
+import linecache
+import random
+import threading
+import tracemalloc
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+import structlog
+
+from ..config.settings import get_settings
+from ..utils.metrics import metrics
+from .checkpoint import get_checkpointer
+from .checkpoint_cache import CachingCheckpointSaver, approximate_size
+from .worker import current_rss_bytes
+
+logger = structlog.get_logger()
+
+# Allocations made by the profiler itself or by imports are noise in a diff
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, linecache.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _stat(stat: Any, diff: bool) -> Dict[str, Any]:
+    frames = [f"{frame.filename}:{frame.lineno}" for frame in reversed(stat.traceback)]
+    entry = {"location": frames[0] if frames else "?", "traceback": frames, "bytes": stat.size, "count": stat.count}
+    if diff:
+        entry["bytes_diff"] = stat.size_diff
+        entry["count_diff"] = stat.count_diff
+    return entry
+
+
+class MemoryProfiler:
+    """
+    tracemalloc snapshots and diffs, and per-route peak allocation sampling.
+    
+    ``snapshot`` keeps the taken snapshot as the baseline that ``diff``
+    compares against, so "take snapshot, apply load, diff" shows what the
+    load left allocated and where.
+    
+    Request sampling records the traced peak of a sampled request above
+    what was allocated when it started. tracemalloc's peak is process
+    wide, so only one request is sampled at a time; concurrent unsampled
+    requests still count towards it, which makes the numbers upper bounds
+    under load and exact when requests are serial (as in the benchmarks).
+    A sample covers at most ``max_sample_seconds`` of a request, so a
+    never-ending event stream or a long export cannot hold the sampling
+    slot and stop every other request from being sampled.
+    """
+    
+    def __init__(self, frames: int, sample_rate: float, top: int, max_sample_seconds: float = 10.0):
+        self.frames = frames
+        self.sample_rate = sample_rate
+        self.top = top
+        self.max_sample_seconds = max_sample_seconds
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._sampling = threading.Lock()
+    
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+    
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            logger.info("Memory profiling started", frames=self.frames, sample_rate=self.sample_rate)
+    
+    def stop(self) -> None:
+        self._baseline = None
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+    
+    def _take(self) -> tracemalloc.Snapshot:
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("Memory profiling is not enabled (MEMORY_PROFILING_ENABLED)")
+        return tracemalloc.take_snapshot().filter_traces(_IGNORED)
+    
+    def snapshot(self, group_by: str = "lineno") -> Dict[str, Any]:
+        """Take a snapshot, keep it as the diff baseline and return its top allocations."""
+        snapshot = self._take()
+        self._baseline = snapshot
+        stats = snapshot.statistics(group_by)
+        return {
+            "traced_bytes": sum(stat.size for stat in stats),
+            "top": [_stat(stat, diff=False) for stat in stats[:self.top]],
+            **self.usage(),
+        }
+    
+    def diff(self, group_by: str = "lineno") -> Dict[str, Any]:
+        """Compare a new snapshot against the baseline, largest growth first."""
+        if self._baseline is None:
+            raise RuntimeError("No baseline snapshot; take one first")
+        stats = self._take().compare_to(self._baseline, group_by)
+        return {
+            "traced_bytes_diff": sum(stat.size_diff for stat in stats),
+            "top": [_stat(stat, diff=True) for stat in stats[:self.top]],
+            **self.usage(),
+        }
+    
+    def usage(self) -> Dict[str, int]:
+        current, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        return {"rss_bytes": current_rss_bytes(), "traced_current_bytes": current, "traced_peak_bytes": peak}
+    
+    def begin_sample(self) -> Optional[int]:
+        """Start sampling a request, if it is picked and no other request is being sampled."""
+        if not tracemalloc.is_tracing() or random.random() >= self.sample_rate:
+            return None
+        if not self._sampling.acquire(blocking=False):
+            return None
+        tracemalloc.reset_peak()
+        return tracemalloc.get_traced_memory()[0]
+    
+    def end_sample(self, route: str, start: int) -> None:
+        try:
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            self._sampling.release()
+        metrics.observe("request_peak_alloc_bytes", max(peak - start, 0), route=route)
+        metrics.observe("request_retained_alloc_bytes", current - start, route=route)
+    
+    def route_peaks(self) -> Dict[str, Dict[str, float]]:
+        """Peak allocation summaries of sampled requests per route."""
+        return {
+            series["labels"]["route"]: series["value"]
+            for series in metrics.snapshot()["histograms"].get("request_peak_alloc_bytes", [])
+        }
+
+
+@lru_cache()
+def get_memory_profiler() -> MemoryProfiler:
+    """Get this worker's memory profiler."""
+    settings = get_settings()
+    return MemoryProfiler(
+        frames=settings.memory_trace_frames,
+        sample_rate=settings.memory_sample_rate,
+        top=settings.memory_top_allocations,
+        max_sample_seconds=settings.memory_sample_max_seconds,
+    )
+
+
+def thread_state_sizes(thread_ids: Optional[Iterable[int]] = None, limit: int = 20) -> Dict[str, Any]:
+    """
+    Approximate in-memory size of graph state per thread, largest first.
+    
+    Without ``thread_ids`` this covers the threads whose state this worker
+    holds in the thread state cache, i.e. what is resident between turns.
+    With ``thread_ids`` the latest checkpoint of each is loaded and measured
+    the same way, which is what a turn on that thread will hold.
+    """
+    saver = get_checkpointer()
+    cache = saver.cache if isinstance(saver, CachingCheckpointSaver) else None
+    
+    if thread_ids is None:
+        sizes = cache.sizes() if cache is not None else []
+    else:
+        storage = saver.inner if isinstance(saver, CachingCheckpointSaver) else saver
+        sizes = []
+        for thread_id in thread_ids:
+            state = storage.get_tuple({"configurable": {"thread_id": str(thread_id)}})
+            if state is not None:
+                size = approximate_size(state.checkpoint) + approximate_size(state.metadata)
+                sizes.append((str(thread_id), size))
+    
+    sizes.sort(key=lambda item: item[1], reverse=True)
+    threads: List[Dict[str, Any]] = [
+        {"thread_id": thread_id, "approximate_bytes": size} for thread_id, size in sizes[:limit]
+    ]
+    return {
+        "threads": threads,
+        "thread_count": len(sizes),
+        "total_bytes": sum(size for _, size in sizes),
+        "cache_bytes": cache.bytes if cache is not None else 0,
+        "cache_max_bytes": cache.max_bytes if cache is not None else 0,
+    }
+
+
+class MemorySamplingMiddleware:
+    """ASGI middleware sampling the peak allocation of requests per route."""
+    
+    def __init__(self, app: Any):
+        self.app = app
+    
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        profiler = get_memory_profiler()
+        start = profiler.begin_sample() if scope["type"] == "http" else None
+        if start is None:
+            await self.app(scope, receive, send)
+            return
+        
+        ended = False
+        
+        def end() -> None:
+            nonlocal ended
+            if ended:
+                return
+            ended = True
+            route = getattr(scope.get("route"), "path", None) or scope.get("path", "?")
+            profiler.end_sample(f"{scope.get('method', '')} {route}", start)
+        
+        # Streams may never finish; give the sampling slot back after a bounded window
+        timer = asyncio.get_running_loop().call_later(profiler.max_sample_seconds, end)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            timer.cancel()
+            end()
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy import BigInteger, Column, DateTime, Float, Integer, String, Text, UniqueConstraint
 from sqlalchemy.sql import func
 
 from .database import Base
@@ -25,4 +25,87 @@ class Thread(Base):
     )
     
     def __repr__(self) -> str:
-        return f"<Thread(id={self.thread_id}, user_id='{self.user_id}')>"
\ No newline at end of file
+        return f"<Thread(id={self.thread_id}, user_id='{self.user_id}')>"
+
+
+class ArchivedThread(Base):
+    """Marker for a thread whose checkpoint history was moved to cold storage."""
+    
+    __tablename__ = "archived_threads"
+    
+    thread_id = Column(Integer, primary_key=True, autoincrement=False)
+    path = Column(String, nullable=False)
+    size_bytes = Column(Integer, nullable=False, default=0)
+    checkpoint_rows = Column(Integer, nullable=False, default=0)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self) -> str:
+        return f"<ArchivedThread(id={self.thread_id}, path='{self.path}')>"
+
+
+class ThreadFork(Base):
+    """Lineage of a thread forked from a checkpoint of another thread."""
+    
+    __tablename__ = "thread_forks"
+    
+    thread_id = Column(Integer, primary_key=True, autoincrement=False)
+    parent_thread_id = Column(Integer, nullable=False, index=True)
+    parent_checkpoint_id = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self) -> str:
+        return f"<ThreadFork(id={self.thread_id}, parent={self.parent_thread_id})>"
+
+
+class ThreadStats(Base):
+    """Per-thread numbers kept current after each turn, so listings need not load graph state."""
+    
+    __tablename__ = "thread_stats"
+    
+    thread_id = Column(Integer, primary_key=True, autoincrement=False)
+    message_count = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self) -> str:
+        return f"<ThreadStats(id={self.thread_id}, messages={self.message_count})>"
+
+
+class ThreadMessage(Base):
+    """A conversation message copied out of the checkpoints for full-text search."""
+    
+    __tablename__ = "thread_messages"
+    __table_args__ = (UniqueConstraint("thread_id", "position", name="uq_thread_messages_position"),)
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    thread_id = Column(Integer, nullable=False)
+    user_id = Column(String, nullable=False, index=True)
+    position = Column(Integer, nullable=False)
+    role = Column(String, nullable=False)
+    content = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self) -> str:
+        return f"<ThreadMessage(thread_id={self.thread_id}, position={self.position})>"
+
+
+class UsageRollup(Base):
+    """
+    Usage counters per user and UTC day, maintained incrementally.
+    
+    Rows with an empty ``user_id`` aggregate all users and rows with an
+    empty ``day`` aggregate all days, so every total is a single row.
+    """
+    
+    __tablename__ = "usage_rollups"
+    
+    user_id = Column(String, primary_key=True)
+    day = Column(String(10), primary_key=True)
+    threads_created = Column(BigInteger, nullable=False, default=0)
+    threads_deleted = Column(BigInteger, nullable=False, default=0)
+    turns = Column(BigInteger, nullable=False, default=0)
+    prompt_tokens = Column(BigInteger, nullable=False, default=0)
+    completion_tokens = Column(BigInteger, nullable=False, default=0)
+    latency_ms_total = Column(Float, nullable=False, default=0.0)
+    latency_ms_max = Column(Float, nullable=False, default=0.0)
+    
+    def __repr__(self) -> str:
+        return f"<UsageRollup(user_id='{self.user_id}', day='{self.day}', turns={self.turns})>"
@@ -0,0 +1,307 @@
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import structlog
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Connection, Engine
+
+from ..config.settings import get_settings
+from ..utils.metrics import metrics
+from .archive import discard_archives
+from .checkpoint import (
+    checkpoint_tables,
+    checkpoint_writes_table,
+    get_checkpointer,
+    invalidate_cached_threads,
+)
+from .database import get_engine
+from .fork import delete_lineage
+from .listing import delete_thread_stats
+from .sharding import checkpoint_engines, scatter, shard_connection, shard_groups
+from .jobs import PeriodicJob
+from .search import delete_indexed_messages
+
+logger = structlog.get_logger()
+
+# Bound parameters per IN (...) clause
+PURGE_CHUNK_SIZE = 500
+
+TRIM_CHECKPOINTS_SQL = """
+DELETE FROM checkpoints
+WHERE (thread_id, checkpoint_ns, checkpoint_id) IN (
+    SELECT thread_id, checkpoint_ns, checkpoint_id FROM (
+        SELECT
+            thread_id,
+            checkpoint_ns,
+            checkpoint_id,
+            ROW_NUMBER() OVER (
+                PARTITION BY thread_id, checkpoint_ns
+                ORDER BY checkpoint_id DESC
+            ) AS position
+        FROM checkpoints
+        WHERE thread_id IN :thread_ids
+    ) ranked
+    WHERE position > :keep_last
+)
+"""
+
+TRIM_WRITES_SQL = """
+DELETE FROM {table}
+WHERE thread_id IN :thread_ids
+AND NOT EXISTS (
+    SELECT 1 FROM checkpoints c
+    WHERE c.thread_id = {table}.thread_id
+    AND c.checkpoint_ns = {table}.checkpoint_ns
+    AND c.checkpoint_id = {table}.checkpoint_id
+)
+"""
+
+# Channel values are shared between checkpoints by version, so a blob can only
+# go once no remaining checkpoint of the thread references that version.
+TRIM_BLOBS_SQL = """
+DELETE FROM checkpoint_blobs
+WHERE thread_id IN :thread_ids
+AND NOT EXISTS (
+    SELECT 1 FROM checkpoints c
+    WHERE c.thread_id = checkpoint_blobs.thread_id
+    AND c.checkpoint_ns = checkpoint_blobs.checkpoint_ns
+    AND (c.checkpoint -> 'channel_versions' ->> checkpoint_blobs.channel) = checkpoint_blobs.version
+)
+"""
+
+
+def _chunks(values: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _expanding(sql: str) -> Any:
+    return text(sql).bindparams(bindparam("thread_ids", expanding=True))
+
+
+def purge_threads(thread_ids: Iterable[int]) -> int:
+    """
+    Delete every checkpoint, blob and pending write of the given threads.
+    
+    Archived history, search index entries, fork lineage and stats of the
+    threads are discarded as well.
+    
+    Args:
+        thread_ids: Thread IDs whose checkpoint data should be removed
+    
+    Returns:
+        The number of rows deleted across the checkpointer's tables
+    """
+    ids = [str(thread_id) for thread_id in thread_ids]
+    if not ids:
+        return 0
+    
+    # Make sure the checkpointer has created its tables
+    get_checkpointer()
+    
+    deleted = 0
+    with get_engine().begin() as conn:
+        for engine, shard_ids in shard_groups(ids):
+            with shard_connection(conn, engine) as shard_conn:
+                for table in checkpoint_tables():
+                    statement = _expanding(f"DELETE FROM {table} WHERE thread_id IN :thread_ids")
+                    for chunk in _chunks(shard_ids, PURGE_CHUNK_SIZE):
+                        deleted += shard_conn.execute(statement, {"thread_ids": list(chunk)}).rowcount
+                delete_thread_stats(shard_conn, shard_ids)
+        delete_indexed_messages(conn, ids)
+        delete_lineage(conn, ids)
+    
+    discard_archives(int(thread_id) for thread_id in ids)
+    invalidate_cached_threads(ids)
+    
+    metrics.inc("checkpoint_rows_purged_total", deleted)
+    logger.info("Purged checkpoint data", threads=len(ids), rows=deleted)
+    return deleted
+
+
+def _storage_bytes(conn: Connection) -> int:
+    """Get the bytes currently used by the checkpointer's tables (SQLite: whole file)."""
+    if get_settings().is_postgresql:
+        return sum(
+            conn.execute(text("SELECT pg_total_relation_size(:table)"), {"table": table}).scalar() or 0
+            for table in checkpoint_tables()
+        )
+    
+    page_size = conn.exec_driver_sql("PRAGMA page_size").scalar()
+    page_count = conn.exec_driver_sql("PRAGMA page_count").scalar()
+    free_pages = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+    return (page_count - free_pages) * page_size
+
+
+def storage_bytes() -> int:
+    """Get the bytes used by the checkpointer's tables (SQLite: whole files), across shards."""
+    def measure(engine: Engine) -> int:
+        with engine.connect() as conn:
+            return _storage_bytes(conn)
+    
+    return sum(scatter(measure, checkpoint_engines()))
+
+
+def _trim_threads(conn: Connection, thread_ids: List[str], keep_last: int) -> Dict[str, int]:
+    params = {"thread_ids": thread_ids, "keep_last": keep_last}
+    deleted = {"checkpoints": conn.execute(_expanding(TRIM_CHECKPOINTS_SQL), params).rowcount}
+    
+    writes_table = checkpoint_writes_table()
+    deleted[writes_table] = conn.execute(
+        _expanding(TRIM_WRITES_SQL.format(table=writes_table)), {"thread_ids": thread_ids}
+    ).rowcount
+    if get_settings().is_postgresql:
+        deleted["checkpoint_blobs"] = conn.execute(
+            _expanding(TRIM_BLOBS_SQL), {"thread_ids": thread_ids}
+        ).rowcount
+    return deleted
+
+
+def _orphaned_thread_ids(engine: Engine) -> List[str]:
+    if engine is get_engine():
+        with engine.connect() as conn:
+            rows = conn.execute(text(
+                "SELECT DISTINCT thread_id FROM checkpoints "
+                "WHERE thread_id NOT IN (SELECT CAST(thread_id AS TEXT) FROM threads)"
+            ))
+            return [row[0] for row in rows]
+    
+    # A shard cannot join the main database's threads table: look its threads up there
+    with engine.connect() as conn:
+        candidates = [row[0] for row in conn.execute(text("SELECT DISTINCT thread_id FROM checkpoints"))]
+    existing = set()
+    statement = _expanding("SELECT CAST(thread_id AS TEXT) FROM threads WHERE CAST(thread_id AS TEXT) IN :thread_ids")
+    with get_engine().connect() as conn:
+        for chunk in _chunks(candidates, PURGE_CHUNK_SIZE):
+            existing.update(row[0] for row in conn.execute(statement, {"thread_ids": list(chunk)}))
+    return [thread_id for thread_id in candidates if thread_id not in existing]
+
+
+def vacuum_checkpoints() -> float:
+    """Reclaim free space and refresh planner statistics. Returns the seconds taken."""
+    start = time.perf_counter()
+    
+    def vacuum(engine: Engine) -> None:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            if get_settings().is_postgresql:
+                for table in checkpoint_tables():
+                    conn.exec_driver_sql(f"VACUUM (ANALYZE) {table}")
+            else:
+                conn.exec_driver_sql("VACUUM")
+                conn.exec_driver_sql("ANALYZE")
+                conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+    
+    scatter(vacuum, checkpoint_engines())
+    elapsed = time.perf_counter() - start
+    metrics.observe("checkpoint_vacuum_seconds", elapsed)
+    return elapsed
+
+
+def compact_checkpoints(
+    keep_last: Optional[int] = None,
+    vacuum: bool = False,
+) -> Dict[str, Any]:
+    """
+    Trim every thread to its most recent checkpoints and drop orphaned data.
+    
+    Threads are processed in batches of ``checkpoint_retention_batch_size`` so
+    each transaction holds the write lock only briefly, and shards in parallel.
+    
+    Args:
+        keep_last: Checkpoints to keep per thread and namespace. Defaults to
+            the ``checkpoint_retention_keep_last`` setting; 0 keeps everything.
+        vacuum: Whether to VACUUM/ANALYZE after deleting
+    
+    Returns:
+        A summary with rows deleted per table and bytes reclaimed
+    """
+    settings = get_settings()
+    keep_last = settings.checkpoint_retention_keep_last if keep_last is None else keep_last
+    get_checkpointer()
+    
+    start = time.perf_counter()
+    bytes_before = storage_bytes()
+    
+    def trim(engine: Engine) -> Tuple[Dict[str, int], int]:
+        # Shards have their own write locks, so they are trimmed in parallel
+        trimmed: Dict[str, int] = {table: 0 for table in checkpoint_tables()}
+        with engine.connect() as conn:
+            thread_ids = [
+                row[0] for row in conn.execute(
+                    text(
+                        "SELECT thread_id FROM checkpoints "
+                        "GROUP BY thread_id HAVING COUNT(*) > :keep_last"
+                    ),
+                    {"keep_last": keep_last},
+                )
+            ]
+        for batch in _chunks(thread_ids, settings.checkpoint_retention_batch_size):
+            with engine.begin() as conn:
+                for table, count in _trim_threads(conn, list(batch), keep_last).items():
+                    trimmed[table] += count
+        return trimmed, len(thread_ids)
+    
+    deleted: Dict[str, int] = {table: 0 for table in checkpoint_tables()}
+    trimmed_threads = 0
+    if keep_last > 0:
+        for shard_deleted, shard_threads in scatter(trim, checkpoint_engines()):
+            for table, count in shard_deleted.items():
+                deleted[table] += count
+            trimmed_threads += shard_threads
+    
+    orphaned = 0
+    if settings.checkpoint_retention_purge_orphans:
+        orphan_ids = [thread_id for ids in scatter(_orphaned_thread_ids, checkpoint_engines()) for thread_id in ids]
+        if orphan_ids:
+            orphaned = len(orphan_ids)
+            deleted["orphans"] = purge_threads(int(thread_id) for thread_id in orphan_ids)
+    
+    vacuum_seconds = vacuum_checkpoints() if vacuum else 0.0
+    
+    bytes_after = storage_bytes()
+    reclaimed = max(bytes_before - bytes_after, 0)
+    
+    for table, count in deleted.items():
+        metrics.inc("checkpoint_rows_compacted_total", count, table=table)
+    metrics.inc("checkpoint_bytes_reclaimed_total", reclaimed)
+    metrics.set_gauge("checkpoint_storage_bytes", bytes_after)
+    
+    result = {
+        "keep_last": keep_last,
+        "threads_trimmed": trimmed_threads,
+        "orphaned_threads": orphaned,
+        "rows_deleted": deleted,
+        "vacuumed": vacuum,
+        "vacuum_seconds": vacuum_seconds,
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_after,
+        "bytes_reclaimed": reclaimed,
+        "duration_seconds": time.perf_counter() - start,
+    }
+    logger.info("Checkpoint compaction finished", **result)
+    return result
+
+
+class CheckpointCompactor:
+    """Compaction job body that vacuums every ``checkpoint_vacuum_every`` runs."""
+    
+    def __init__(self):
+        self.runs = 0
+    
+    def __call__(self) -> Dict[str, Any]:
+        settings = get_settings()
+        self.runs += 1
+        vacuum = bool(settings.checkpoint_vacuum_every) and self.runs % settings.checkpoint_vacuum_every == 0
+        return compact_checkpoints(vacuum=vacuum)
+
+
+def create_compaction_job() -> Optional[PeriodicJob]:
+    """Create the background compaction job if it is enabled."""
+    settings = get_settings()
+    if not settings.checkpoint_compaction_enabled:
+        return None
+    return PeriodicJob(
+        "checkpoint-compaction",
+        settings.checkpoint_retention_interval_seconds,
+        CheckpointCompactor(),
+    )
\ No newline at end of file
@@ -0,0 +1,238 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+import structlog
+
+from ..config.settings import get_settings
+from ..utils.exceptions import DeadlineExceededException, SchedulerRejectedException
+from ..utils.metrics import metrics
+from .deadline import remaining
+
+logger = structlog.get_logger()
+
+
+def parse_weights(value: str) -> Dict[str, float]:
+    """Parse the ``user=weight`` pairs of the ``scheduler_user_weights`` setting."""
+    weights = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        user_id, _, weight = item.rpartition("=")
+        if not user_id:
+            raise ValueError(f"Scheduler weight must be 'user=weight', got {item!r}")
+        weights[user_id.strip()] = float(weight)
+    return weights
+
+
+class _Waiter:
+    __slots__ = ("start_tag", "future")
+    
+    def __init__(self, start_tag: float, future: "asyncio.Future[None]"):
+        self.start_tag = start_tag
+        self.future = future
+
+
+class _UserQueue:
+    __slots__ = ("weight", "in_flight", "finish_tag", "waiters")
+    
+    def __init__(self, weight: float):
+        self.weight = weight
+        self.in_flight = 0
+        self.finish_tag = 0.0
+        self.waiters: Deque[_Waiter] = deque()
+
+
+class FairScheduler:
+    """
+    Weighted fair queuing of graph runs across users.
+    
+    Implements start-time fair queuing: each request gets a start tag of
+    ``max(virtual time, the user's last finish tag)`` and advances the
+    user's finish tag by ``1 / weight``. Whenever a slot frees up, the
+    waiting request with the smallest start tag among users below their
+    concurrency cap runs next. A user with weight 2 therefore gets twice
+    the share of a weight 1 user while both are backlogged, and a user
+    flooding the queue only delays their own requests.
+    
+    All bookkeeping happens on the event loop thread, so no locks are needed.
+    """
+    
+    def __init__(
+        self,
+        max_concurrency: int,
+        per_user_concurrency: int,
+        max_queued_per_user: int,
+        queue_timeout_seconds: float,
+        weights: Optional[Dict[str, float]] = None,
+        default_weight: float = 1.0,
+    ):
+        self.max_concurrency = max_concurrency
+        self.per_user_concurrency = per_user_concurrency
+        self.max_queued_per_user = max_queued_per_user
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.weights = weights or {}
+        self.default_weight = default_weight
+        self.in_flight = 0
+        self.virtual_time = 0.0
+        self._users: Dict[str, _UserQueue] = {}
+    
+    def weight(self, user_id: str) -> float:
+        return self.weights.get(user_id, self.default_weight)
+    
+    @property
+    def queued(self) -> int:
+        return sum(len(queue.waiters) for queue in self._users.values())
+    
+    def _queue(self, user_id: str) -> _UserQueue:
+        queue = self._users.get(user_id)
+        if queue is None:
+            queue = self._users[user_id] = _UserQueue(self.weight(user_id))
+        return queue
+    
+    def _forget_if_idle(self, user_id: str) -> None:
+        queue = self._users.get(user_id)
+        if queue is not None and not queue.in_flight and not queue.waiters:
+            del self._users[user_id]
+    
+    def _enqueue(self, user_id: str) -> _Waiter:
+        queue = self._queue(user_id)
+        start_tag = max(self.virtual_time, queue.finish_tag)
+        waiter = _Waiter(start_tag, asyncio.get_running_loop().create_future())
+        queue.waiters.append(waiter)
+        self._dispatch()
+        
+        # Only requests left waiting count against the limit, so 0 means no queueing
+        if not waiter.future.done() and len(queue.waiters) > self.max_queued_per_user:
+            queue.waiters.remove(waiter)
+            self._forget_if_idle(user_id)
+            self._publish()
+            metrics.inc("scheduler_rejected_total", reason="queue_full")
+            raise SchedulerRejectedException(user_id, "too many queued requests")
+        
+        queue.finish_tag = start_tag + 1.0 / queue.weight
+        return waiter
+    
+    def _dispatch(self) -> None:
+        while self.in_flight < self.max_concurrency:
+            best: Optional[_UserQueue] = None
+            for queue in self._users.values():
+                while queue.waiters and queue.waiters[0].future.done():
+                    queue.waiters.popleft()
+                if not queue.waiters or queue.in_flight >= self.per_user_concurrency:
+                    continue
+                if best is None or queue.waiters[0].start_tag < best.waiters[0].start_tag:
+                    best = queue
+            if best is None:
+                break
+            
+            waiter = best.waiters.popleft()
+            self.virtual_time = max(self.virtual_time, waiter.start_tag)
+            best.in_flight += 1
+            self.in_flight += 1
+            waiter.future.set_result(None)
+        self._publish()
+    
+    def _release(self, user_id: str) -> None:
+        queue = self._users[user_id]
+        queue.in_flight -= 1
+        self.in_flight -= 1
+        self._dispatch()
+        self._forget_if_idle(user_id)
+    
+    def _abandon(self, user_id: str, waiter: _Waiter) -> None:
+        queue = self._users.get(user_id)
+        if queue is not None and waiter in queue.waiters:
+            queue.waiters.remove(waiter)
+        self._forget_if_idle(user_id)
+        self._publish()
+    
+    def _publish(self) -> None:
+        metrics.set_gauge("scheduler_in_flight", self.in_flight)
+        metrics.set_gauge("scheduler_queued", self.queued)
+    
+    @asynccontextmanager
+    async def slot(self, user_id: str) -> AsyncIterator[None]:
+        """
+        Wait for this user's turn to run a graph and hold the slot until exit.
+        
+        Raises:
+            SchedulerRejectedException: If the user's queue is full or the
+                request waited longer than ``queue_timeout_seconds``
+            DeadlineExceededException: If the request deadline passed first
+        """
+        start = time.perf_counter()
+        timeout = self.queue_timeout_seconds or None
+        left = remaining()
+        deadline_bound = left is not None and (timeout is None or left < timeout)
+        if deadline_bound:
+            timeout = max(left, 0.0)
+        
+        waiter = self._enqueue(user_id)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+        except asyncio.TimeoutError:
+            if not waiter.future.done():
+                waiter.future.cancel()
+                self._abandon(user_id, waiter)
+                if deadline_bound:
+                    metrics.inc("scheduler_rejected_total", reason="deadline")
+                    raise DeadlineExceededException("scheduler queue", timeout)
+                metrics.inc("scheduler_rejected_total", reason="timeout")
+                raise SchedulerRejectedException(user_id, "timed out waiting for a run slot")
+        except BaseException:
+            # Granted just as the caller went away: hand the slot back
+            if waiter.future.done() and not waiter.future.cancelled():
+                self._release(user_id)
+            else:
+                waiter.future.cancel()
+                self._abandon(user_id, waiter)
+            raise
+        
+        # Not labelled by user: one series per user would grow without bound
+        metrics.observe("scheduler_wait_seconds", time.perf_counter() - start)
+        try:
+            yield
+        finally:
+            self._release(user_id)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Export slot usage, per-user queues and the queue wait time summary."""
+        users: List[Dict[str, Any]] = [
+            {
+                "user_id": user_id,
+                "weight": queue.weight,
+                "in_flight": queue.in_flight,
+                "queued": len(queue.waiters),
+            }
+            for user_id, queue in sorted(self._users.items())
+        ]
+        wait_seconds = next(
+            (series["value"] for series in metrics.snapshot()["histograms"].get("scheduler_wait_seconds", [])),
+            {},
+        )
+        return {
+            "max_concurrency": self.max_concurrency,
+            "per_user_concurrency": self.per_user_concurrency,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "users": users,
+            "wait_seconds": wait_seconds,
+        }
+
+
+@lru_cache()
+def get_scheduler() -> FairScheduler:
+    """Get this worker's graph run scheduler, configured from settings."""
+    settings = get_settings()
+    return FairScheduler(
+        max_concurrency=settings.scheduler_max_concurrency,
+        per_user_concurrency=settings.scheduler_per_user_concurrency,
+        max_queued_per_user=settings.scheduler_max_queued_per_user,
+        queue_timeout_seconds=settings.scheduler_queue_timeout_seconds,
+        weights=parse_weights(settings.scheduler_user_weights),
+        default_weight=settings.scheduler_default_weight,
+    )
\ No newline at end of file
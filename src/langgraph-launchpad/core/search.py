@@ -0,0 +1,232 @@
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import structlog
+from sqlalchemy import bindparam, exists, func, insert, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..config.settings import get_settings
+from ..utils.metrics import metrics
+from .checkpoint import get_checkpointer
+from .database import get_engine, get_session_factory
+from .models import ArchivedThread, Thread, ThreadMessage
+from .thread_cache import thread_owner
+
+logger = structlog.get_logger()
+
+# External-content FTS5 table over thread_messages, kept in sync by triggers.
+# Indexed messages are never updated, so no UPDATE trigger is needed.
+SQLITE_SEARCH_SETUP = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS thread_messages_fts USING fts5("
+    "content, content='thread_messages', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS thread_messages_fts_insert AFTER INSERT ON thread_messages BEGIN "
+    "INSERT INTO thread_messages_fts(rowid, content) VALUES (new.id, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS thread_messages_fts_delete AFTER DELETE ON thread_messages BEGIN "
+    "INSERT INTO thread_messages_fts(thread_messages_fts, rowid, content) "
+    "VALUES ('delete', old.id, old.content); END",
+)
+
+POSTGRES_SEARCH_SETUP = (
+    "ALTER TABLE thread_messages ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('{language}'::regconfig, content)) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_thread_messages_search ON thread_messages USING GIN (search_vector)",
+)
+
+SQLITE_SEARCH_SQL = """
+SELECT m.thread_id, m.user_id, m.position, m.role,
+       snippet(thread_messages_fts, 0, '[', ']', '...', 16) AS snippet,
+       -bm25(thread_messages_fts) AS rank
+FROM thread_messages_fts
+JOIN thread_messages m ON m.id = thread_messages_fts.rowid
+WHERE thread_messages_fts MATCH :query {user_filter}
+ORDER BY bm25(thread_messages_fts), m.thread_id, m.position
+LIMIT :limit OFFSET :offset
+"""
+
+POSTGRES_SEARCH_SQL = """
+SELECT m.thread_id, m.user_id, m.position, m.role,
+       ts_headline('{language}', m.content, q, 'StartSel=[, StopSel=], MaxFragments=1, MaxWords=16') AS snippet,
+       ts_rank_cd(m.search_vector, q) AS rank
+FROM thread_messages m, phraseto_tsquery('{language}', :query) AS q
+WHERE m.search_vector @@ q {user_filter}
+ORDER BY rank DESC, m.thread_id, m.position
+LIMIT :limit OFFSET :offset
+"""
+
+
+def setup_search_index() -> None:
+    """Create the backend's full-text index over ``thread_messages`` if missing."""
+    settings = get_settings()
+    statements = SQLITE_SEARCH_SETUP if settings.is_sqlite else POSTGRES_SEARCH_SETUP
+    with get_engine().begin() as conn:
+        for statement in statements:
+            conn.exec_driver_sql(statement.format(language=settings.search_language))
+
+
+def message_text(message: Any) -> str:
+    """Get the searchable text of a message."""
+    content = getattr(message, "content", "")
+    if isinstance(content, str):
+        return content
+    # Multimodal content: keep the text parts
+    return " ".join(
+        part.get("text", "") if isinstance(part, dict) else str(part) for part in content
+    ).strip()
+
+
+def index_thread_messages(thread_id: int, messages: Sequence[Any]) -> int:
+    """
+    Add a thread's messages that are not yet in the search index.
+    
+    ``messages`` is the thread's full conversation as stored in its latest
+    checkpoint; messages are only ever appended, so everything past the
+    highest indexed position is new. Failures are logged rather than
+    raised, since indexing must not fail a chat turn; the next turn or a
+    backfill catches up.
+    
+    Returns:
+        The number of messages indexed
+    """
+    if not get_settings().search_index_enabled or not messages:
+        return 0
+    
+    db = get_session_factory()()
+    try:
+        owner = thread_owner(db, thread_id)
+        if owner is None:
+            return 0
+        
+        indexed = db.execute(
+            select(func.max(ThreadMessage.position)).where(ThreadMessage.thread_id == thread_id)
+        ).scalar()
+        first = 0 if indexed is None else indexed + 1
+        rows = [
+            {
+                "thread_id": thread_id,
+                "user_id": owner,
+                "position": position,
+                "role": getattr(message, "type", "unknown"),
+                "content": content,
+            }
+            for position, message in enumerate(messages[first:], start=first)
+            if (content := message_text(message))
+        ]
+        if rows:
+            db.execute(insert(ThreadMessage), rows)
+            db.commit()
+            metrics.inc("search_messages_indexed_total", len(rows))
+        return len(rows)
+    
+    except IntegrityError:
+        # A concurrent turn on the same thread indexed these positions first
+        db.rollback()
+        return 0
+    except Exception as e:
+        db.rollback()
+        metrics.inc("search_index_errors_total")
+        logger.error("Failed to index thread messages", thread_id=thread_id, error=str(e))
+        return 0
+    finally:
+        db.close()
+
+
+def delete_indexed_messages(conn: Connection, thread_ids: Iterable[int]) -> int:
+    """Remove deleted threads from the search index inside the caller's transaction."""
+    ids = [int(thread_id) for thread_id in thread_ids]
+    if not ids:
+        return 0
+    statement = text("DELETE FROM thread_messages WHERE thread_id IN :thread_ids").bindparams(
+        bindparam("thread_ids", expanding=True)
+    )
+    return conn.execute(statement, {"thread_ids": ids}).rowcount
+
+
+def backfill_search_index(limit: Optional[int] = None, after: int = 0) -> Dict[str, Any]:
+    """
+    Index threads that have no indexed messages yet, from their latest checkpoint.
+    
+    Threads are visited in ID order; pass the returned ``next_after`` back
+    in to continue until it is None. Archived threads are skipped; they
+    are indexed after their next turn rehydrates them.
+    
+    Args:
+        limit: Threads to visit. Defaults to ``search_backfill_batch_size``.
+        after: Only visit threads with a higher ID
+    
+    Returns:
+        Threads visited, messages indexed and the ``next_after`` cursor
+    """
+    limit = limit or get_settings().search_backfill_batch_size
+    with get_engine().connect() as conn:
+        thread_ids = conn.execute(
+            select(Thread.thread_id)
+            .where(Thread.thread_id > after)
+            .where(~exists().where(ThreadMessage.thread_id == Thread.thread_id))
+            .where(~exists().where(ArchivedThread.thread_id == Thread.thread_id))
+            .order_by(Thread.thread_id)
+            .limit(limit)
+        ).scalars().all()
+    
+    saver = get_checkpointer()
+    indexed = 0
+    for thread_id in thread_ids:
+        state = saver.get_tuple({"configurable": {"thread_id": str(thread_id)}})
+        if state is not None:
+            indexed += index_thread_messages(thread_id, state.checkpoint["channel_values"].get("messages", []))
+    
+    logger.info("Backfilled search index", threads=len(thread_ids), messages=indexed)
+    return {
+        "threads": len(thread_ids),
+        "messages": indexed,
+        "next_after": thread_ids[-1] if len(thread_ids) == limit else None,
+    }
+
+
+def _match_query(query: str) -> str:
+    # Search for the text as a phrase; quoting keeps FTS5 operators literal
+    return '"' + query.replace('"', '""') + '"'
+
+
+def search_messages(
+    db: Session,
+    query: str,
+    user_id: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> Dict[str, Any]:
+    """
+    Find indexed messages containing a phrase, best matches first.
+    
+    Args:
+        db: Session to query with
+        query: Phrase to look for
+        user_id: Only search this user's threads
+        limit: Page size
+        offset: Matches to skip
+    
+    Returns:
+        ``results`` (thread, position, role, highlighted snippet and rank
+        of each match) and ``has_more``
+    """
+    settings = get_settings()
+    start = time.perf_counter()
+    
+    sql = SQLITE_SEARCH_SQL if settings.is_sqlite else POSTGRES_SEARCH_SQL
+    statement = text(sql.format(
+        language=settings.search_language,
+        user_filter="AND m.user_id = :user_id" if user_id is not None else "",
+    ))
+    params: Dict[str, Any] = {
+        "query": _match_query(query) if settings.is_sqlite else query,
+        # One extra row tells whether there is another page
+        "limit": limit + 1,
+        "offset": offset,
+    }
+    if user_id is not None:
+        params["user_id"] = user_id
+    
+    rows: List[Dict[str, Any]] = [dict(row) for row in db.execute(statement, params).mappings()]
+    metrics.observe("search_query_seconds", time.perf_counter() - start)
+    return {"results": rows[:limit], "has_more": len(rows) > limit}
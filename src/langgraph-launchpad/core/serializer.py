@@ -0,0 +1,107 @@
+import importlib
+import threading
+from typing import Any, Optional, Tuple
+
+import structlog
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from ..config.settings import get_settings
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = structlog.get_logger()
+
+# Appended to the inner serializer's type tag when the payload is compressed
+ZSTD_SUFFIX = "+zstd"
+
+
+class CompactSerializer:
+    """
+    Checkpoint serializer with optional zstd compression of large payloads.
+    
+    Encoding is delegated to ``JsonPlusSerializer``, which writes msgpack for
+    LangChain messages and plain containers. Payloads of at least
+    ``threshold`` bytes are zstd-compressed and tagged ``<type>+zstd``; the
+    tag is stored in the checkpointer's ``type`` column, so reads of
+    uncompressed and pre-existing checkpoints fall through to the inner
+    serializer unchanged.
+    """
+    
+    def __init__(
+        self,
+        compression: str = "zstd",
+        threshold: int = 1024,
+        level: int = 3,
+        inner: Optional[Any] = None,
+    ):
+        self.inner = inner or JsonPlusSerializer()
+        self.threshold = threshold
+        self.level = level
+        self.compress = compression == "zstd"
+        if self.compress and zstandard is None:
+            logger.warning("zstandard is not installed; checkpoint compression disabled")
+            self.compress = False
+        # zstd contexts are not thread-safe, and the savers run on many threads
+        self._local = threading.local()
+    
+    def _compressor(self) -> Any:
+        if not hasattr(self._local, "compressor"):
+            self._local.compressor = zstandard.ZstdCompressor(level=self.level)
+        return self._local.compressor
+    
+    def _decompressor(self) -> Any:
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read compressed checkpoints")
+        if not hasattr(self._local, "decompressor"):
+            self._local.decompressor = zstandard.ZstdDecompressor()
+        return self._local.decompressor
+    
+    def dumps(self, obj: Any) -> bytes:
+        return self.inner.dumps(obj)
+    
+    def loads(self, data: bytes) -> Any:
+        return self.inner.loads(data)
+    
+    def dumps_typed(self, obj: Any) -> Tuple[str, bytes]:
+        """Serialize ``obj``, compressing the payload when it is large enough."""
+        type_, payload = self.inner.dumps_typed(obj)
+        if self.compress and payload is not None and len(payload) >= self.threshold:
+            compressed = self._compressor().compress(payload)
+            if len(compressed) < len(payload):
+                return type_ + ZSTD_SUFFIX, compressed
+        return type_, payload
+    
+    def loads_typed(self, data: Tuple[str, bytes]) -> Any:
+        """Deserialize a typed payload written by this or the default serializer."""
+        type_, payload = data
+        if type_.endswith(ZSTD_SUFFIX):
+            type_ = type_[: -len(ZSTD_SUFFIX)]
+            payload = self._decompressor().decompress(payload)
+        return self.inner.loads_typed((type_, payload))
+
+
+def create_serializer() -> Any:
+    """
+    Create the checkpoint serializer selected by ``checkpoint_serializer``.
+    
+    Accepts ``compact`` (the default), ``default`` for LangGraph's plain
+    ``JsonPlusSerializer``, or a ``module:Class`` path to a custom
+    serializer implementing ``dumps_typed``/``loads_typed``.
+    """
+    settings = get_settings()
+    name = settings.checkpoint_serializer
+    
+    if name == "compact":
+        return CompactSerializer(
+            compression=settings.checkpoint_compression,
+            threshold=settings.checkpoint_compression_threshold_bytes,
+            level=settings.checkpoint_compression_level,
+        )
+    if name == "default":
+        return JsonPlusSerializer()
+    
+    module_name, _, class_name = name.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
\ No newline at end of file
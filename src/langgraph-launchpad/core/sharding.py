@@ -0,0 +1,162 @@
+import bisect
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Connection, Engine
+
+from ..config.settings import get_settings
+from .database import Base, get_engine, get_read_engine
+from .sqlite import configure_sqlite_connection
+
+T = TypeVar("T")
+
+# Ring positions per shard; more evens out the share of threads each shard gets
+VIRTUAL_NODES = 64
+
+# Tables stored per shard next to the checkpointer's own
+SHARD_TABLES = ("thread_stats",)
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    Consistent hash ring mapping thread IDs to shards.
+    
+    Each shard owns ``virtual_nodes`` points on the ring and a key belongs
+    to the first point at or after its hash. Going from N to N + 1 shards
+    moves about 1 / (N + 1) of the keys, all of them to the new shard.
+    """
+    
+    def __init__(self, shards: int, virtual_nodes: int = VIRTUAL_NODES):
+        self.shards = shards
+        points = sorted(
+            (_hash(f"shard-{shard}#{node}"), shard)
+            for shard in range(shards)
+            for node in range(virtual_nodes)
+        )
+        self._hashes = [point for point, _ in points]
+        self._owners = [shard for _, shard in points]
+    
+    def shard(self, key: Any) -> int:
+        index = bisect.bisect_left(self._hashes, _hash(str(key)))
+        return self._owners[index % len(self._owners)]
+
+
+def shard_path(database_url: str, index: int) -> str:
+    """Get the file of a shard: ``threads.db`` becomes ``threads.shard3.db``."""
+    root, ext = os.path.splitext(database_url.replace("sqlite:///", ""))
+    return f"{root}.shard{index}{ext or '.db'}"
+
+
+@lru_cache()
+def get_shard_ring() -> Optional[HashRing]:
+    """Get the ring of the configured shards, or None when storage is not sharded."""
+    settings = get_settings()
+    return HashRing(settings.sqlite_shards) if settings.sqlite_sharded else None
+
+
+def _create_shard_engine(path: str) -> Engine:
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        echo=get_settings().debug,
+    )
+    event.listen(engine, "connect", configure_sqlite_connection)
+    return engine
+
+
+@lru_cache()
+def get_shard_engines() -> List[Engine]:
+    """Get one engine per shard file (empty when storage is not sharded)."""
+    settings = get_settings()
+    if not settings.sqlite_sharded:
+        return []
+    return [_create_shard_engine(shard_path(settings.database_url, index)) for index in range(settings.sqlite_shards)]
+
+
+def shard_for(thread_id: Any) -> Optional[int]:
+    """Get the shard holding a thread's checkpoints, or None when storage is not sharded."""
+    ring = get_shard_ring()
+    return ring.shard(thread_id) if ring is not None else None
+
+
+def checkpoint_engine(thread_id: Any) -> Engine:
+    """Get the engine of the database holding a thread's checkpoints and stats."""
+    shard = shard_for(thread_id)
+    return get_shard_engines()[shard] if shard is not None else get_engine()
+
+
+def checkpoint_read_engine(thread_id: Any) -> Engine:
+    """Like ``checkpoint_engine``, for queries that only read."""
+    shard = shard_for(thread_id)
+    return get_shard_engines()[shard] if shard is not None else get_read_engine()
+
+
+def checkpoint_engines() -> List[Engine]:
+    """Get every engine holding checkpoints: the shards, or the main database."""
+    return get_shard_engines() or [get_engine()]
+
+
+def shard_groups(thread_ids: Iterable[Any]) -> List[Tuple[Engine, List[Any]]]:
+    """Group thread IDs by the engine holding their checkpoints, keeping their order."""
+    groups: Dict[int, Tuple[Engine, List[Any]]] = {}
+    for thread_id in thread_ids:
+        engine = checkpoint_engine(thread_id)
+        groups.setdefault(id(engine), (engine, []))[1].append(thread_id)
+    return list(groups.values())
+
+
+@contextmanager
+def shard_connection(conn: Connection, engine: Engine) -> Iterator[Connection]:
+    """
+    Get a connection in a transaction on ``engine``, reusing ``conn`` if it is on that engine.
+    
+    A shard's transaction commits when the block exits, before the caller
+    commits ``conn``. If the block raises, neither commits; but if
+    ``conn``'s own commit then fails, the shard's writes stay committed.
+    There is no atomic commit across files.
+    """
+    if conn.engine is engine:
+        yield conn
+        return
+    with engine.begin() as shard_conn:
+        yield shard_conn
+
+
+@lru_cache()
+def _scatter_pool() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=max(get_settings().sqlite_shards, 1), thread_name_prefix="shard-scatter")
+
+
+def scatter(run: Callable[[T], Any], items: List[T]) -> List[Any]:
+    """Run ``run`` on each item (an engine, or a shard's group), in parallel when there are several."""
+    if len(items) <= 1:
+        return [run(item) for item in items]
+    return list(_scatter_pool().map(run, items))
+
+
+def create_shard_tables() -> None:
+    """Create the per-thread tables in every shard file."""
+    tables = [Base.metadata.tables[name] for name in SHARD_TABLES]
+    for engine in get_shard_engines():
+        Base.metadata.create_all(bind=engine, tables=tables)
+
+
+def dispose_shards() -> None:
+    """Close the shards' pooled connections and drop the cached engines."""
+    if get_shard_engines.cache_info().currsize:
+        for engine in get_shard_engines():
+            engine.dispose()
+    if _scatter_pool.cache_info().currsize:
+        _scatter_pool().shutdown(wait=False)
+    _scatter_pool.cache_clear()
+    get_shard_engines.cache_clear()
+    get_shard_ring.cache_clear()
@@ -0,0 +1,75 @@
+import os
+import sqlite3
+from typing import Any, List
+from urllib.parse import quote
+
+from ..config.settings import get_settings
+
+
+def sqlite_pragmas(read_only: bool = False) -> List[str]:
+    """
+    Build the PRAGMA statements of the configured SQLite performance profile.
+    
+    Read-only connections skip the journal mode (it is a property of the
+    database file, set by the writer) and are marked ``query_only``.
+    """
+    settings = get_settings()
+    pragmas = [
+        f"PRAGMA busy_timeout = {int(settings.sqlite_busy_timeout_ms)}",
+        f"PRAGMA synchronous = {settings.sqlite_synchronous}",
+        # A negative cache size is interpreted as KiB rather than pages
+        f"PRAGMA cache_size = -{int(settings.sqlite_cache_size_kib)}",
+        f"PRAGMA mmap_size = {int(settings.sqlite_mmap_size)}",
+        f"PRAGMA temp_store = {settings.sqlite_temp_store}",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only = ON")
+    else:
+        pragmas.insert(1, f"PRAGMA journal_mode = {settings.sqlite_journal_mode}")
+    return pragmas
+
+
+def apply_sqlite_profile(dbapi_connection: Any, read_only: bool = False) -> None:
+    """Apply the SQLite performance profile to a DB-API connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in sqlite_pragmas(read_only=read_only):
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def configure_sqlite_connection(dbapi_connection: Any, connection_record: Any = None) -> None:
+    """SQLAlchemy ``connect`` listener for read-write connections."""
+    apply_sqlite_profile(dbapi_connection)
+
+
+def configure_sqlite_read_connection(dbapi_connection: Any, connection_record: Any = None) -> None:
+    """SQLAlchemy ``connect`` listener for read-only connections."""
+    apply_sqlite_profile(dbapi_connection, read_only=True)
+
+
+def read_only_url(database_url: str) -> str:
+    """Turn a SQLite URL into its read-only URI form for SQLAlchemy."""
+    path = os.path.abspath(database_url.replace("sqlite:///", ""))
+    return f"sqlite:///file:{quote(path)}?mode=ro&uri=true"
+
+
+def connect_sqlite(path: str, read_only: bool = False) -> sqlite3.Connection:
+    """Open a profiled SQLite connection that can be shared across threads."""
+    settings = get_settings()
+    if read_only:
+        conn = sqlite3.connect(
+            f"file:{quote(os.path.abspath(path))}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            timeout=settings.sqlite_busy_timeout_ms / 1000,
+        )
+    else:
+        conn = sqlite3.connect(
+            path,
+            check_same_thread=False,
+            timeout=settings.sqlite_busy_timeout_ms / 1000,
+        )
+    apply_sqlite_profile(conn, read_only=read_only)
+    return conn
@@ -0,0 +1,193 @@
+import heapq
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from .sqlite import connect_sqlite
+
+
+class ReadSplitSqliteSaver(SqliteSaver):
+    """
+    SQLite checkpointer that serves reads from read-only connections.
+    
+    Writes keep going through the single connection (and lock) managed by
+    ``SqliteSaver``. Reads such as ``get_tuple`` and ``list`` borrow one of up
+    to ``read_pool_size`` read-only connections instead, so in WAL mode they
+    run concurrently with each other and with the writer.
+    """
+    
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        path: str,
+        read_pool_size: int,
+        *,
+        serde: Optional[Any] = None,
+    ):
+        super().__init__(conn, serde=serde)
+        self.path = path
+        self.read_pool_size = read_pool_size
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._reader_count = 0
+        self._reader_lock = threading.Lock()
+    
+    def _acquire_reader(self) -> sqlite3.Connection:
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._reader_lock:
+            if self._reader_count < self.read_pool_size:
+                self._reader_count += 1
+                return connect_sqlite(self.path, read_only=True)
+        return self._readers.get()
+    
+    @contextmanager
+    def cursor(self, transaction: bool = True) -> Iterator[sqlite3.Cursor]:
+        """Get a cursor, from a read-only connection when no transaction is needed."""
+        if transaction:
+            with super().cursor(transaction=True) as cur:
+                yield cur
+            return
+        
+        if not self.is_setup:
+            with self.lock:
+                self.setup()
+        
+        conn = self._acquire_reader()
+        cur = conn.cursor()
+        try:
+            yield cur
+        finally:
+            cur.close()
+            self._readers.put(conn)
+    
+    def close(self) -> None:
+        """Close the writer and every idle read-only connection."""
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+        self.conn.close()
+
+
+class ShardedSqliteSaver(BaseCheckpointSaver):
+    """
+    SQLite checkpointer spreading threads over several database files.
+    
+    Every call about one thread goes to the saver of the shard that
+    ``shard_for`` picks for its ID, so runs on threads in different shards
+    write through different connections and file locks instead of queueing
+    on one. Listing without a thread merges the shards' listings, newest
+    checkpoint first.
+    """
+    
+    def __init__(
+        self,
+        savers: List[BaseCheckpointSaver],
+        shard_for: Callable[[Any], int],
+        *,
+        serde: Optional[Any] = None,
+    ):
+        super().__init__(serde=serde or savers[0].serde)
+        self.savers = savers
+        self.shard_for = shard_for
+    
+    def saver_for(self, thread_id: Any) -> BaseCheckpointSaver:
+        return self.savers[self.shard_for(thread_id)]
+    
+    def _routed(self, config: RunnableConfig) -> BaseCheckpointSaver:
+        return self.saver_for(config["configurable"]["thread_id"])
+    
+    @property
+    def config_specs(self) -> list:
+        return self.savers[0].config_specs
+    
+    def setup(self) -> None:
+        for saver in self.savers:
+            saver.setup()
+    
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self._routed(config).get_tuple(config)
+    
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        if config is not None and config.get("configurable", {}).get("thread_id") is not None:
+            yield from self._routed(config).list(config, filter=filter, before=before, limit=limit)
+            return
+        
+        # Each shard lists newest first, so a merge keeps that order across shards
+        merged = heapq.merge(
+            *(saver.list(config, filter=filter, before=before, limit=limit) for saver in self.savers),
+            key=lambda item: item.config["configurable"]["checkpoint_id"],
+            reverse=True,
+        )
+        for count, item in enumerate(merged):
+            if limit is not None and count >= limit:
+                return
+            yield item
+    
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return self._routed(config).put(config, checkpoint, metadata, new_versions)
+    
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        self._routed(config).put_writes(config, writes, task_id, task_path)
+    
+    def get_delta_channel_history(self, *, config: RunnableConfig, channels: Sequence[str]) -> Mapping[str, Any]:
+        return self._routed(config).get_delta_channel_history(config=config, channels=channels)
+    
+    def delete_thread(self, thread_id: str) -> None:
+        self.saver_for(thread_id).delete_thread(thread_id)
+    
+    def prune(self, thread_ids: Sequence[str], *, strategy: str = "keep_latest") -> None:
+        by_shard: Dict[int, List[str]] = {}
+        for thread_id in thread_ids:
+            by_shard.setdefault(self.shard_for(thread_id), []).append(thread_id)
+        for shard, ids in by_shard.items():
+            self.savers[shard].prune(ids, strategy=strategy)
+    
+    def delete_for_runs(self, run_ids: Sequence[str]) -> None:
+        for saver in self.savers:
+            saver.delete_for_runs(run_ids)
+    
+    def get_next_version(self, current: Any, channel: Any) -> Any:
+        return self.savers[0].get_next_version(current, channel)
+    
+    def close(self) -> None:
+        for saver in self.savers:
+            if hasattr(saver, "close"):
+                saver.close()
+            else:
+                saver.conn.close()
@@ -0,0 +1,154 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..config.settings import get_settings
+from ..utils.exceptions import ThreadNotFoundException
+from ..utils.metrics import metrics
+from .models import Thread
+
+# Returned by ThreadCache.get when nothing usable is cached
+MISSING = object()
+
+
+class ThreadCache:
+    """
+    LRU of thread owners with separate TTLs for existing and missing threads.
+    
+    Entries map a thread ID to its ``user_id``, or to ``None`` when the
+    thread was looked up and did not exist. Misses expire sooner than hits,
+    since another worker may create a thread at any time. The cache also
+    remembers when this worker last touched a thread for archival, so hot
+    threads skip that write (see ``core.archive.ensure_thread_hot``).
+    """
+    
+    def __init__(self, max_entries: int, ttl_seconds: float, negative_ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._entries: "OrderedDict[int, Tuple[Optional[str], float]]" = OrderedDict()
+        self._touched: Dict[int, float] = {}
+        self._lock = threading.Lock()
+    
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+    
+    def get(self, thread_id: int) -> object:
+        """Get the cached owner (``None`` if known missing) or ``MISSING``."""
+        if not self.enabled:
+            return MISSING
+        with self._lock:
+            entry = self._entries.get(thread_id)
+            if entry is None:
+                return MISSING
+            if entry[1] <= time.monotonic():
+                del self._entries[thread_id]
+                self._touched.pop(thread_id, None)
+                return MISSING
+            self._entries.move_to_end(thread_id)
+            return entry[0]
+    
+    def set(self, thread_id: int, user_id: Optional[str]) -> None:
+        """Cache a thread's owner, or that it does not exist when ``user_id`` is None."""
+        if not self.enabled:
+            return
+        ttl = self.ttl_seconds if user_id is not None else self.negative_ttl_seconds
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[thread_id] = (user_id, time.monotonic() + ttl)
+            self._entries.move_to_end(thread_id)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._touched.pop(evicted, None)
+    
+    def set_many(self, owners: Iterable[Tuple[int, str]]) -> None:
+        for thread_id, user_id in owners:
+            self.set(thread_id, user_id)
+    
+    def invalidate(self, thread_ids: Iterable[int]) -> None:
+        with self._lock:
+            for thread_id in thread_ids:
+                self._entries.pop(thread_id, None)
+                self._touched.pop(thread_id, None)
+    
+    def touched_recently(self, thread_id: int, within_seconds: float) -> bool:
+        """Whether this worker marked the thread active within the last ``within_seconds``."""
+        with self._lock:
+            touched = self._touched.get(thread_id)
+        return touched is not None and time.monotonic() - touched < within_seconds
+    
+    def mark_touched(self, thread_id: int) -> None:
+        with self._lock:
+            if thread_id in self._entries:
+                self._touched[thread_id] = time.monotonic()
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._touched.clear()
+
+
+@lru_cache()
+def get_thread_cache() -> ThreadCache:
+    """Get this worker's thread cache, configured from settings."""
+    settings = get_settings()
+    return ThreadCache(
+        max_entries=settings.thread_cache_max_entries,
+        ttl_seconds=settings.thread_cache_ttl_seconds,
+        negative_ttl_seconds=settings.thread_cache_negative_ttl_seconds,
+    )
+
+
+def thread_owner(db: Session, thread_id: int) -> Optional[str]:
+    """
+    Get a thread's ``user_id``, or None if it does not exist.
+    
+    The cache is consulted first; on a miss one primary-key lookup runs and
+    its result, including a missing thread, is cached.
+    """
+    cache = get_thread_cache()
+    cached = cache.get(thread_id)
+    if cached is not MISSING:
+        metrics.inc("thread_cache_requests_total", result="hit" if cached is not None else "negative_hit")
+        return cached
+    
+    metrics.inc("thread_cache_requests_total", result="miss")
+    owner = db.execute(select(Thread.user_id).where(Thread.thread_id == thread_id)).scalar()
+    cache.set(thread_id, owner)
+    return owner
+
+
+def require_thread(db: Session, thread_id: int, user_id: Optional[str] = None) -> str:
+    """
+    Check that a thread exists and, if ``user_id`` is given, belongs to that user.
+    
+    Threads owned by someone else are reported as not found so their
+    existence is not revealed.
+    
+    Returns:
+        The thread's owner
+    
+    Raises:
+        ThreadNotFoundException: If the thread is missing or owned by another user
+    """
+    owner = thread_owner(db, thread_id)
+    if owner is None or (user_id is not None and owner != user_id):
+        raise ThreadNotFoundException(thread_id)
+    return owner
+
+
+def forget_threads(thread_ids: Iterable[int]) -> None:
+    """Drop cached entries of deleted threads."""
+    get_thread_cache().invalidate(thread_ids)
+
+
+def remember_threads(owners: List[Tuple[int, str]]) -> None:
+    """Cache newly created threads, replacing any cached 'does not exist'."""
+    get_thread_cache().set_many(owners)
\ No newline at end of file
@@ -0,0 +1,249 @@
+import threading
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import structlog
+from langchain_core.messages import AIMessage, HumanMessage
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..config.settings import get_settings
+from ..utils.metrics import metrics
+from .database import get_engine, get_read_session_factory
+from .jobs import PeriodicJob
+from .models import UsageRollup
+from .thread_cache import thread_owner
+
+logger = structlog.get_logger()
+
+# user_id / day of the rows aggregating all users / all days
+ALL = ""
+
+COUNTERS = (
+    "threads_created",
+    "threads_deleted",
+    "turns",
+    "prompt_tokens",
+    "completion_tokens",
+    "latency_ms_total",
+)
+MAXIMUMS = ("latency_ms_max",)
+
+RollupKey = Tuple[str, str]
+
+
+def today() -> str:
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+def _empty_row() -> Dict[str, float]:
+    return dict.fromkeys(COUNTERS + MAXIMUMS, 0)
+
+
+def _merge(row: Dict[str, float], deltas: Dict[str, float]) -> None:
+    for name, value in deltas.items():
+        if name in MAXIMUMS:
+            row[name] = max(row[name], value)
+        else:
+            row[name] += value
+
+
+class UsageBuffer:
+    """
+    This worker's usage deltas that have not been written to the rollup table yet.
+    
+    Each event updates the four rollup rows it belongs to (user and day,
+    user, day, everything) in memory; ``flush_usage`` writes them in one
+    batched upsert, keeping rollup writes off the request path.
+    """
+    
+    def __init__(self):
+        self._pending: Dict[RollupKey, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._pending)
+    
+    def add(self, user_id: str, day: Optional[str] = None, **deltas: float) -> None:
+        day = day or today()
+        with self._lock:
+            for key in ((user_id, day), (user_id, ALL), (ALL, day), (ALL, ALL)):
+                row = self._pending.get(key)
+                if row is None:
+                    row = self._pending[key] = _empty_row()
+                _merge(row, deltas)
+    
+    def pending(self, key: RollupKey) -> Optional[Dict[str, float]]:
+        with self._lock:
+            row = self._pending.get(key)
+            return dict(row) if row is not None else None
+    
+    def drain(self) -> Dict[RollupKey, Dict[str, float]]:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+    
+    def restore(self, pending: Dict[RollupKey, Dict[str, float]]) -> None:
+        """Put back deltas whose flush failed, merging with newer ones."""
+        with self._lock:
+            for key, deltas in pending.items():
+                row = self._pending.get(key)
+                if row is None:
+                    row = self._pending[key] = _empty_row()
+                _merge(row, deltas)
+
+
+@lru_cache()
+def get_usage_buffer() -> UsageBuffer:
+    """Get this worker's usage buffer."""
+    return UsageBuffer()
+
+
+def _record(user_ids: Iterable[str], **deltas: float) -> None:
+    if not get_settings().usage_rollups_enabled:
+        return
+    buffer = get_usage_buffer()
+    for user_id in user_ids:
+        buffer.add(user_id, **deltas)
+
+
+def record_threads_created(user_ids: Iterable[str]) -> None:
+    _record(user_ids, threads_created=1)
+
+
+def record_threads_deleted(user_ids: Iterable[str]) -> None:
+    _record(user_ids, threads_deleted=1)
+
+
+def record_turn(thread_id: int, messages: Sequence[Any], latency_seconds: float) -> None:
+    """
+    Count a completed chat turn with its model token usage and latency.
+    
+    Tokens are summed from the ``usage_metadata`` of the AI messages added
+    after the turn's question. Failures are logged, never raised.
+    """
+    if not get_settings().usage_rollups_enabled:
+        return
+    try:
+        # Usually answered by the thread cache warmed when the request was checked
+        with get_read_session_factory()() as db:
+            owner = thread_owner(db, thread_id)
+        if owner is None:
+            return
+        
+        prompt_tokens = completion_tokens = 0
+        for message in reversed(messages):
+            if isinstance(message, HumanMessage):
+                break
+            usage = getattr(message, "usage_metadata", None) if isinstance(message, AIMessage) else None
+            if usage:
+                prompt_tokens += usage.get("input_tokens", 0)
+                completion_tokens += usage.get("output_tokens", 0)
+        
+        latency_ms = latency_seconds * 1000
+        get_usage_buffer().add(
+            owner,
+            turns=1,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            latency_ms_total=latency_ms,
+            latency_ms_max=latency_ms,
+        )
+    except Exception as e:
+        logger.error("Failed to record chat turn usage", thread_id=thread_id, error=str(e))
+
+
+def _upsert_statement() -> Any:
+    if get_settings().is_postgresql:
+        from sqlalchemy.dialects.postgresql import insert
+        greatest = func.greatest
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+        greatest = func.max
+    
+    statement = insert(UsageRollup)
+    updates = {name: getattr(UsageRollup, name) + getattr(statement.excluded, name) for name in COUNTERS}
+    updates.update({
+        name: greatest(getattr(UsageRollup, name), getattr(statement.excluded, name)) for name in MAXIMUMS
+    })
+    return statement.on_conflict_do_update(index_elements=["user_id", "day"], set_=updates)
+
+
+def flush_usage() -> int:
+    """
+    Add this worker's buffered usage deltas to the rollup table.
+    
+    All touched rows are upserted in one transaction; if it fails the deltas
+    go back into the buffer for the next flush.
+    
+    Returns:
+        The number of rollup rows written
+    """
+    buffer = get_usage_buffer()
+    pending = buffer.drain()
+    if not pending:
+        return 0
+    
+    rows = [{"user_id": user_id, "day": day, **deltas} for (user_id, day), deltas in pending.items()]
+    try:
+        with get_engine().begin() as conn:
+            conn.execute(_upsert_statement(), rows)
+    except Exception:
+        buffer.restore(pending)
+        raise
+    
+    metrics.inc("usage_rollup_rows_flushed_total", len(rows))
+    return len(rows)
+
+
+def create_usage_flush_job() -> Optional[PeriodicJob]:
+    """Create the job flushing this worker's usage buffer, if rollups are enabled."""
+    settings = get_settings()
+    if not settings.usage_rollups_enabled:
+        return None
+    # Each worker flushes its own buffer, so the job is not exclusive
+    return PeriodicJob("usage-flush", settings.usage_flush_interval_seconds, flush_usage, exclusive=False)
+
+
+def _row_dict(row: Optional[UsageRollup]) -> Dict[str, float]:
+    if row is None:
+        return _empty_row()
+    return {name: getattr(row, name) or 0 for name in COUNTERS + MAXIMUMS}
+
+
+def get_usage(db: Session, user_id: Optional[str] = None, day: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Read one rollup row: a user's or everyone's usage, for a day or all time.
+    
+    A single primary-key lookup, plus this worker's not yet flushed deltas.
+    """
+    key = (user_id or ALL, day.isoformat() if day else ALL)
+    usage = _row_dict(db.get(UsageRollup, key))
+    pending = get_usage_buffer().pending(key)
+    if pending:
+        _merge(usage, pending)
+    return {"user_id": user_id, "day": day, **usage}
+
+
+def daily_usage(db: Session, user_id: Optional[str] = None, days: int = 30) -> List[Dict[str, Any]]:
+    """Read a user's (or everyone's) per-day rollups for the last ``days`` UTC days."""
+    end = datetime.now(timezone.utc).date()
+    start = end - timedelta(days=days - 1)
+    rows = db.execute(
+        select(UsageRollup)
+        .where(UsageRollup.user_id == (user_id or ALL))
+        .where(UsageRollup.day >= start.isoformat(), UsageRollup.day <= end.isoformat())
+        .order_by(UsageRollup.day)
+    ).scalars()
+    by_day = {row.day: _row_dict(row) for row in rows}
+    
+    result = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        usage = by_day.get(day.isoformat(), _empty_row())
+        pending = get_usage_buffer().pending((user_id or ALL, day.isoformat()))
+        if pending:
+            _merge(usage, pending)
+        result.append({"user_id": user_id, "day": day, **usage})
+    return result
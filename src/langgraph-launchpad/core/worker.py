@@ -0,0 +1,85 @@
+import os
+import random
+import signal
+
+import structlog
+
+from ..config.settings import get_settings
+
+logger = structlog.get_logger()
+
+
+def current_rss_bytes() -> int:
+    """Get the resident memory of the current process in bytes (0 if unknown)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    
+    try:
+        import psutil
+    except ImportError:
+        return 0
+    return psutil.Process().memory_info().rss
+
+
+class WorkerRecycler:
+    """Gracefully restart a worker after N requests or above a memory ceiling."""
+    
+    def __init__(
+        self,
+        max_requests: int = 0,
+        jitter: int = 0,
+        memory_limit_mb: int = 0,
+        check_interval: int = 100,
+    ):
+        # Jitter is drawn per worker so the pool does not recycle in lockstep
+        self.max_requests = max_requests + random.randint(0, jitter) if max_requests else 0
+        self.memory_limit_bytes = memory_limit_mb * 1024 * 1024
+        self.check_interval = check_interval
+        self.requests = 0
+        self.recycling = False
+    
+    @classmethod
+    def from_settings(cls) -> "WorkerRecycler":
+        """Create a recycler from the application settings."""
+        settings = get_settings()
+        return cls(
+            max_requests=settings.worker_max_requests,
+            jitter=settings.worker_max_requests_jitter,
+            memory_limit_mb=settings.worker_memory_limit_mb,
+            check_interval=settings.worker_memory_check_interval,
+        )
+    
+    @property
+    def enabled(self) -> bool:
+        """Check if any recycling limit is configured."""
+        return bool(self.max_requests or self.memory_limit_bytes)
+    
+    def request_finished(self) -> None:
+        """Count a finished request and recycle the worker if a limit is hit."""
+        if self.recycling:
+            return
+        
+        self.requests += 1
+        if self.max_requests and self.requests >= self.max_requests:
+            self.recycle("max_requests")
+        elif self.memory_limit_bytes and self.requests % self.check_interval == 0:
+            if current_rss_bytes() > self.memory_limit_bytes:
+                self.recycle("memory_limit")
+    
+    def recycle(self, reason: str) -> None:
+        """Ask the worker to shut down gracefully so the supervisor replaces it."""
+        self.recycling = True
+        logger.info(
+            "Recycling worker",
+            pid=os.getpid(),
+            reason=reason,
+            requests=self.requests,
+            rss_bytes=current_rss_bytes(),
+        )
+        # Uvicorn treats SIGTERM as a graceful shutdown: in-flight requests
+        # finish, the lifespan closes this worker's pools, and the process
+        # supervisor starts a replacement worker.
+        os.kill(os.getpid(), signal.SIGTERM)
@@ -1,53 +1,102 @@
-from typing import AsyncGenerator, List
+import asyncio
+import time
+from typing import Any, AsyncGenerator, Callable, List, Optional, Sequence
 
 import structlog
-from langchain_core.messages import BaseMessage, HumanMessage
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import StateGraph, START, END
 
-from ..core.checkpoint import checkpointer
-from ..utils.exceptions import GraphExecutionException
-from .nodes.example_agent import example_agent, reasoning_agent
+from ..core.broadcast import broadcast_run
+from ..core.checkpoint import get_checkpointer
+from ..core.listing import record_message_counts
+from ..core.search import index_thread_messages
+from ..core.usage import record_turn
+from ..utils.exceptions import GraphExecutionException, GraphNotFoundException
+from .nodes.example_agent import example_agent, merge_branches, reasoning_agent
+from .registry import get_registry
 from .state import GraphState
 
 logger = structlog.get_logger()
 
 
-def create_graph() -> StateGraph:
-    """Create and configure the LangGraph workflow."""
+def add_parallel_branches(
+    builder: StateGraph,
+    source: str,
+    branches: Sequence[str],
+    join: str,
+    select: Optional[Callable[[GraphState], Sequence[str]]] = None,
+) -> None:
+    """
+    Fan out from ``source`` to ``branches`` and fan back in at ``join``.
+    
+    Branches scheduled together run concurrently in one superstep, and
+    ``join`` runs once after all of them, so the wall-clock cost is the
+    slowest branch rather than the sum. Branches must write disjoint keys
+    or state fields with reducers (see ``GraphState.branch_outputs``).
+    
+    Args:
+        builder: The graph under construction
+        source: Node (or ``START``) the branches start after
+        branches: Node names of the branches, already added to ``builder``
+        join: Node that runs after the branches finish
+        select: Optional function choosing which branches run for a state.
+            All branches run when omitted.
+    """
+    if select is None:
+        for branch in branches:
+            builder.add_edge(source, branch)
+    else:
+        builder.add_conditional_edges(source, select, list(branches))
+    
+    for branch in branches:
+        builder.add_edge(branch, join)
+
+
+def create_graph(saver: Optional[BaseCheckpointSaver] = None) -> StateGraph:
+    """
+    Create and configure the LangGraph workflow.
+    
+    Args:
+        saver: Checkpointer to compile the graph with. Defaults to the
+            application checkpointer.
+    """
     builder = StateGraph(GraphState)
     
     # Add nodes
     builder.add_node("example_agent", example_agent)
     builder.add_node("reasoning_agent", reasoning_agent)
+    builder.add_node("merge_branches", merge_branches)
     
-    # Add edges
-    builder.add_edge(START, "example_agent")
-    
-    # Conditional edge: only add reasoning if requested
-    def should_add_reasoning(state: GraphState) -> str:
+    # Reasoning, when requested, runs alongside the answer instead of after it
+    def select_branches(state: GraphState) -> List[str]:
         if state.get("reasoning", False):
-            return "reasoning_agent"
-        return END
-    
-    builder.add_conditional_edges(
-        "example_agent",
-        should_add_reasoning,
-        {
-            "reasoning_agent": "reasoning_agent",
-            END: END
-        }
-    )
+            return ["example_agent", "reasoning_agent"]
+        return ["example_agent"]
     
-    builder.add_edge("reasoning_agent", END)
+    add_parallel_branches(
+        builder,
+        START,
+        ["example_agent", "reasoning_agent"],
+        join="merge_branches",
+        select=select_branches,
+    )
+    builder.add_edge("merge_branches", END)
     
-    return builder.compile(checkpointer=checkpointer)
+    return builder.compile(checkpointer=saver if saver is not None else get_checkpointer())
 
 
-# Create the global graph instance
-graph = create_graph()
+def get_graph(name: Optional[str] = None) -> Any:
+    """Get the active version of a registered graph, compiling it on first use."""
+    return get_registry().get(name).graph()
 
 
-def call_chatbot(question: str, thread_id: int, reasoning: bool = False) -> str:
+def call_chatbot(
+    question: str,
+    thread_id: int,
+    reasoning: bool = False,
+    graph: Optional[str] = None,
+) -> str:
     """
     Synchronous function to call the chatbot and get a response.
     
@@ -55,34 +104,42 @@ def call_chatbot(question: str, thread_id: int, reasoning: bool = False) -> str:
         question: The user's question
         thread_id: The thread ID for conversation context
         reasoning: Whether to include reasoning in the response
+        graph: Registered graph to run. Defaults to the ``default_graph``.
     
     Returns:
         The AI response content
     """
     try:
-        logger.info("Calling chatbot", thread_id=thread_id, reasoning=reasoning)
+        logger.info("Calling chatbot", thread_id=thread_id, reasoning=reasoning, graph=graph)
         
         config = {"configurable": {"thread_id": str(thread_id)}}
+        start = time.perf_counter()
         
-        response = graph.invoke(
-            {
-                "messages": [HumanMessage(content=question, name="user")],
-                "user_question": question,
-                "reasoning": reasoning,
-                "current_step": "start",
-                "metadata": {},
-            },
-            config=config,
-        )
+        with get_registry().lease(graph) as version:
+            response = version.graph().invoke(
+                {
+                    "messages": [HumanMessage(content=question, name="user")],
+                    "user_question": question,
+                    "reasoning": reasoning,
+                    "current_step": "start",
+                    "metadata": {},
+                },
+                config=config,
+            )
         
         # Extract the last AI message
         messages = response.get("messages", [])
+        record_turn(thread_id, messages, time.perf_counter() - start)
+        index_thread_messages(thread_id, messages)
+        record_message_counts({thread_id: len(messages)})
         if messages:
             last_message = messages[-1]
             return getattr(last_message, "content", "No response generated")
         
         return "No response generated"
     
+    except GraphNotFoundException:
+        raise
     except Exception as e:
         logger.error("Chatbot call failed", error=str(e), thread_id=thread_id)
         raise GraphExecutionException(
@@ -94,7 +151,8 @@ def call_chatbot(question: str, thread_id: int, reasoning: bool = False) -> str:
 async def stream_chatbot(
     question: str, 
     thread_id: int, 
-    reasoning: bool = False
+    reasoning: bool = False,
+    graph: Optional[str] = None,
 ) -> AsyncGenerator[str, None]:
     """
     Asynchronous function to stream chatbot responses.
@@ -103,37 +161,69 @@ async def stream_chatbot(
         question: The user's question
         thread_id: The thread ID for conversation context
         reasoning: Whether to include reasoning in the response
+        graph: Registered graph to run. Defaults to the ``default_graph``.
     
     Yields:
         Chunks of the AI response
     """
     try:
-        logger.info("Starting chatbot streaming", thread_id=thread_id, reasoning=reasoning)
+        logger.info("Starting chatbot streaming", thread_id=thread_id, reasoning=reasoning, graph=graph)
         
         config = {"configurable": {"thread_id": str(thread_id)}}
+        start = time.perf_counter()
         
-        # Stream the graph execution
-        async for chunk in graph.astream(
-            {
-                "messages": [HumanMessage(content=question, name="user")],
-                "user_question": question,
-                "reasoning": reasoning,
-                "current_step": "start",
-                "metadata": {},
-            },
-            config=config,
-        ):
-            # Extract content from the chunk
-            if "messages" in chunk:
-                messages = chunk["messages"]
-                if messages:
-                    last_message = messages[-1]
-                    content = getattr(last_message, "content", "")
-                    if content:
-                        # For streaming, we might want to yield the content in smaller chunks
-                        # This is a simple implementation - you can make it more sophisticated
-                        yield content
+        # Stream the graph execution; the lease keeps this run on its version.
+        # Replies also go to the thread's other subscribers (GET /threads/{id}/events).
+        async with broadcast_run(thread_id, question) as broadcast:
+            with get_registry().lease(graph) as version:
+                seen = None
+                async for chunk in version.graph().astream(
+                    {
+                        "messages": [HumanMessage(content=question, name="user")],
+                        "user_question": question,
+                        "reasoning": reasoning,
+                        "current_step": "start",
+                        "metadata": {},
+                    },
+                    config=config,
+                    stream_mode="values",
+                ):
+                    # Each chunk holds the whole history; only yield replies added since the last one
+                    messages = chunk.get("messages", [])
+                    if seen is None:
+                        seen = len(messages)
+                        continue
+                    for message in messages[seen:]:
+                        if isinstance(message, AIMessage) and message.content:
+                            broadcast(message.content)
+                            yield message.content
+                    seen = len(messages)
+        
+        if seen is not None:
+            await asyncio.to_thread(record_turn, thread_id, messages, time.perf_counter() - start)
+            await asyncio.to_thread(index_thread_messages, thread_id, messages)
+            await asyncio.to_thread(record_message_counts, {thread_id: len(messages)})
     
+    except GraphNotFoundException:
+        raise
     except Exception as e:
         logger.error("Chatbot streaming failed", error=str(e), thread_id=thread_id)
-        raise Graph
\ No newline at end of file
+        raise GraphExecutionException(
+            message=f"Failed to stream message in thread {thread_id}",
+            original_error=e
+        )
+
+
+def get_thread_messages(thread_id: int) -> List[BaseMessage]:
+    """
+    Get the conversation messages stored for a thread.
+    
+    Args:
+        thread_id: The thread ID to read the latest state for
+    
+    Returns:
+        The list of messages in the thread's latest checkpoint
+    """
+    config = {"configurable": {"thread_id": str(thread_id)}}
+    state = get_graph().get_state(config)
+    return list(state.values.get("messages", []))
\ No newline at end of file
@@ -0,0 +1,287 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, Optional, Tuple, TypeVar
+
+import structlog
+
+from ..config.settings import get_settings
+from ..core.deadline import remaining, time_budget
+from ..utils.metrics import metrics
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+# A model call: receives its timeout in seconds (None for none) and an event
+# set when its result is no longer wanted, so it can stop early if it is able to
+ModelCall = Callable[[Optional[float], threading.Event], T]
+
+
+class ModelCallCancelled(Exception):
+    """Raised by a model call that stopped because another attempt won."""
+
+
+class TransientModelError(Exception):
+    """A model call failure worth retrying, e.g. from the simulated model."""
+
+
+@lru_cache()
+def retryable_errors() -> Tuple[type, ...]:
+    """Exception types that mark a model call as safe to retry."""
+    errors: Tuple[type, ...] = (TransientModelError, TimeoutError, ConnectionError)
+    try:
+        import openai
+    except ImportError:
+        return errors
+    return errors + (
+        openai.APIConnectionError,  # includes APITimeoutError
+        openai.RateLimitError,
+        openai.InternalServerError,
+    )
+
+
+@lru_cache()
+def timeout_errors() -> Tuple[type, ...]:
+    """Exception types that mean a model call ran out of time."""
+    try:
+        import openai
+    except ImportError:
+        return (TimeoutError,)
+    return (TimeoutError, openai.APITimeoutError)
+
+
+class LatencyTracker:
+    """Rolling window of recent call latencies per stage, for hedge delays."""
+    
+    def __init__(self, window: int = 512):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+    
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.window)
+            samples.append(seconds)
+    
+    def percentile(self, stage: str, pct: float, min_samples: int) -> Optional[float]:
+        """The ``pct`` latency percentile of a stage, or None with fewer than ``min_samples``."""
+        with self._lock:
+            samples = sorted(self._samples.get(stage, ()))
+        if not samples or len(samples) < min_samples:
+            return None
+        index = min(len(samples) - 1, int(round(pct / 100.0 * (len(samples) - 1))))
+        return samples[index]
+
+
+class ResilientModelCaller:
+    """
+    Retries and hedging around model calls to cut tail latency.
+    
+    Retryable failures (see ``retryable_errors``) are retried up to
+    ``max_attempts`` times with full-jitter exponential backoff, never
+    sleeping past the request deadline. With hedging on, once an attempt
+    has run longer than the ``hedge_percentile`` latency of its stage a
+    duplicate is sent; the first successful result wins and the other is
+    told to stop through its cancel event. Blocking HTTP clients cannot be
+    interrupted, so a losing request finishes in the background and its
+    result is discarded.
+    """
+    
+    def __init__(
+        self,
+        timeout_seconds: float = 0,
+        max_attempts: int = 1,
+        backoff_seconds: float = 0.2,
+        backoff_max_seconds: float = 5.0,
+        hedge_percentile: float = 0,
+        hedge_min_samples: int = 20,
+        max_workers: int = 32,
+    ):
+        self.timeout_seconds = timeout_seconds
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.latencies = LatencyTracker()
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+    
+    def _submit(self, *args: Any) -> Future:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(self._max_workers, thread_name_prefix="model-call")
+        return self._executor.submit(*args)
+    
+    def close(self) -> None:
+        """Stop the hedging threads; attempts still running finish in the background."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def hedge_delay(self, stage: str) -> Optional[float]:
+        """How long to wait for an attempt before hedging it, or None to not hedge."""
+        if not self.hedge_percentile:
+            return None
+        return self.latencies.percentile(stage, self.hedge_percentile, self.hedge_min_samples)
+    
+    def call(self, call: ModelCall[T], stage: str) -> T:
+        """
+        Run a model call with retries and hedging.
+        
+        Args:
+            call: Function performing one attempt
+            stage: Label for metrics and latency tracking, e.g. the node name
+        
+        Raises:
+            DeadlineExceededException: If the request deadline has passed
+        """
+        attempt = 1
+        while True:
+            try:
+                result = self._hedged(call, stage)
+                metrics.inc("llm_requests_total", stage=stage, outcome="ok")
+                return result
+            except Exception as e:
+                if attempt >= self.max_attempts or not isinstance(e, retryable_errors()):
+                    metrics.inc("llm_requests_total", stage=stage, outcome="error")
+                    raise
+                
+                delay = random.uniform(0, min(self.backoff_max_seconds, self.backoff_seconds * 2 ** (attempt - 1)))
+                left = remaining()
+                if left is not None and left <= delay:
+                    metrics.inc("llm_requests_total", stage=stage, outcome="error")
+                    raise
+                
+                metrics.inc("llm_retries_total", stage=stage, error=type(e).__name__)
+                logger.debug("Retrying model call", stage=stage, attempt=attempt, error=str(e), delay_seconds=delay)
+                time.sleep(delay)
+                attempt += 1
+    
+    def _attempt(self, call: ModelCall[T], stage: str, cancelled: threading.Event) -> T:
+        timeout = time_budget(self.timeout_seconds, stage=stage)
+        start = time.perf_counter()
+        result = call(timeout, cancelled)
+        elapsed = time.perf_counter() - start
+        self.latencies.record(stage, elapsed)
+        metrics.observe("llm_call_seconds", elapsed, stage=stage)
+        return result
+    
+    def _hedged(self, call: ModelCall[T], stage: str) -> T:
+        delay = self.hedge_delay(stage)
+        left = remaining()
+        if delay is None or (left is not None and delay >= left):
+            return self._attempt(call, stage, threading.Event())
+        
+        cancels = (threading.Event(), threading.Event())
+        primary = self._submit(copy_context().run, self._attempt, call, stage, cancels[0])
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+        
+        metrics.inc("llm_hedges_total", stage=stage, result="fired")
+        hedge = self._submit(copy_context().run, self._attempt, call, stage, cancels[1])
+        attempts = (primary, hedge)
+        pending = set(attempts)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    continue
+                winner = "hedge" if future is hedge else "primary"
+                metrics.inc("llm_hedges_total", stage=stage, result=f"{winner}_won")
+                for other, cancel in zip(attempts, cancels):
+                    if other is not future:
+                        cancel.set()
+                        other.cancel()
+                return future.result()
+        
+        # Both attempts failed; surface the primary's error to the retry loop
+        metrics.inc("llm_hedges_total", stage=stage, result="failed")
+        return primary.result()
+
+
+class SimulatedChatModel:
+    """
+    Stand-in model used without an API key: canned replies after a simulated latency.
+    
+    A ``slow_ratio`` fraction of calls take ``slow_factor`` times longer and
+    an ``error_ratio`` fraction fail with ``TransientModelError``, to
+    reproduce the tail latency and flakiness of a real provider.
+    """
+    
+    def __init__(
+        self,
+        latency_seconds: float = 0.0,
+        slow_ratio: float = 0.0,
+        slow_factor: float = 10.0,
+        error_ratio: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.latency_seconds = latency_seconds
+        self.slow_ratio = slow_ratio
+        self.slow_factor = slow_factor
+        self.error_ratio = error_ratio
+        self._random = random.Random(seed)
+    
+    def call(self, reply: str) -> ModelCall[str]:
+        """Build a model call that returns ``reply``."""
+        def attempt(timeout: Optional[float], cancelled: threading.Event) -> str:
+            latency = self.latency_seconds
+            if self._random.random() < self.slow_ratio:
+                latency *= self.slow_factor
+            if self._random.random() < self.error_ratio:
+                raise TransientModelError("Simulated model error")
+            
+            if timeout is not None and latency > timeout:
+                cancelled.wait(timeout)
+                raise TimeoutError(f"Simulated model call timed out after {timeout:.2f}s")
+            if latency and cancelled.wait(latency):
+                raise ModelCallCancelled()
+            return reply
+        
+        return attempt
+
+
+@lru_cache()
+def get_model_caller() -> ResilientModelCaller:
+    """Get this worker's model caller, configured from settings."""
+    settings = get_settings()
+    return ResilientModelCaller(
+        timeout_seconds=settings.llm_timeout_seconds,
+        max_attempts=settings.llm_max_attempts,
+        backoff_seconds=settings.llm_retry_backoff_seconds,
+        backoff_max_seconds=settings.llm_retry_backoff_max_seconds,
+        hedge_percentile=settings.llm_hedge_percentile,
+        hedge_min_samples=settings.llm_hedge_min_samples,
+        # Each run has up to two branches, each with an attempt and a hedge
+        max_workers=4 * settings.scheduler_max_concurrency,
+    )
+
+
+def close_model_caller() -> None:
+    """Shut down the model caller's threads and drop the cached instance."""
+    if get_model_caller.cache_info().currsize:
+        get_model_caller().close()
+    get_model_caller.cache_clear()
+
+
+@lru_cache()
+def get_simulated_model() -> SimulatedChatModel:
+    """Get the simulated model configured by the ``offline_response_*`` settings."""
+    settings = get_settings()
+    return SimulatedChatModel(
+        latency_seconds=settings.offline_response_latency_ms / 1000,
+        slow_ratio=settings.offline_response_slow_ratio,
+        error_ratio=settings.offline_response_error_ratio,
+    )
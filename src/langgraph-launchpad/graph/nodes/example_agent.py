@@ -1,19 +1,80 @@
+from functools import lru_cache
+from typing import Any, Dict, List
+
 import structlog
 from langchain_core.messages import AIMessage, HumanMessage
-from langchain_openai import ChatOpenAI
 
 from ...config.settings import get_settings
+from ...core.deadline import with_time_budget
+from ...utils.exceptions import DeadlineExceededException
+from ..llm import get_model_caller, get_simulated_model, timeout_errors
 from ..state import GraphState
 
 logger = structlog.get_logger()
-settings = get_settings()
 
 
+@lru_cache()
+def get_chat_model(api_key: str):
+    """Create the chat model client on first use and reuse it across calls."""
+    from langchain_openai import ChatOpenAI
+    
+    return ChatOpenAI(
+        model="gpt-3.5-turbo",
+        api_key=api_key,
+        temperature=0.7
+    )
+
+
+def invoke_model(llm: Any, messages: List[Dict[str, str]], stage: str) -> AIMessage:
+    """
+    Call the chat model with retries, hedging and ``llm_timeout_seconds``.
+    
+    Returns the model's whole reply, so its ``usage_metadata`` (token
+    counts) reaches the usage rollups.
+    
+    Raises:
+        DeadlineExceededException: If no time is left or the last attempt timed out
+    """
+    try:
+        return get_model_caller().call(
+            lambda timeout, cancelled: llm.invoke(messages, timeout=timeout),
+            stage=stage,
+        )
+    except timeout_errors():
+        raise DeadlineExceededException(stage, get_settings().llm_timeout_seconds) from None
+
+
+def offline_reply(reply: str, stage: str) -> str:
+    """
+    Return a canned reply through the simulated model, used without an API key.
+    
+    Raises:
+        DeadlineExceededException: If no time is left or the last attempt timed out
+    """
+    try:
+        return get_model_caller().call(get_simulated_model().call(reply), stage=stage)
+    except TimeoutError:
+        raise DeadlineExceededException(stage, get_settings().llm_timeout_seconds) from None
+
+
+def _answer_timed_out(state: GraphState, error: DeadlineExceededException) -> dict:
+    # Degraded answer in the shape of the offline echo, so clients still get a reply
+    content = f"Echo: {state['user_question']} (The model did not respond in time)"
+    return {"branch_outputs": {"answer": AIMessage(content=content)}}
+
+
+def _reasoning_timed_out(state: GraphState, error: DeadlineExceededException) -> dict:
+    return {"branch_outputs": {"reasoning": None}}
+
+
+@with_time_budget("example_agent", fallback=_answer_timed_out)
 def example_agent(state: GraphState) -> dict:
     """
     Example agent node that processes user messages.
     
-    Replace this with your own agent implementation.
+    Replace this with your own agent implementation. The answer is written
+    to ``branch_outputs`` so it can run alongside other branches;
+    ``merge_branches`` appends it to the conversation.
     """
     try:
         logger.info("Example agent processing message")
@@ -23,12 +84,9 @@ def example_agent(state: GraphState) -> dict:
         reasoning = state.get("reasoning", False)
         
         # Initialize the language model
+        settings = get_settings()
         if settings.openai_api_key:
-            llm = ChatOpenAI(
-                model="gpt-3.5-turbo",
-                api_key=settings.openai_api_key,
-                temperature=0.7
-            )
+            llm = get_chat_model(settings.openai_api_key)
             
             # Create a system prompt
             system_prompt = "You are a helpful AI assistant."
@@ -47,65 +105,93 @@ def example_agent(state: GraphState) -> dict:
                 elif isinstance(msg, AIMessage):
                     llm_messages.append({"role": "assistant", "content": msg.content})
             
-            # Get response from LLM
-            response = llm.invoke(llm_messages)
-            response_content = response.content
-            
+            # Get response from LLM, keeping its token usage for the rollups
+            response = invoke_model(llm, llm_messages, stage="example_agent")
+            answer = AIMessage(content=response.content, usage_metadata=response.usage_metadata)
+        
         else:
             # Fallback response when no API key is provided
-            response_content = f"Echo: {user_question} (No OpenAI API key configured)"
+            answer = AIMessage(content=offline_reply(
+                f"Echo: {user_question} (No OpenAI API key configured)", stage="example_agent"
+            ))
         
         logger.info("Example agent completed processing")
         
-        return {
-            "messages": messages + [AIMessage(content=response_content)],
-            "current_step": "example_agent_completed",
-        }
+        return {"branch_outputs": {"answer": answer}}
     
+    except DeadlineExceededException:
+        raise
     except Exception as e:
         logger.error("Example agent failed", error=str(e))
         error_response = f"I encountered an error while processing your request: {str(e)}"
         
-        return {
-            "messages": messages + [AIMessage(content=error_response)],
-            "current_step": "example_agent_error",
-        }
+        return {"branch_outputs": {"answer": AIMessage(content=error_response)}}
 
 
+@with_time_budget("reasoning_agent", fallback=_reasoning_timed_out)
 def reasoning_agent(state: GraphState) -> dict:
     """
-    Example reasoning agent that provides detailed explanations.
+    Example reasoning agent that explains how the question should be answered.
+    
+    It works from the user's question rather than the final answer, so it
+    runs in parallel with ``example_agent``.
     """
     try:
         logger.info("Reasoning agent processing")
         
-        messages = state["messages"]
-        last_message = messages[-1] if messages else None
-        
-        if not last_message or not isinstance(last_message, AIMessage):
-            return {
-                "messages": messages,
-                "current_step": "reasoning_skipped",
-            }
-        
-        reasoning_prompt = f"""
-        Please provide reasoning for this response: "{last_message.content}"
+        user_question = state["user_question"]
         
-        Explain your thought process and why you chose this particular response.
-        """
+        settings = get_settings()
+        if settings.openai_api_key:
+            reasoning_prompt = (
+                f'Explain step by step how you would approach answering: "{user_question}". '
+                "Describe your thought process, not the final answer."
+            )
+            llm = get_chat_model(settings.openai_api_key)
+            response = invoke_model(
+                llm, [{"role": "user", "content": reasoning_prompt}], stage="reasoning_agent"
+            )
+            reasoning_response, usage = response.content, response.usage_metadata
         
-        reasoning_response = "Here's my reasoning: I provided a helpful response based on the user's question, taking into account the context and trying to be as accurate and useful as possible."
+        else:
+            reasoning_response = offline_reply(
+                "Here's my reasoning: I provided a helpful response based on the user's question, taking into account the context and trying to be as accurate and useful as possible.",
+                stage="reasoning_agent",
+            )
+            usage = None
         
         logger.info("Reasoning agent completed")
         
-        return {
-            "messages": messages + [AIMessage(content=f"Reasoning: {reasoning_response}")],
-            "current_step": "reasoning_completed",
-        }
+        reasoning = AIMessage(content=f"Reasoning: {reasoning_response}", usage_metadata=usage)
+        return {"branch_outputs": {"reasoning": reasoning}}
     
+    except DeadlineExceededException:
+        raise
     except Exception as e:
         logger.error("Reasoning agent failed", error=str(e))
-        return {
-            "messages": messages,
-            "current_step": "reasoning_error",
-        }
\ No newline at end of file
+        return {"branch_outputs": {"reasoning": None}}
+
+
+# Order in which branch outputs are appended to the conversation
+BRANCH_ORDER = ("answer", "reasoning")
+
+
+def merge_branches(state: GraphState) -> dict:
+    """
+    Join node that appends the outputs of parallel branches in a fixed order.
+    """
+    outputs = state.get("branch_outputs") or {}
+    new_messages = [outputs[key] for key in BRANCH_ORDER if outputs.get(key) is not None]
+    
+    if outputs.get("reasoning") is not None:
+        current_step = "reasoning_completed"
+    elif "reasoning" in outputs:
+        current_step = "reasoning_error"
+    else:
+        current_step = "example_agent_completed"
+    
+    return {
+        "messages": new_messages,
+        "current_step": current_step,
+        "branch_outputs": None,
+    }
@@ -0,0 +1,272 @@
+import importlib
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+import structlog
+
+from ..config.settings import get_settings
+from ..core.checkpoint import get_checkpointer
+from ..utils.exceptions import GraphNotFoundException
+from ..utils.metrics import metrics
+
+logger = structlog.get_logger()
+
+# Factories take the checkpointer and return a compiled graph
+GraphFactory = Callable[[Any], Any]
+
+# Only this package's own modules may be re-imported at runtime
+PACKAGE = __name__.split(".")[0]
+
+
+def load_factory(spec: str) -> GraphFactory:
+    """Resolve a ``module:function`` graph factory path."""
+    module_name, _, attribute = spec.partition(":")
+    if not attribute:
+        raise ValueError(f"Graph factory must be 'module:function', got {spec!r}")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def parse_graph_factories(value: str) -> Dict[str, str]:
+    """Parse the ``name=module:function`` pairs of the ``graph_factories`` setting."""
+    factories = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        name, _, spec = item.partition("=")
+        if not spec:
+            raise ValueError(f"Graph factory entry must be 'name=module:function', got {item!r}")
+        factories[name.strip()] = spec.strip()
+    return factories
+
+
+def check_reload_allowed(spec: str, modules: Sequence[str]) -> None:
+    """
+    Reject a reload that would import code an operator did not configure.
+    
+    The factory must be one listed in ``graph_factories`` and reloaded
+    modules must belong to this package, so a reload request can only
+    re-run code that is already deployed.
+    
+    Raises:
+        ValueError: If the factory or a module is not allowed
+    """
+    if spec not in parse_graph_factories(get_settings().graph_factories).values():
+        raise ValueError(f"Graph factory {spec!r} is not listed in graph_factories")
+    for module_name in modules:
+        if module_name != PACKAGE and not module_name.startswith(f"{PACKAGE}."):
+            raise ValueError(f"Only {PACKAGE} modules can be reloaded, got {module_name!r}")
+
+
+class GraphVersion:
+    """One registered version of a named graph, compiled on first use."""
+    
+    def __init__(self, name: str, version: int, factory: GraphFactory, spec: Optional[str] = None):
+        self.name = name
+        self.version = version
+        self.factory = factory
+        self.spec = spec
+        self.registered_at = time.time()
+        self.active = False
+        self.in_flight = 0
+        self._compiled: Any = None
+        self._lock = threading.Lock()
+    
+    @property
+    def compiled(self) -> bool:
+        return self._compiled is not None
+    
+    def graph(self) -> Any:
+        """Get the compiled graph, compiling it on first use."""
+        if self._compiled is None:
+            with self._lock:
+                if self._compiled is None:
+                    start = time.perf_counter()
+                    self._compiled = self.factory(get_checkpointer())
+                    elapsed = time.perf_counter() - start
+                    metrics.observe("graph_compile_seconds", elapsed, graph=self.name)
+                    logger.info("Graph compiled", graph=self.name, version=self.version, seconds=elapsed)
+        return self._compiled
+    
+    def release(self) -> None:
+        """Drop the compiled graph; it is recompiled if this version is used again."""
+        with self._lock:
+            self._compiled = None
+    
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "version": self.version,
+            "factory": self.spec,
+            "active": self.active,
+            "compiled": self.compiled,
+            "in_flight": self.in_flight,
+            "registered_at": self.registered_at,
+        }
+
+
+class GraphRegistry:
+    """
+    Named, versioned graphs with an atomically switchable active version.
+    
+    Runs lease the active version for their whole duration, so activating a
+    new version only affects runs that start afterwards. Superseded versions
+    drop their compiled graph once their last run finishes, but stay
+    registered so they can be reactivated.
+    """
+    
+    def __init__(self, default: str = "default"):
+        self.default = default
+        self._lock = threading.Lock()
+        self._versions: Dict[str, Dict[int, GraphVersion]] = {}
+        self._active: Dict[str, GraphVersion] = {}
+    
+    def names(self) -> List[str]:
+        with self._lock:
+            return sorted(self._versions)
+    
+    def register(
+        self,
+        name: str,
+        factory: GraphFactory,
+        spec: Optional[str] = None,
+        activate: bool = True,
+    ) -> GraphVersion:
+        """Register a new version of ``name``, activating it unless told otherwise."""
+        with self._lock:
+            versions = self._versions.setdefault(name, {})
+            entry = GraphVersion(name, max(versions, default=0) + 1, factory, spec)
+            versions[entry.version] = entry
+        
+        logger.info("Graph registered", graph=name, version=entry.version, factory=spec)
+        if activate or name not in self._active:
+            self.activate(name, entry.version)
+        return entry
+    
+    def get(self, name: Optional[str] = None, version: Optional[int] = None) -> GraphVersion:
+        """Get the active version of a graph, or a specific one."""
+        name = name or self.default
+        with self._lock:
+            if version is not None:
+                entry = self._versions.get(name, {}).get(version)
+            else:
+                entry = self._active.get(name)
+        if entry is None:
+            raise GraphNotFoundException(name, version)
+        return entry
+    
+    def activate(self, name: str, version: int) -> GraphVersion:
+        """Atomically make ``version`` the one new runs of ``name`` use."""
+        with self._lock:
+            entry = self._versions.get(name, {}).get(version)
+            if entry is None:
+                raise GraphNotFoundException(name, version)
+            previous = self._active.get(name)
+            drained = False
+            self._active[name] = entry
+            entry.active = True
+            if previous is not None and previous is not entry:
+                previous.active = False
+                drained = previous.in_flight == 0
+        
+        if previous is not None and previous is not entry:
+            if drained:
+                previous.release()
+            logger.info(
+                "Graph activated",
+                graph=name,
+                version=version,
+                previous=previous.version,
+                previous_in_flight=previous.in_flight,
+            )
+        return entry
+    
+    def reload(
+        self,
+        name: str,
+        spec: Optional[str] = None,
+        modules: Sequence[str] = (),
+        activate: bool = True,
+    ) -> GraphVersion:
+        """
+        Re-import a graph factory and register it as a new version.
+        
+        The new version is compiled before it is activated, so a broken
+        factory fails here instead of in the next request.
+        
+        Args:
+            name: The graph to reload
+            spec: ``module:function`` factory path, one of those in
+                ``graph_factories``. Defaults to the factory path of the
+                currently active version.
+            modules: Modules of this package to ``importlib.reload`` first,
+                in order, e.g. node modules the factory imports from
+            activate: Whether to switch new runs to the new version
+        
+        Raises:
+            ValueError: If the factory or a module is not allowed (see
+                ``check_reload_allowed``) or the factory cannot be loaded
+        """
+        spec = spec or self.get(name).spec
+        if spec is None:
+            raise ValueError(f"Graph {name!r} was registered without a factory path")
+        check_reload_allowed(spec, modules)
+        
+        for module_name in modules:
+            importlib.reload(importlib.import_module(module_name))
+        module_name = spec.partition(":")[0]
+        importlib.reload(importlib.import_module(module_name))
+        factory = load_factory(spec)
+        
+        entry = GraphVersion(name, 0, factory, spec)
+        entry.graph()
+        with self._lock:
+            versions = self._versions.setdefault(name, {})
+            entry.version = max(versions, default=0) + 1
+            versions[entry.version] = entry
+        logger.info("Graph reloaded", graph=name, version=entry.version, factory=spec)
+        
+        if activate:
+            self.activate(name, entry.version)
+        return entry
+    
+    @contextmanager
+    def lease(self, name: Optional[str] = None) -> Iterator[GraphVersion]:
+        """Pin the active version of a graph for the duration of one run."""
+        with self._lock:
+            entry = self._active.get(name or self.default)
+            if entry is None:
+                raise GraphNotFoundException(name or self.default)
+            entry.in_flight += 1
+        try:
+            yield entry
+        finally:
+            with self._lock:
+                entry.in_flight -= 1
+                retire = not entry.active and entry.in_flight == 0
+            if retire:
+                entry.release()
+    
+    def describe(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            entries = [entry for versions in self._versions.values() for entry in versions.values()]
+        return [entry.describe() for entry in sorted(entries, key=lambda e: (e.name, e.version))]
+    
+    def clear(self) -> None:
+        """Drop every compiled graph, e.g. before the checkpointer is closed."""
+        with self._lock:
+            entries = [entry for versions in self._versions.values() for entry in versions.values()]
+        for entry in entries:
+            entry.release()
+
+
+@lru_cache()
+def get_registry() -> GraphRegistry:
+    """Get the graph registry populated from ``graph_factories``; nothing is compiled yet."""
+    settings = get_settings()
+    registry = GraphRegistry(default=settings.default_graph)
+    for name, spec in parse_graph_factories(settings.graph_factories).items():
+        registry.register(name, load_factory(spec), spec=spec)
+    return registry
\ No newline at end of file
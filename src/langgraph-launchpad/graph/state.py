@@ -1,17 +1,33 @@
-from typing import Any, List, TypedDict
+from typing import Annotated, Any, Dict, List, Optional, TypedDict
 
 from langchain_core.messages import BaseMessage
+from langgraph.graph.message import add_messages
+
+
+def merge_outputs(left: Optional[Dict[str, Any]], right: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Reducer for outputs written by concurrently running branches.
+    
+    Each branch writes its own key, so updates from one superstep merge
+    without conflicts. Writing ``None`` clears the outputs once joined.
+    """
+    if right is None:
+        return {}
+    return {**(left or {}), **right}
 
 
 class GraphState(TypedDict):
     """State definition for the LangGraph workflow."""
     
-    messages: List[BaseMessage]
+    # Appended to (and de-duplicated by message ID) rather than replaced
+    messages: Annotated[List[BaseMessage], add_messages]
     user_question: str
     reasoning: bool
     # Add your custom state fields here
     current_step: str
     metadata: dict[str, Any]
+    # Results of parallel branches, keyed by branch, until the join node runs
+    branch_outputs: Annotated[Dict[str, Any], merge_outputs]
 
 
 # You can extend this state for your specific use case
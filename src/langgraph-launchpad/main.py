@@ -1,19 +1,55 @@
 import sys
 from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 from typing import AsyncGenerator
 
 import structlog
-import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse
 
-from .api.routes import chat, threads, users
+from .api.models.responses import HealthResponse, ReadinessResponse
+from .api.routes import admin, chat, search, stats, threads, users
 from .config.settings import get_settings
-from .core.database import create_tables
+from .core.archive import create_archive_job
+from .core.blocking import BlockingRouteMiddleware, get_blocking_detector
+from .core.broadcast import get_broker
+from .core.checkpoint import close_checkpointer, get_checkpointer
+from .core.database import create_tables, dispose_engine, prewarm_database
+from .core.health import get_loop_monitor, get_probes, readiness
+from .core.listing import create_message_count_backfill_job
+from .core.memory import MemorySamplingMiddleware, get_memory_profiler
+from .core.retention import create_compaction_job
+from .core.scheduler import get_scheduler
+from .core.search import setup_search_index
+from .core.sharding import create_shard_tables, dispose_shards
+from .core.thread_cache import get_thread_cache
+from .core.usage import create_usage_flush_job, flush_usage
+from .core.worker import WorkerRecycler
+from .graph.builder import get_graph
+from .graph.llm import close_model_caller
+from .graph.registry import get_registry
 from .utils.logging import setup_logging
 
 
+def prewarm() -> None:
+    """Open connection pools and compile the graph ahead of the first request."""
+    prewarm_database()
+    get_checkpointer()
+    get_graph()
+
+
+def prepare_storage() -> None:
+    """Create the database schema once, then release every connection."""
+    create_tables()
+    create_shard_tables()
+    setup_search_index()
+    get_checkpointer()
+    close_checkpointer()
+    dispose_engine()
+    dispose_shards()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan manager."""
@@ -22,13 +58,73 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     
     logger.info("Starting LangGraph Launchpad", version=app.version)
     
+    # Trace from the start so snapshots include what startup allocates
+    if settings.memory_profiling_enabled:
+        get_memory_profiler().start()
+    
     # Create database tables
     create_tables()
+    create_shard_tables()
+    setup_search_index()
     logger.info("Database tables created/verified")
     
+    # Resources are otherwise created lazily on first use
+    if settings.prewarm:
+        prewarm()
+        logger.info("Connection pools opened and graph compiled")
+    
+    # Background maintenance jobs
+    jobs = [
+        job
+        for job in (
+            create_compaction_job(),
+            create_archive_job(),
+            create_usage_flush_job(),
+            create_message_count_backfill_job(),
+        )
+        if job is not None
+    ]
+    for job in jobs:
+        job.start()
+        logger.info("Background job scheduled", job=job.name, interval=job.interval_seconds)
+    
+    # Run event fan-out between workers
+    await get_broker().start()
+    
+    # Sampled continuously so readiness reflects stalls between probes
+    get_loop_monitor().start()
+    if settings.blocking_detector_enabled:
+        get_blocking_detector().start()
+    
+    app.state.ready = True
+    
     yield
     
+    app.state.ready = False
     logger.info("Shutting down LangGraph Launchpad")
+    await get_loop_monitor().stop()
+    await get_blocking_detector().stop()
+    get_blocking_detector.cache_clear()
+    get_loop_monitor.cache_clear()
+    get_probes.cache_clear()
+    for job in jobs:
+        await job.stop()
+    try:
+        # Write out usage counted since the last flush
+        flush_usage()
+    except Exception as e:
+        logger.error("Failed to flush usage rollups", error=str(e))
+    await get_broker().stop()
+    get_broker.cache_clear()
+    get_registry.cache_clear()
+    get_thread_cache.cache_clear()
+    get_scheduler.cache_clear()
+    close_model_caller()
+    close_checkpointer()
+    dispose_engine()
+    dispose_shards()
+    get_memory_profiler().stop()
+    get_memory_profiler.cache_clear()
 
 
 def create_app() -> FastAPI:
@@ -55,10 +151,31 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
     
+    # Attributes event loop stalls to routes; see core.blocking
+    if settings.blocking_detector_enabled:
+        app.add_middleware(BlockingRouteMiddleware)
+    
+    # Samples per-route peak allocation; see core.memory
+    if settings.memory_profiling_enabled:
+        app.add_middleware(MemorySamplingMiddleware)
+    
+    # Worker recycling relies on the multi-process supervisor to respawn workers
+    recycler = WorkerRecycler.from_settings()
+    if settings.is_production and settings.workers > 1 and recycler.enabled:
+        @app.middleware("http")
+        async def recycle_worker(request: Request, call_next):
+            """Count requests and recycle the worker when a limit is reached."""
+            response = await call_next(request)
+            recycler.request_finished()
+            return response
+    
     # Include routers
     app.include_router(threads.router, prefix="/api/v1")
     app.include_router(users.router, prefix="/api/v1")
     app.include_router(chat.router, prefix="/api/v1")
+    app.include_router(search.router, prefix="/api/v1")
+    app.include_router(stats.router, prefix="/api/v1")
+    app.include_router(admin.router, prefix="/api/v1")
     
     @app.get("/", include_in_schema=False)
     async def root():
@@ -70,13 +187,67 @@ def create_app() -> FastAPI:
         """Health check endpoint."""
         return {"status": "healthy", "version": app.version}
     
+    @app.get("/health/live", response_model=HealthResponse)
+    async def liveness_check() -> HealthResponse:
+        """Liveness: the process is up and its event loop answers."""
+        return HealthResponse(status="alive", version=app.version, timestamp=datetime.now(timezone.utc))
+    
+    @app.get(
+        "/health/ready",
+        response_model=ReadinessResponse,
+        responses={503: {"model": ReadinessResponse, "description": "Not ready to receive traffic"}},
+    )
+    async def readiness_check():
+        """Readiness: dependencies answer and the worker is not overloaded."""
+        if not getattr(app.state, "ready", False):
+            result = {
+                "ready": False,
+                "reasons": ["starting up or shutting down"],
+                "checks": {},
+                "event_loop_lag_ms": 0.0,
+                "event_loop_max_lag_ms": 0.0,
+                "pools": {},
+                "runs_in_flight": 0,
+                "runs_queued": 0,
+            }
+        else:
+            result = await readiness()
+        
+        ready = result.pop("ready")
+        body = ReadinessResponse(
+            status="ready" if ready else "not_ready",
+            timestamp=datetime.now(timezone.utc),
+            **result,
+        )
+        return JSONResponse(
+            status_code=200 if ready else 503,
+            content=body.model_dump(mode="json"),
+        )
+    
     return app
 
 
 def main() -> None:
     """Main entry point for CLI usage."""
+    import uvicorn
+    
     settings = get_settings()
     
+    if settings.is_production:
+        # Workers are separate processes that each build their own pools in
+        # the lifespan; create the schema here so they do not race on DDL.
+        prepare_storage()
+        uvicorn.run(
+            "langgraph_launchpad.main:create_app",
+            factory=True,
+            host=settings.host,
+            port=settings.port,
+            workers=settings.workers,
+            timeout_graceful_shutdown=settings.worker_graceful_timeout,
+            log_config=None,  # We handle logging ourselves
+        )
+        return
+    
     uvicorn.run(
         "langgraph_launchpad.main:create_app",
         factory=True,
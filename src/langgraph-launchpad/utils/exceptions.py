@@ -27,6 +27,17 @@ class ThreadNotFoundException(LangGraphLaunchpadException):
         )
 
 
+class CheckpointNotFoundException(LangGraphLaunchpadException):
+    """Exception raised when a thread has no checkpoint with the given ID."""
+    
+    def __init__(self, thread_id: int, checkpoint_id: str):
+        super().__init__(
+            message=f"Checkpoint '{checkpoint_id}' of thread {thread_id} not found",
+            details={"thread_id": thread_id, "checkpoint_id": checkpoint_id},
+            status_code=404,
+        )
+
+
 class UserNotFoundException(LangGraphLaunchpadException):
     """Exception raised when user is not found."""
     
@@ -51,4 +62,38 @@ class GraphExecutionException(LangGraphLaunchpadException):
             message=f"Graph execution failed: {message}",
             details=details,
             status_code=500,
-        )
\ No newline at end of file
+        )
+
+
+class GraphNotFoundException(LangGraphLaunchpadException):
+    """Exception raised when a graph (version) is not registered."""
+    
+    def __init__(self, name: str, version: Optional[int] = None):
+        label = name if version is None else f"{name} v{version}"
+        super().__init__(
+            message=f"Graph '{label}' not found",
+            details={"graph": name, "version": version},
+            status_code=404,
+        )
+
+
+class SchedulerRejectedException(LangGraphLaunchpadException):
+    """Exception raised when a graph run cannot be scheduled for a user."""
+    
+    def __init__(self, user_id: str, reason: str):
+        super().__init__(
+            message=f"Run for user '{user_id}' rejected: {reason}",
+            details={"user_id": user_id, "reason": reason},
+            status_code=429,
+        )
+
+
+class DeadlineExceededException(LangGraphLaunchpadException):
+    """Exception raised when a request or one of its steps runs out of time."""
+    
+    def __init__(self, stage: str, budget_seconds: float):
+        super().__init__(
+            message=f"Deadline exceeded in {stage} after {budget_seconds:.2f}s",
+            details={"stage": stage, "budget_seconds": budget_seconds},
+            status_code=504,
+        )
@@ -0,0 +1,116 @@
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# Recent observations kept per histogram for percentile estimates
+HISTOGRAM_WINDOW = 1024
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _percentile(ordered: list, pct: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round((len(ordered) - 1) * pct / 100.0)))
+    return ordered[index]
+
+
+class Histogram:
+    """Running count/sum/max plus a window of recent values for percentiles."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent: Deque[float] = deque(maxlen=HISTOGRAM_WINDOW)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self.recent.append(value)
+
+    def summary(self) -> Dict[str, float]:
+        ordered = sorted(self.recent)
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": _percentile(ordered, 50),
+            "p95": _percentile(ordered, 95),
+            "p99": _percentile(ordered, 99),
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe in-process registry of labelled counters, gauges and histograms."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        """Increment a counter."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        """Set a gauge to an absolute value."""
+        with self._lock:
+            self._gauges.setdefault(name, {})[_label_key(labels)] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Record an observation in a histogram."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram()
+            series[key].observe(value)
+
+    def value(self, name: str, **labels: Any) -> float:
+        """Get the current value of a counter or gauge (0 if unset)."""
+        key = _label_key(labels)
+        with self._lock:
+            if name in self._counters:
+                return self._counters[name].get(key, 0.0)
+            return self._gauges.get(name, {}).get(key, 0.0)
+
+    def total(self, name: str) -> float:
+        """Sum a counter across all of its label sets."""
+        with self._lock:
+            return sum(self._counters.get(name, {}).values())
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Export every series as plain data."""
+        def render(series: Dict[LabelKey, Any], convert) -> list:
+            return [{"labels": dict(key), "value": convert(value)} for key, value in series.items()]
+
+        with self._lock:
+            return {
+                "counters": {name: render(series, float) for name, series in self._counters.items()},
+                "gauges": {name: render(series, float) for name, series in self._gauges.items()},
+                "histograms": {
+                    name: render(series, Histogram.summary) for name, series in self._histograms.items()
+                },
+            }
+
+    def reset(self) -> None:
+        """Drop every series."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+
+# Process-wide registry; each worker process exports its own series
+metrics = MetricsRegistry()
\ No newline at end of file
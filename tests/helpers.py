@@ -0,0 +1,54 @@
+"""Request helpers shared by the API tests."""
+
+from datetime import datetime
+from typing import Any, Dict, List
+
+from sqlalchemy import text, update
+
+API = "/api/v1"
+
+LONG_AGO = datetime(2000, 1, 1)
+
+
+def new_thread(client: Any, user_id: str = "alice") -> int:
+    response = client.post(f"{API}/threads", json={"user_id": user_id})
+    assert response.status_code == 201
+    return response.json()["thread_id"]
+
+
+def chat(client: Any, thread_id: int, message: str) -> str:
+    response = client.post(f"{API}/threads/{thread_id}/chat", json={"message": message})
+    assert response.status_code == 200, response.text
+    return response.json()["response"]
+
+
+def messages(client: Any, thread_id: int) -> List[Dict[str, Any]]:
+    response = client.get(f"{API}/threads/{thread_id}")
+    assert response.status_code == 200
+    return response.json()["messages"]
+
+
+def contents(client: Any, thread_id: int) -> List[str]:
+    return [message["content"] for message in messages(client, thread_id)]
+
+
+def checkpoint_rows(thread_id: int) -> int:
+    """Count a thread's stored checkpoints in whichever database holds them."""
+    from langgraph_launchpad.core.sharding import checkpoint_engine
+    
+    with checkpoint_engine(thread_id).connect() as conn:
+        return conn.execute(
+            text("SELECT COUNT(*) FROM checkpoints WHERE thread_id = :thread_id"), {"thread_id": str(thread_id)}
+        ).scalar()
+
+
+def backdate(thread_ids: List[int]) -> None:
+    """Make threads look inactive since ``LONG_AGO``, so archival picks them."""
+    from langgraph_launchpad.core.database import get_engine
+    from langgraph_launchpad.core.models import Thread
+    from langgraph_launchpad.core.thread_cache import get_thread_cache
+    
+    with get_engine().begin() as conn:
+        conn.execute(update(Thread).where(Thread.thread_id.in_(thread_ids)).values(updated_at=LONG_AGO))
+    # Forget that this worker just touched them, as a restarted worker would
+    get_thread_cache().clear()
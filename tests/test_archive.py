@@ -0,0 +1,66 @@
+"""Archiving inactive threads to cold storage and rehydrating them on use."""
+
+from datetime import datetime
+
+from sqlalchemy import select
+
+from helpers import API, LONG_AGO, backdate, chat, checkpoint_rows, contents, new_thread
+
+
+def _updated_at(thread_id: int) -> datetime:
+    from langgraph_launchpad.core.database import get_engine
+    from langgraph_launchpad.core.models import Thread
+    
+    with get_engine().connect() as conn:
+        return conn.execute(select(Thread.updated_at).where(Thread.thread_id == thread_id)).scalar()
+
+
+def _archive(client) -> dict:
+    response = client.post(f"{API}/admin/archive/run")
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_only_inactive_threads_are_archived(client):
+    inactive, active = new_thread(client), new_thread(client)
+    chat(client, inactive, "old")
+    chat(client, active, "recent")
+    backdate([inactive])
+    
+    result = _archive(client)
+    assert result["archived"] == 1
+    assert checkpoint_rows(inactive) == 0
+    assert checkpoint_rows(active) > 0
+    
+    stats = client.get(f"{API}/admin/archive").json()
+    assert stats["cold_threads"] == 1 and stats["cold_bytes"] > 0
+
+
+def test_read_rehydrates_without_touching(client):
+    thread_id = new_thread(client)
+    chat(client, thread_id, "hello")
+    history = contents(client, thread_id)
+    backdate([thread_id])
+    assert _archive(client)["archived"] == 1
+    
+    assert contents(client, thread_id) == history
+    assert checkpoint_rows(thread_id) > 0
+    # Reading is not activity: the thread stays eligible for the next run
+    assert _updated_at(thread_id) == LONG_AGO
+    assert client.get(f"{API}/admin/archive").json()["cold_threads"] == 0
+
+
+def test_chat_rehydrates_and_continues(client):
+    thread_id = new_thread(client)
+    chat(client, thread_id, "first")
+    backdate([thread_id])
+    assert _archive(client)["archived"] == 1
+    
+    chat(client, thread_id, "second")
+    history = contents(client, thread_id)
+    assert history[0] == "first" and history[2] == "second"
+    assert len(history) == 4
+    assert _updated_at(thread_id) > LONG_AGO
+    
+    # Active again, so the next run leaves it alone
+    assert _archive(client)["archived"] == 0
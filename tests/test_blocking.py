@@ -0,0 +1,30 @@
+"""Event loop stall detection and attribution."""
+
+import asyncio
+import time
+
+
+def test_stall_is_reported_with_task_and_route():
+    from langgraph_launchpad.core.blocking import BlockingDetector, RouteRef
+    
+    detector = BlockingDetector(threshold_seconds=0.05, stack_depth=10)
+    
+    async def handler() -> None:
+        detector.track(RouteRef({"type": "http", "method": "GET", "path": "/slow"}))
+        time.sleep(0.3)
+    
+    async def scenario() -> None:
+        detector.start()
+        try:
+            await asyncio.sleep(0.05)
+            await asyncio.create_task(handler(), name="slow-handler")
+            await asyncio.sleep(0.1)
+        finally:
+            await detector.stop()
+    
+    asyncio.run(scenario())
+    reports = detector.snapshot()["reports"]
+    assert reports
+    assert reports[0]["route"] == "GET /slow"
+    assert reports[0]["task"] == "slow-handler"
+    assert any("in handler" in line for line in reports[0]["stack"])
@@ -0,0 +1,69 @@
+"""Replay of runs in progress to subscribers attaching mid-run."""
+
+import asyncio
+
+import pytest
+
+
+def _broker(max_run_age_seconds: float):
+    from langgraph_launchpad.core.broadcast import BroadcastBackend, RunBroker
+    
+    return RunBroker(BroadcastBackend(), max_buffered=16, max_run_age_seconds=max_run_age_seconds)
+
+
+def _start_run(broker, thread_id: int) -> None:
+    broker.publish(thread_id, {"type": "run_started", "run_id": "r1", "question": "hi"})
+    broker.publish(thread_id, {"type": "content", "run_id": "r1", "content": "Hel"})
+
+
+@pytest.mark.parametrize("max_run_age_seconds", [0, 600])
+def test_mid_run_subscriber_gets_replay(max_run_age_seconds):
+    async def scenario():
+        broker = _broker(max_run_age_seconds)
+        await broker.start()
+        _start_run(broker, 1)
+        async with broker.subscribe(1) as subscription:
+            replayed = [await subscription.get(timeout=1), await subscription.get(timeout=1)]
+            broker.publish(1, {"type": "done", "run_id": "r1"})
+            last = await subscription.get(timeout=1)
+        return replayed, last
+    
+    replayed, last = asyncio.run(scenario())
+    assert [event["type"] for event in replayed] == ["run_started", "content"]
+    assert last["type"] == "done"
+
+
+def test_finished_run_is_not_replayed():
+    broker = _broker(600)
+    _start_run(broker, 1)
+    broker.publish(1, {"type": "done", "run_id": "r1"})
+    assert broker.live_run(1) == []
+
+
+def test_stale_run_expires():
+    broker = _broker(60)
+    _start_run(broker, 1)
+    broker._runs[1].started -= 120
+    assert broker.live_run(1) == []
+    assert broker.buffered_events() == 0
+
+
+def test_unlimited_run_age_keeps_old_runs():
+    broker = _broker(0)
+    _start_run(broker, 1)
+    broker._runs[1].started -= 10 ** 6
+    assert len(broker.live_run(1)) == 2
+
+
+def test_broker_age_limit_ignores_request_timeout(monkeypatch):
+    from langgraph_launchpad.config.settings import get_settings
+    from langgraph_launchpad.core.broadcast import get_broker
+    
+    monkeypatch.setenv("REQUEST_TIMEOUT_SECONDS", "0")
+    get_settings.cache_clear()
+    get_broker.cache_clear()
+    try:
+        assert get_broker().max_run_age_seconds == get_settings().broadcast_max_run_age_seconds > 0
+    finally:
+        get_broker.cache_clear()
+        get_settings.cache_clear()
@@ -0,0 +1,95 @@
+"""The write-through cache of each thread's latest checkpoint."""
+
+from langgraph.checkpoint.base import CheckpointTuple, empty_checkpoint
+
+from helpers import API, backdate, chat, contents, new_thread
+
+
+def _saver():
+    from langgraph_launchpad.core.checkpoint import get_checkpointer
+    from langgraph_launchpad.core.checkpoint_cache import CachingCheckpointSaver
+    
+    saver = get_checkpointer()
+    assert isinstance(saver, CachingCheckpointSaver)
+    return saver
+
+
+def _config(thread_id: int) -> dict:
+    return {"configurable": {"thread_id": str(thread_id), "checkpoint_ns": ""}}
+
+
+def _tuple(thread_id: str, size: int) -> CheckpointTuple:
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = {"messages": ["x" * size]}
+    return CheckpointTuple(config=_config(thread_id), checkpoint=checkpoint, metadata={}, parent_config=None)
+
+
+def test_state_cache_is_bounded_by_entries_and_bytes():
+    from langgraph_launchpad.core.checkpoint_cache import ThreadStateCache, approximate_size
+    
+    cache = ThreadStateCache(max_entries=2, max_bytes=10**6)
+    for thread_id in ("1", "2", "3"):
+        cache.set((thread_id, ""), _tuple(thread_id, 10))
+    assert cache.get(("1", "")) is None
+    assert len(cache) == 2
+    
+    size = approximate_size(_tuple("a", 5_000).checkpoint) + approximate_size({})
+    cache = ThreadStateCache(max_entries=10, max_bytes=size * 3 // 2)
+    cache.set(("a", ""), _tuple("a", 5_000))
+    cache.set(("b", ""), _tuple("b", 5_000))
+    assert cache.get(("a", "")) is None and cache.get(("b", "")) is not None
+    assert cache.bytes == size
+    
+    # Bigger than the whole budget: not cached, and nothing else is evicted for it
+    cache.set(("c", ""), _tuple("c", 20_000))
+    assert cache.get(("c", "")) is None and cache.get(("b", "")) is not None
+    
+    assert cache.discard_threads(["b"]) == 1
+    assert len(cache) == 0 and cache.bytes == 0
+
+
+def test_turns_are_cached_and_served_as_copies(client):
+    saver = _saver()
+    thread_id = new_thread(client)
+    chat(client, thread_id, "hello")
+    
+    cached = saver.cache.get((str(thread_id), ""))
+    assert cached is not None
+    served = saver.get_tuple(_config(thread_id))
+    assert served.config["configurable"]["checkpoint_id"] == cached.config["configurable"]["checkpoint_id"]
+    served.checkpoint["channel_values"].pop("messages")
+    assert len(contents(client, thread_id)) == 2
+
+
+def test_writes_from_another_worker_are_not_served_stale(client):
+    saver = _saver()
+    thread_id = new_thread(client)
+    chat(client, thread_id, "hello")
+    stale = saver.cache.get((str(thread_id), ""))
+    
+    # Another worker's turn goes to storage without passing through this cache
+    latest = saver.inner.get_tuple(_config(thread_id))
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = {"messages": latest.checkpoint["channel_values"]["messages"][:1]}
+    saver.inner.put(latest.config, checkpoint, {"source": "update", "step": 99}, {})
+    
+    served = saver.get_tuple(_config(thread_id))
+    assert served.checkpoint["id"] == checkpoint["id"] != stale.checkpoint["id"]
+    assert contents(client, thread_id) == ["hello"]
+
+
+def test_deleted_and_archived_threads_are_invalidated(client):
+    from langgraph_launchpad.core.archive import archive_thread
+    
+    saver = _saver()
+    deleted, archived = new_thread(client), new_thread(client)
+    chat(client, deleted, "hello")
+    chat(client, archived, "hello")
+    
+    assert client.delete(f"{API}/threads/{deleted}").status_code == 204
+    assert saver.cache.get((str(deleted), "")) is None
+    assert saver.get_tuple(_config(deleted)) is None
+    
+    backdate([archived])
+    assert archive_thread(archived) is not None
+    assert saver.cache.get((str(archived), "")) is None
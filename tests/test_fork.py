@@ -0,0 +1,73 @@
+"""Forking threads on each storage backend."""
+
+from typing import Any, Dict
+
+from helpers import API, chat, contents, messages, new_thread
+
+
+def _fork(client: Any, thread_id: int, **params: Any) -> Dict[str, Any]:
+    response = client.post(f"{API}/threads/{thread_id}/fork", params=params)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_fork_copies_latest_state(client):
+    parent = new_thread(client)
+    chat(client, parent, "hello")
+    
+    # With four shards the first fork lands in another shard file and the second in the parent's
+    for _ in range(2):
+        fork = _fork(client, parent, user_id="bob")
+        assert fork["parent_thread_id"] == parent
+        assert fork["user_id"] == "bob"
+        assert fork["parent_checkpoint_id"]
+        assert messages(client, fork["thread_id"]) == messages(client, parent)
+
+
+def test_fork_continues_independently(client):
+    parent = new_thread(client)
+    chat(client, parent, "hello")
+    fork = _fork(client, parent)["thread_id"]
+    
+    chat(client, fork, "only in the fork")
+    chat(client, parent, "only in the parent")
+    
+    fork_messages = contents(client, fork)
+    parent_messages = contents(client, parent)
+    assert fork_messages[0] == parent_messages[0] == "hello"
+    assert "only in the fork" in fork_messages and "only in the fork" not in parent_messages
+    assert "only in the parent" in parent_messages and "only in the parent" not in fork_messages
+    
+    # Deleting the parent leaves the fork's history intact
+    assert client.delete(f"{API}/threads/{parent}").status_code == 204
+    assert contents(client, fork) == fork_messages
+
+
+def test_fork_from_earlier_checkpoint(client):
+    from langgraph_launchpad.core.checkpoint import get_checkpointer
+    
+    parent = new_thread(client)
+    chat(client, parent, "first")
+    checkpoint_id = get_checkpointer().get_tuple(
+        {"configurable": {"thread_id": str(parent)}}
+    ).config["configurable"]["checkpoint_id"]
+    chat(client, parent, "second")
+    
+    fork = _fork(client, parent, checkpoint_id=checkpoint_id)
+    assert fork["parent_checkpoint_id"] == checkpoint_id
+    assert contents(client, fork["thread_id"])[0] == "first"
+    assert len(messages(client, fork["thread_id"])) == 2
+    assert len(messages(client, parent)) == 4
+
+
+def test_fork_of_thread_without_history(client):
+    parent = new_thread(client)
+    fork = _fork(client, parent)
+    assert fork["parent_checkpoint_id"] is None
+    assert messages(client, fork["thread_id"]) == []
+
+
+def test_fork_not_found(client):
+    parent = new_thread(client)
+    assert client.post(f"{API}/threads/{parent + 1000}/fork").status_code == 404
+    assert client.post(f"{API}/threads/{parent}/fork", params={"checkpoint_id": "missing"}).status_code == 404
@@ -0,0 +1,39 @@
+"""Graph registry hot swaps through the admin API."""
+
+from helpers import API, chat, new_thread
+
+FACTORY = "langgraph_launchpad.graph.builder:create_graph"
+
+
+def _reload(client, **body):
+    return client.post(f"{API}/admin/graphs/default/reload", json=body)
+
+
+def test_reload_registers_and_activates_a_new_version(client):
+    response = _reload(client, factory=FACTORY, reload_modules=["langgraph_launchpad.graph.nodes.example_agent"])
+    assert response.status_code == 200, response.text
+    versions = {graph["version"]: graph["active"] for graph in response.json()["graphs"] if graph["name"] == "default"}
+    assert versions == {1: False, 2: True}
+    
+    thread_id = new_thread(client)
+    assert chat(client, thread_id, "hello")
+
+
+def test_reload_rejects_unconfigured_factories(client):
+    response = _reload(client, factory="os:system")
+    assert response.status_code == 400
+    assert "not listed in graph_factories" in response.json()["detail"]
+
+
+def test_reload_rejects_modules_outside_the_package(client):
+    for module in ("os", "langgraph_launchpad_evil", "subprocess"):
+        response = _reload(client, reload_modules=[module])
+        assert response.status_code == 400
+        assert "can be reloaded" in response.json()["detail"]
+    
+    graphs = client.get(f"{API}/admin/graphs").json()["graphs"]
+    assert [graph["version"] for graph in graphs] == [1]
+
+
+def test_reload_of_unknown_graph(client):
+    assert client.post(f"{API}/admin/graphs/missing/reload", json={}).status_code == 404
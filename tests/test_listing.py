@@ -0,0 +1,58 @@
+"""Thread listing with stored message counts and their backfill."""
+
+from typing import Any, Dict, List
+
+import pytest
+
+from helpers import API, chat, new_thread
+
+
+@pytest.fixture()
+def backfill(monkeypatch):
+    from langgraph_launchpad.core import listing
+    
+    monkeypatch.setattr(listing, "_backfill_after", 0)
+    return listing.backfill_message_counts
+
+
+def _counts(client: Any, **params: Any) -> Dict[int, Any]:
+    threads: List[Dict[str, Any]] = client.get(f"{API}/threads", params=params).json()["threads"]
+    return {thread["thread_id"]: thread["message_count"] for thread in threads}
+
+
+def _fork(client: Any, thread_id: int) -> int:
+    response = client.post(f"{API}/threads/{thread_id}/fork")
+    assert response.status_code == 201, response.text
+    return response.json()["thread_id"]
+
+
+def test_turns_store_message_counts(client):
+    thread_id = new_thread(client)
+    chat(client, thread_id, "hello")
+    assert _counts(client)[thread_id] == 2
+
+
+def test_uncounted_threads_are_listed_as_unknown_until_backfilled(client, backfill):
+    parent = new_thread(client)
+    chat(client, parent, "hello")
+    chat(client, parent, "again")
+    fork = _fork(client, parent)
+    assert _counts(client)[fork] is None
+    
+    assert backfill() == 1
+    assert _counts(client)[fork] == 4
+    assert backfill() == 0
+
+
+def test_backfill_resumes_after_the_last_thread_it_looked_at(client, backfill, monkeypatch):
+    from langgraph_launchpad.config.settings import get_settings
+    
+    monkeypatch.setattr(get_settings(), "message_count_backfill_batch_size", 1)
+    parent = new_thread(client)
+    chat(client, parent, "hello")
+    forks = [_fork(client, parent) for _ in range(2)]
+    
+    # One thread per run, in id order, wrapping around at the end
+    stored = [backfill() for _ in range(4)]
+    assert sum(stored) == 2
+    assert [_counts(client)[fork] for fork in forks] == [2, 2]
@@ -0,0 +1,60 @@
+"""Purging deleted threads' checkpoints and compacting the rest."""
+
+from sqlalchemy import text
+
+from helpers import API, chat, checkpoint_rows, contents, new_thread
+
+
+def test_delete_purges_checkpoints(client):
+    thread_id = new_thread(client)
+    chat(client, thread_id, "hello")
+    assert checkpoint_rows(thread_id) > 0
+    
+    assert client.delete(f"{API}/threads/{thread_id}").status_code == 204
+    assert checkpoint_rows(thread_id) == 0
+
+
+def test_bulk_delete_purges_checkpoints(client):
+    thread_ids = [new_thread(client) for _ in range(3)]
+    for thread_id in thread_ids:
+        chat(client, thread_id, "hello")
+    
+    response = client.request("DELETE", f"{API}/threads/bulk", json={"thread_ids": thread_ids[:2] + [10_000]})
+    assert response.status_code == 200
+    assert response.json()["deleted"] == 2
+    assert response.json()["not_found"] == 1
+    assert [checkpoint_rows(thread_id) for thread_id in thread_ids[:2]] == [0, 0]
+    assert checkpoint_rows(thread_ids[2]) > 0
+
+
+def test_compaction_keeps_latest_checkpoints(client):
+    thread_id = new_thread(client)
+    for turn in range(3):
+        chat(client, thread_id, f"turn {turn}")
+    history = contents(client, thread_id)
+    assert checkpoint_rows(thread_id) > 2
+    
+    response = client.post(f"{API}/admin/checkpoints/compact", params={"keep_last": 2})
+    assert response.status_code == 200
+    assert response.json()["threads_trimmed"] >= 1
+    assert checkpoint_rows(thread_id) == 2
+    assert contents(client, thread_id) == history
+    
+    # The trimmed thread carries on from its latest checkpoint
+    chat(client, thread_id, "after compaction")
+    assert contents(client, thread_id)[:len(history)] == history
+
+
+def test_compaction_purges_orphaned_checkpoints(client):
+    from langgraph_launchpad.core.database import get_engine
+    
+    thread_id = new_thread(client)
+    chat(client, thread_id, "hello")
+    # Delete the thread behind the API's back, leaving its checkpoints behind
+    with get_engine().begin() as conn:
+        conn.execute(text("DELETE FROM threads WHERE thread_id = :thread_id"), {"thread_id": thread_id})
+    
+    response = client.post(f"{API}/admin/checkpoints/compact", params={"keep_last": 0})
+    assert response.status_code == 200
+    assert response.json()["orphaned_threads"] == 1
+    assert checkpoint_rows(thread_id) == 0
@@ -0,0 +1,131 @@
+"""Weighted fair queuing of graph runs."""
+
+import asyncio
+from typing import List
+
+import pytest
+
+
+def _scheduler(**overrides):
+    from langgraph_launchpad.core.scheduler import FairScheduler
+    
+    options = {
+        "max_concurrency": 1,
+        "per_user_concurrency": 1,
+        "max_queued_per_user": 100,
+        "queue_timeout_seconds": 0,
+    }
+    options.update(overrides)
+    return FairScheduler(**options)
+
+
+async def _run(scheduler, user_id: str, order: List[str], hold: float = 0.0) -> None:
+    async with scheduler.slot(user_id):
+        order.append(user_id)
+        await asyncio.sleep(hold)
+
+
+def test_parse_weights():
+    from langgraph_launchpad.core.scheduler import parse_weights
+    
+    assert parse_weights("alice=2, team=a=0.5,,") == {"alice": 2.0, "team=a": 0.5}
+    with pytest.raises(ValueError):
+        parse_weights("alice")
+
+
+def test_backlogged_users_share_slots_by_weight():
+    async def scenario() -> List[str]:
+        scheduler = _scheduler(weights={"heavy": 2.0})
+        order: List[str] = []
+        async with scheduler.slot("blocker"):
+            # Everything queues behind the blocker, then drains one run at a time
+            tasks = [asyncio.create_task(_run(scheduler, user, order)) for user in ["light"] * 6 + ["heavy"] * 6]
+            await asyncio.sleep(0)
+            assert scheduler.queued == 12
+        await asyncio.gather(*tasks)
+        return order
+    
+    order = asyncio.run(scenario())
+    assert order[:6].count("heavy") == 4
+    assert order[:6].count("light") == 2
+
+
+def test_a_flooding_user_does_not_delay_others():
+    async def scenario() -> List[str]:
+        scheduler = _scheduler()
+        order: List[str] = []
+        async with scheduler.slot("blocker"):
+            tasks = [asyncio.create_task(_run(scheduler, "flood", order)) for _ in range(10)]
+            await asyncio.sleep(0)
+            tasks.append(asyncio.create_task(_run(scheduler, "quiet", order)))
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        return order
+    
+    assert asyncio.run(scenario()).index("quiet") <= 1
+
+
+def test_per_user_concurrency_cap():
+    async def scenario() -> None:
+        scheduler = _scheduler(max_concurrency=3, per_user_concurrency=1)
+        order: List[str] = []
+        tasks = [asyncio.create_task(_run(scheduler, user, order, hold=0.05)) for user in ("a", "a", "b")]
+        await asyncio.sleep(0.01)
+        assert sorted(order) == ["a", "b"]
+        assert scheduler.in_flight == 2 and scheduler.queued == 1
+        await asyncio.gather(*tasks)
+        assert scheduler.in_flight == 0 and scheduler.queued == 0
+    
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("max_queued", [0, 1])
+def test_queue_limit(max_queued):
+    from langgraph_launchpad.utils.exceptions import SchedulerRejectedException
+    
+    async def scenario() -> None:
+        scheduler = _scheduler(max_queued_per_user=max_queued)
+        order: List[str] = []
+        async with scheduler.slot("alice"):
+            waiting = [asyncio.create_task(_run(scheduler, "alice", order)) for _ in range(max_queued)]
+            await asyncio.sleep(0)
+            with pytest.raises(SchedulerRejectedException):
+                await _run(scheduler, "alice", order)
+            assert scheduler.queued == max_queued
+        await asyncio.gather(*waiting)
+        assert order == ["alice"] * max_queued
+    
+    asyncio.run(scenario())
+
+
+def test_waiters_time_out_and_leave_the_queue():
+    from langgraph_launchpad.utils.exceptions import SchedulerRejectedException
+    
+    async def scenario() -> None:
+        scheduler = _scheduler(queue_timeout_seconds=0.05)
+        async with scheduler.slot("alice"):
+            with pytest.raises(SchedulerRejectedException):
+                await _run(scheduler, "bob", [])
+            assert scheduler.queued == 0
+        assert scheduler.in_flight == 0
+        assert scheduler.snapshot()["users"] == []
+    
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiters_give_up_their_place():
+    async def scenario() -> None:
+        scheduler = _scheduler()
+        order: List[str] = []
+        async with scheduler.slot("alice"):
+            cancelled = asyncio.create_task(_run(scheduler, "bob", order))
+            kept = asyncio.create_task(_run(scheduler, "carol", order))
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            await asyncio.sleep(0)
+            assert scheduler.queued == 1
+        await kept
+        assert order == ["carol"]
+        assert scheduler.in_flight == 0
+    
+    asyncio.run(scenario())
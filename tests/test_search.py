@@ -0,0 +1,36 @@
+"""Full-text search over conversation messages."""
+
+from helpers import API, chat, new_thread
+
+
+def _search(client, **params):
+    response = client.get(f"{API}/search", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_turns_are_searchable(client):
+    alice, bob = new_thread(client, "alice"), new_thread(client, "bob")
+    chat(client, alice, "the quick brown fox")
+    chat(client, bob, "a quick brown dog")
+    
+    results = _search(client, q="quick brown")["results"]
+    assert {result["thread_id"] for result in results} >= {alice, bob}
+    assert all("[" in result["snippet"] for result in results)
+    
+    only_bob = _search(client, q="quick brown", user_id="bob")["results"]
+    assert only_bob and {result["thread_id"] for result in only_bob} == {bob}
+    
+    assert _search(client, q="no such phrase anywhere")["results"] == []
+
+
+def test_results_are_paged(client):
+    thread_id = new_thread(client)
+    for turn in range(3):
+        chat(client, thread_id, f"paging marker {turn}")
+    
+    first = _search(client, q="paging marker", limit=2)
+    assert len(first["results"]) == 2 and first["has_more"]
+    rest = _search(client, q="paging marker", limit=2, offset=2)
+    positions = {result["position"] for result in first["results"] + rest["results"]}
+    assert len(positions) == len(first["results"]) + len(rest["results"])
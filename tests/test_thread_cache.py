@@ -0,0 +1,71 @@
+"""The per-worker cache of thread existence and ownership."""
+
+import time
+
+from helpers import API, new_thread
+
+
+def test_misses_expire_sooner_than_hits():
+    from langgraph_launchpad.core.thread_cache import MISSING, ThreadCache
+    
+    cache = ThreadCache(max_entries=10, ttl_seconds=60, negative_ttl_seconds=0.05)
+    cache.set(1, "alice")
+    cache.set(2, None)
+    assert cache.get(1) == "alice"
+    assert cache.get(2) is None
+    
+    time.sleep(0.1)
+    assert cache.get(1) == "alice"
+    assert cache.get(2) is MISSING
+
+
+def test_least_recently_used_threads_are_evicted():
+    from langgraph_launchpad.core.thread_cache import MISSING, ThreadCache
+    
+    cache = ThreadCache(max_entries=2, ttl_seconds=60, negative_ttl_seconds=60)
+    cache.set(1, "alice")
+    cache.set(2, "bob")
+    cache.get(1)
+    cache.set(3, "carol")
+    assert cache.get(2) is MISSING
+    assert cache.get(1) == "alice" and cache.get(3) == "carol"
+    
+    cache.invalidate([1])
+    assert cache.get(1) is MISSING
+
+
+def test_zero_ttl_disables_the_cache():
+    from langgraph_launchpad.core.thread_cache import MISSING, ThreadCache
+    
+    cache = ThreadCache(max_entries=10, ttl_seconds=0, negative_ttl_seconds=5)
+    cache.set(1, "alice")
+    assert not cache.enabled
+    assert cache.get(1) is MISSING
+
+
+def _chat_status(client, thread_id: int) -> int:
+    return client.post(f"{API}/threads/{thread_id}/chat", json={"message": "hello"}).status_code
+
+
+def test_created_threads_replace_cached_misses(client):
+    existing = new_thread(client)
+    # The next thread ID is looked up, and remembered as missing, before it exists
+    assert _chat_status(client, existing + 1) == 404
+    assert new_thread(client) == existing + 1
+    assert _chat_status(client, existing + 1) == 200
+    
+    response = client.post(f"{API}/threads/bulk", json={"threads": [{"user_id": "bob"}]})
+    assert response.status_code == 201
+    assert _chat_status(client, response.json()["results"][0]["thread_id"]) == 200
+
+
+def test_deleted_threads_are_forgotten(client):
+    single, first, second = new_thread(client), new_thread(client), new_thread(client)
+    for thread_id in (single, first, second):
+        assert _chat_status(client, thread_id) == 200
+    
+    assert client.delete(f"{API}/threads/{single}").status_code == 204
+    response = client.request("DELETE", f"{API}/threads/bulk", json={"thread_ids": [first, second]})
+    assert response.status_code == 200
+    for thread_id in (single, first, second):
+        assert _chat_status(client, thread_id) == 404
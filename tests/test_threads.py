@@ -0,0 +1,33 @@
+"""Thread create and delete endpoints, single and bulk."""
+
+from helpers import API, new_thread
+
+
+def test_bulk_create_keeps_request_order(client):
+    users = [f"user-{index}" for index in range(5)]
+    response = client.post(f"{API}/threads/bulk", json={"threads": [{"user_id": user} for user in users]})
+    assert response.status_code == 201
+    body = response.json()
+    assert body["created"] == 5 and body["failed"] == 0
+    assert [result["index"] for result in body["results"]] == list(range(5))
+    assert [result["user_id"] for result in body["results"]] == users
+    
+    listed = client.get(f"{API}/threads").json()["threads"]
+    assert {thread["thread_id"] for thread in listed} >= {result["thread_id"] for result in body["results"]}
+
+
+def test_bulk_requests_over_the_limit_are_rejected(client, monkeypatch):
+    from langgraph_launchpad.config.settings import get_settings
+    
+    monkeypatch.setattr(get_settings(), "bulk_max_items", 2)
+    response = client.post(f"{API}/threads/bulk", json={"threads": [{"user_id": "alice"}] * 3})
+    assert response.status_code == 413
+    response = client.request("DELETE", f"{API}/threads/bulk", json={"thread_ids": [1, 2, 3]})
+    assert response.status_code == 413
+
+
+def test_delete_thread(client):
+    thread_id = new_thread(client)
+    assert client.delete(f"{API}/threads/{thread_id}").status_code == 204
+    assert client.get(f"{API}/threads/{thread_id}").status_code == 404
+    assert client.delete(f"{API}/threads/{thread_id}").status_code == 404
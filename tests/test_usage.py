@@ -0,0 +1,85 @@
+"""Usage rollups: threads, turns and model tokens per user and day."""
+
+from typing import Any
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from helpers import API, new_thread
+
+USAGE = {"input_tokens": 12, "output_tokens": 5, "total_tokens": 17}
+
+
+class StubChatModel:
+    """Answers every call like a chat model that reports its token usage."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def invoke(self, messages: Any, timeout: Any = None) -> AIMessage:
+        self.calls += 1
+        return AIMessage(content=f"reply {self.calls}", usage_metadata=USAGE)
+
+
+@pytest.fixture
+def model(client, monkeypatch):
+    from langgraph_launchpad.config.settings import get_settings
+    from langgraph_launchpad.graph.nodes import example_agent
+    
+    stub = StubChatModel()
+    monkeypatch.setattr(get_settings(), "openai_api_key", "test-key")
+    monkeypatch.setattr(example_agent, "get_chat_model", lambda api_key: stub)
+    return stub
+
+
+def _stats(client, **params) -> dict:
+    from langgraph_launchpad.core.usage import flush_usage
+    
+    flush_usage()
+    response = client.get(f"{API}/stats", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _chat(client, thread_id: int, message: str, reasoning: bool = False) -> None:
+    response = client.post(f"{API}/threads/{thread_id}/chat", json={"message": message, "reasoning": reasoning})
+    assert response.status_code == 200, response.text
+
+
+def test_turn_tokens_reach_the_rollups(client, model):
+    thread_id = new_thread(client, "alice")
+    _chat(client, thread_id, "hello")
+    assert model.calls == 1
+    
+    stats = _stats(client, user_id="alice")
+    assert stats["turns"] == 1
+    assert stats["prompt_tokens"] == USAGE["input_tokens"]
+    assert stats["completion_tokens"] == USAGE["output_tokens"]
+    
+    # Stored with the reply, through the checkpoint serializer
+    from langgraph_launchpad.core.listing import latest_messages
+    
+    assert latest_messages(thread_id)[-1].usage_metadata == USAGE
+    
+    # The reasoning branch's call is counted too
+    _chat(client, thread_id, "and why?", reasoning=True)
+    assert model.calls == 3
+    stats = _stats(client, user_id="alice")
+    assert stats["turns"] == 2
+    assert stats["prompt_tokens"] == 3 * USAGE["input_tokens"]
+    assert stats["completion_tokens"] == 3 * USAGE["output_tokens"]
+
+
+def test_threads_and_turns_are_counted_per_user(client):
+    alice = new_thread(client, "alice")
+    new_thread(client, "bob")
+    _chat(client, alice, "hello")
+    assert client.delete(f"{API}/threads/{alice}").status_code == 204
+    
+    alice_stats = _stats(client, user_id="alice")
+    assert alice_stats["threads_created"] == 1 and alice_stats["threads_deleted"] == 1
+    assert alice_stats["turns"] == 1
+    assert alice_stats["prompt_tokens"] == 0
+    
+    everyone = _stats(client)
+    assert everyone["threads_created"] == 2 and everyone["turns"] == 1